@@ -0,0 +1,66 @@
+import os
+
+import numpy as np
+import streamlit as st
+import altair as alt
+import pandas as pd
+from models.backtest import backtest, load_history
+
+@st.cache_data
+def _load_history(path, modified):
+    return load_history(path)
+
+def display_backtest(monthly_plan, params):
+    """
+    Replay historical returns and CPI over every rolling start date
+    """
+    with st.expander("📜 Historical Backtest"):
+        path = st.text_input(
+            "History File (CSV or .npy)", "", key="backtest_path",
+            help="Monthly rows with a 'return' column (or per-account *_return columns), a 'cpi' index "
+                 "level and an optional 'date'; panels written by utils.store are memory-mapped.",
+        )
+        if not path:
+            st.info("Enter the path of a monthly returns/CPI file to run a backtest.")
+            return
+        if not os.path.exists(path):
+            st.warning(f"File not found: {path}")
+            return
+
+        try:
+            history = _load_history(path, os.path.getmtime(path))
+            result = backtest(
+                history,
+                monthly_plan=monthly_plan,
+                **{k: v for k, v in params.items() if not k.endswith("_return") and k != "inflation_rate"},
+            )
+        except (ValueError, KeyError) as e:
+            st.warning(str(e))
+            return
+
+        bands = dict(zip(result["Percentiles"], result["Terminal_Percentiles"]["Total_Adjusted"]))
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Start Dates", f"{len(result['Start']):,}")
+        col2.metric("Worst (Real)", f"${result['Terminal_Adjusted']['Total'].min():,.0f}")
+        col3.metric("Median (Real)", f"${np.median(result['Terminal_Adjusted']['Total']):,.0f}")
+        col4.metric("Best (Real)", f"${result['Terminal_Adjusted']['Total'].max():,.0f}")
+        st.write(" | ".join(f"P{p}: ${value:,.0f}" for p, value in bands.items()))
+
+        chart_data = pd.DataFrame({
+            "Start": result["Start"].astype(str) if history["dates"] is not None else result["Start"],
+            "Nominal": result["Terminal"]["Total"],
+            "Real": result["Terminal_Adjusted"]["Total"],
+        }).melt(id_vars="Start", var_name="Basis", value_name="Value")
+        line_chart = (
+            alt.Chart(chart_data)
+                .mark_line(opacity=0.85, strokeWidth=2)
+                .encode(
+                    x=alt.X("Start:O" if history["dates"] is not None else "Start:Q", title="Start Month",
+                            axis=alt.Axis(labelOverlap=True)),
+                    y=alt.Y("Value:Q", title="Final Portfolio ($)", axis=alt.Axis(format="$~s")),
+                    color="Basis:N",
+                    tooltip=["Start", "Basis:N", alt.Tooltip("Value:Q", format="$,.0f")]
+                )
+                .interactive()
+        )
+        st.altair_chart(line_chart, use_container_width=True)
@@ -1,9 +1,21 @@
 import streamlit as st
 import altair as alt
+import numpy as np
+import pandas as pd
 
-def display_portfolio_charts(data):
+def build_chart_frame(data, real=False):
     """
-    Display portfolio growth charts using Altair
+    Long-format (Year, Component, Value) frame built from the column views
+    """
+    suffix = "_Adjusted" if real else ""
+    wide = pd.DataFrame({name: data[name + suffix] for name in data.value_columns})
+    wide.insert(0, "Year", np.asarray(data["Month"]) / 12)
+    return wide.melt(id_vars="Year", var_name="Component", value_name="Value")
+
+def display_portfolio_charts(data, frames=None):
+    """
+    Display portfolio growth charts using Altair.
+    frames: optional precomputed (nominal, real) chart frames from build_chart_frame
     """
     st.subheader("📈 Portfolio Growth Over Time")
 
@@ -12,21 +24,12 @@ def display_portfolio_charts(data):
 
     with chart_tab1:
         # Create data for nominal line chart
-        chart_data = []
-        for i, month in enumerate(data["Month"]):
-            year = month / 12
-            chart_data.extend([
-                {"Year": year, "Component": "Total", "Value": data["Total"][i]},
-                {"Year": year, "Component": "Roth IRA", "Value": data["Roth IRA"][i]},
-                {"Year": year, "Component": "401(k)", "Value": data["401(k)"][i]},
-                {"Year": year, "Component": "ETF DCA", "Value": data["ETF DCA"][i]},
-                {"Year": year, "Component": "Stock Picks", "Value": data["Stock Picks"][i]}
-            ])
+        chart_data = frames[0] if frames else build_chart_frame(data)
 
         # Create nominal line chart
         try:
             line_chart = (
-                alt.Chart(alt.Data(values=chart_data))
+                alt.Chart(chart_data)
                     .mark_line(opacity=0.85, strokeWidth=3)
                     .encode(
                         x=alt.X("Year:Q", title="Years"),
@@ -54,30 +57,18 @@ def display_portfolio_charts(data):
                 if i % 12 == 0:  # Show yearly data
                     year = month // 12
                     st.write(f"**Year {year}:**")
-                    st.write(f"  Total: ${data['Total'][i]:,.2f}")
-                    st.write(f"  Roth IRA: ${data['Roth IRA'][i]:,.2f}")
-                    st.write(f"  401(k): ${data['401(k)'][i]:,.2f}")
-                    st.write(f"  ETF DCA: ${data['ETF DCA'][i]:,.2f}")
-                    st.write(f"  Stock Picks: ${data['Stock Picks'][i]:,.2f}")
+                    for name in data.value_columns:
+                        st.write(f"  {name}: ${data[name][i]:,.2f}")
                     st.write("---")
 
     with chart_tab2:
         # Create data for inflation-adjusted line chart
-        chart_data_adj = []
-        for i, month in enumerate(data["Month"]):
-            year = month / 12
-            chart_data_adj.extend([
-                {"Year": year, "Component": "Total", "Value": data["Total_Adjusted"][i]},
-                {"Year": year, "Component": "Roth IRA", "Value": data["Roth IRA_Adjusted"][i]},
-                {"Year": year, "Component": "401(k)", "Value": data["401(k)_Adjusted"][i]},
-                {"Year": year, "Component": "ETF DCA", "Value": data["ETF DCA_Adjusted"][i]},
-                {"Year": year, "Component": "Stock Picks", "Value": data["Stock Picks_Adjusted"][i]}
-            ])
+        chart_data_adj = frames[1] if frames else build_chart_frame(data, real=True)
 
         # Create inflation-adjusted line chart
         try:
             line_chart_adj = (
-                alt.Chart(alt.Data(values=chart_data_adj))
+                alt.Chart(chart_data_adj)
                     .mark_line(opacity=0.85, strokeWidth=3)
                     .encode(
                         x=alt.X("Year:Q", title="Years"),
@@ -105,9 +96,51 @@ def display_portfolio_charts(data):
                 if i % 12 == 0:  # Show yearly data
                     year = month // 12
                     st.write(f"**Year {year}:**")
-                    st.write(f"  Total: ${data['Total_Adjusted'][i]:,.2f}")
-                    st.write(f"  Roth IRA: ${data['Roth IRA_Adjusted'][i]:,.2f}")
-                    st.write(f"  401(k): ${data['401(k)_Adjusted'][i]:,.2f}")
-                    st.write(f"  ETF DCA: ${data['ETF DCA_Adjusted'][i]:,.2f}")
-                    st.write(f"  Stock Picks: ${data['Stock Picks_Adjusted'][i]:,.2f}")
-                    st.write("---") 
\ No newline at end of file
+                    for name in data.value_columns:
+                        st.write(f"  {name}: ${data[name + '_Adjusted'][i]:,.2f}")
+                    st.write("---")
+
+def build_fan_frame(summary, real=False):
+    """
+    Wide (Year, P5, ..., P95, Mean) frame of Monte Carlo percentile bands
+    """
+    suffix = "_Adjusted" if real else ""
+    frame = pd.DataFrame({
+        f"P{p:g}": band for p, band in zip(summary["Percentiles"], summary["Total" + suffix])
+    })
+    frame.insert(0, "Year", np.asarray(summary["Month"]) / 12)
+    if "Mean" + suffix in summary:
+        frame["Mean"] = summary["Mean" + suffix]
+    return frame
+
+def display_fan_chart(summary, real=False):
+    """
+    Fan chart of Monte Carlo percentile bands: nested bands from the outer percentiles inwards
+    and a median line
+    """
+    frame = build_fan_frame(summary, real=real)
+    bands = [column for column in frame.columns if column.startswith("P")]
+    base = alt.Chart(frame).encode(x=alt.X("Year:Q", title="Years"))
+    title = "Real Portfolio Value ($)" if real else "Portfolio Value ($)"
+
+    layers = []
+    for i in range(len(bands) // 2):
+        low, high = bands[i], bands[-1 - i]
+        layers.append(
+            base.mark_area(opacity=0.15 + 0.2 * i).encode(
+                y=alt.Y(f"{low}:Q", title=title, axis=alt.Axis(format="$~s")),
+                y2=f"{high}:Q",
+                tooltip=[alt.Tooltip("Year:Q", format=".1f"),
+                         alt.Tooltip(f"{low}:Q", format="$,.0f"),
+                         alt.Tooltip(f"{high}:Q", format="$,.0f")]
+            )
+        )
+    if len(bands) % 2:
+        middle = bands[len(bands) // 2]
+        layers.append(
+            base.mark_line(strokeWidth=3).encode(
+                y=alt.Y(f"{middle}:Q", title=title),
+                tooltip=[alt.Tooltip("Year:Q", format=".1f"), alt.Tooltip(f"{middle}:Q", format="$,.0f")]
+            )
+        )
+    st.altair_chart(alt.layer(*layers).interactive(), use_container_width=True)
@@ -0,0 +1,44 @@
+import streamlit as st
+from models.goal_seek import solve_contribution_scale, solve_months, solve_return
+
+def display_goal_seek(monthly_plan, params):
+    """
+    Solve for the contributions, horizon or return needed to reach a target portfolio value
+    """
+    with st.expander("🎯 Goal Seek"):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            target = st.number_input("Target Portfolio ($)", 0, value=1_000_000, step=50_000, key="goal_target")
+        with col2:
+            solve_for = st.selectbox(
+                "Solve For", ["Monthly Contributions", "Years", "Annual Return"], key="goal_solve_for"
+            )
+        with col3:
+            basis = st.radio("Target Basis", ["Nominal", "Real (Inflation-Adjusted)"], key="goal_basis")
+        real = basis != "Nominal"
+
+        if solve_for == "Monthly Contributions":
+            scale, converged = solve_contribution_scale(target, real=real, monthly_plan=monthly_plan, **params)
+            if not converged:
+                st.warning("The target cannot be reached by scaling the current contributions.")
+                return
+            st.metric("Contribution Multiplier", f"×{scale:.2f}")
+            for i, (start, end, amt) in enumerate(monthly_plan.periods):
+                st.write(
+                    f"Period {i+1}: Year {(start - 1) // 12 + 1} to Year {end // 12} - "
+                    f"${amt * scale:,.0f}/month (currently ${amt:,.0f})"
+                )
+
+        elif solve_for == "Years":
+            months, reached = solve_months(target, real=real, monthly_plan=monthly_plan, **params)
+            if not reached:
+                st.warning("The target is not reached within 100 years with the current plan.")
+                return
+            st.metric("Time to Target", f"{months / 12:.1f} years", f"{months} months", delta_color="off")
+
+        else:
+            rate, converged = solve_return(target, real=real, monthly_plan=monthly_plan, **params)
+            if not converged:
+                st.warning("No return rate reaches the target with the current plan.")
+                return
+            st.metric("Required Annual Return (all accounts)", f"{rate * 100:.2f}%")
@@ -1,4 +1,7 @@
+import pandas as pd
 import streamlit as st
+from models.plan import compile_plan
+from models.schedule import SCHEDULE_PARAMETERS
 
 def periods_editor():
     """
@@ -55,10 +58,70 @@ def periods_editor():
             st.rerun()
     
     # Convert years → months
-    monthly_plan = [
-        ((s - 1) * 12 + 1, e * 12, amt)
-        for s, e, amt in st.session_state.investment_periods
+    active_periods = [
+        (i, ((s - 1) * 12 + 1, e * 12, amt))
+        for i, (s, e, amt) in enumerate(st.session_state.investment_periods)
         if s <= e and amt > 0
     ]
-    
-    return monthly_plan 
\ No newline at end of file
+    monthly_plan = [period for _, period in active_periods]
+
+    # Compile once per distinct plan and reuse it across reruns
+    plan_key = tuple(monthly_plan)
+    if st.session_state.get("compiled_plan_key") != plan_key:
+        st.session_state.compiled_plan = compile_plan(monthly_plan)
+        st.session_state.compiled_plan_key = plan_key
+    compiled_plan = st.session_state.compiled_plan
+
+    # Overlapping periods: the first one listed wins
+    for overlap in compiled_plan.overlap_report():
+        winner = active_periods[overlap["winner"]][0] + 1
+        shadowed = ", ".join(str(active_periods[j][0] + 1) for j in overlap["shadowed"])
+        st.warning(
+            f"Years {(overlap['start'] - 1) // 12 + 1}–{overlap['end'] // 12}: "
+            f"Period {winner} overlaps Period {shadowed} and takes precedence."
+        )
+
+    return compiled_plan
+
+def schedules_editor(simulation_months):
+    """
+    Edit year-range schedules (glide paths) for the return, allocation and inflation rates and
+    return them as {parameter: [(start_month, end_month, value), ...]}; years outside every row
+    keep the sidebar value
+    """
+    st.header("🛤️ Rate Schedules")
+
+    # The editors keep their own rows across reruns, so every table starts from the same empty frame
+    empty = pd.DataFrame({"Start Year": pd.Series(dtype="Int64"), "End Year": pd.Series(dtype="Int64"),
+                          "Value (%)": pd.Series(dtype=float)})
+    schedules = {}
+    tabs = st.tabs(list(SCHEDULE_PARAMETERS.values()))
+    for tab, (key, label) in zip(tabs, SCHEDULE_PARAMETERS.items()):
+        with tab:
+            edited = st.data_editor(
+                empty, num_rows="dynamic", use_container_width=True, key=f"schedule_{key}",
+                column_config={
+                    "Start Year": st.column_config.NumberColumn(min_value=1, step=1),
+                    "End Year": st.column_config.NumberColumn(min_value=1, step=1),
+                    "Value (%)": st.column_config.NumberColumn(min_value=0.0, max_value=100.0, step=0.5),
+                },
+            )
+            rows = [
+                (int(start), int(end), float(value))
+                for start, end, value in edited.dropna().itertuples(index=False)
+                if start <= end
+            ]
+
+            # Convert years → months, exactly like the investment periods
+            schedule = [((start - 1) * 12 + 1, end * 12, value / 100) for start, end, value in rows]
+            for overlap in compile_plan(schedule).overlap_report():
+                st.warning(
+                    f"{label}, years {(overlap['start'] - 1) // 12 + 1}–{overlap['end'] // 12}: "
+                    f"row {overlap['winner'] + 1} overlaps row "
+                    f"{', '.join(str(j + 1) for j in overlap['shadowed'])} and takes precedence."
+                )
+            if any(end > simulation_months for _, end, _ in schedule):
+                st.caption(f"Years after year {simulation_months // 12} are outside the simulation.")
+            if schedule:
+                schedules[key] = schedule
+    return schedules
@@ -1,68 +1,87 @@
+import numpy as np
 import streamlit as st
-from utils.irr import calculate_irr
+from utils.irr import annualize_irr, irr_batch
 
-def display_results(data, sim_years, sim_months, inflation_rate):
+def compute_metrics(data, sim_years, inflation_rate):
+    """
+    Headline nominal and real metrics (no Streamlit calls, so the result can be reused).
+    A per-month inflation schedule is summarized by its average annual rate.
+    """
+    # Nominal and real cash flows, solved for IRR together in one batch
+    monthly_irrs, irr_converged = irr_batch([data.cash_flows(), data.cash_flows(real=True)])
+    irr_label, irr_adj_label = [
+        f"{annualize_irr(monthly_irr) * 100:.1f}%" if converged else "n/a"
+        for monthly_irr, converged in zip(monthly_irrs, irr_converged)
+    ]
+
+    final_total = data["Total"][-1]
+    initial_total = data["Total"][0]
+    total_contributions = data["Total_Contributions"][-1]
+    total_invested = initial_total + total_contributions
+    growth = final_total - total_invested
+    pct = (growth / total_invested) * 100 if total_invested > 0 else 0
+
+    cagr = ((final_total / total_invested) ** (1 / sim_years) - 1) * 100 if total_invested > 0 else 0.0
+
+    final_total_adj = data["Total_Adjusted"][-1]
+    initial_total_adj = data["Total_Adjusted"][0]
+    total_contributions_adj = total_contributions / data.deflator[-1]
+    total_invested_adj = initial_total_adj + total_contributions_adj
+    growth_adj = final_total_adj - total_invested_adj
+    pct_adj = (growth_adj / total_invested_adj) * 100 if total_invested_adj > 0 else 0
+
+    if np.ndim(inflation_rate):
+        inflation_rate = float(data.deflator[-1] ** (1 / sim_years) - 1)
+
+    # ✅ Correct way to compute real CAGR from nominal CAGR and inflation:
+    real_cagr = ((1 + cagr / 100) / (1 + inflation_rate) - 1) * 100
+
+    return dict(
+        final_total=final_total,
+        total_invested=total_invested,
+        growth=growth,
+        pct=pct,
+        irr_label=irr_label,
+        cagr=cagr,
+        final_total_adj=final_total_adj,
+        total_invested_adj=total_invested_adj,
+        growth_adj=growth_adj,
+        pct_adj=pct_adj,
+        irr_adj_label=irr_adj_label,
+        real_cagr=real_cagr,
+        inflation_rate=inflation_rate,
+    )
+
+def display_results(data, sim_years, sim_months, inflation_rate, metrics=None):
     st.header("📊 Results")
-    
+
+    if metrics is None:
+        metrics = compute_metrics(data, sim_years, inflation_rate)
+
     tab1, tab2 = st.tabs(["💰 Nominal Values", "📈 Inflation-Adjusted Values"])
-    
+
     with tab1:
-        final_total = data["Total"][-1]
-        initial_total = data["Total"][0]
-        total_contributions = data["Total_Contributions"][-1]
-        total_invested = initial_total + total_contributions
-        growth = final_total - total_invested
-        pct = (growth / total_invested) * 100 if total_invested > 0 else 0
-        
-        cash_flows = [-initial_total]
-        for i in range(1, len(data["Month"])):
-            monthly_contrib = data["Total_Contributions"][i] - data["Total_Contributions"][i - 1]
-            cash_flows.append(-monthly_contrib)
-        cash_flows.append(final_total)
-        irr = calculate_irr(cash_flows) * 100
-        
-        cagr = ((final_total / total_invested) ** (1 / sim_years) - 1) * 100 if total_invested > 0 else 0.0
-        
         col1, col2, col3, col4 = st.columns(4)
-        col1.metric("Final Portfolio", f"${final_total:,.0f}")
-        col2.metric("Total Invested", f"${total_invested:,.0f}")
-        col3.metric("Investment Gains", f"${growth:,.0f}")
-        col4.metric("Total Return", f"{pct:.1f}%")
+        col1.metric("Final Portfolio", f"${metrics['final_total']:,.0f}")
+        col2.metric("Total Invested", f"${metrics['total_invested']:,.0f}")
+        col3.metric("Investment Gains", f"${metrics['growth']:,.0f}")
+        col4.metric("Total Return", f"{metrics['pct']:.1f}%")
 
         col5, col6, col7, col8 = st.columns(4)
         col5.metric("Years Simulated", sim_years)
-        col6.metric("IRR (内部收益率)", f"{irr:.1f}%")
-        col7.metric("CAGR (年化收益率)", f"{cagr:.1f}%")
-        col8.metric("Inflation Rate", f"{inflation_rate * 100:.1f}%")
-        
-    with tab2:
-        final_total_adj = data["Total_Adjusted"][-1]
-        initial_total_adj = data["Total_Adjusted"][0]
-        inflation_monthly = (1 + inflation_rate) ** (1 / 12) - 1
-        inflation_adjustment_final = (1 + inflation_monthly) ** sim_months
-        total_contributions_adj = total_contributions / inflation_adjustment_final
-        total_invested_adj = initial_total_adj + total_contributions_adj
-        growth_adj = final_total_adj - total_invested_adj
-        pct_adj = (growth_adj / total_invested_adj) * 100 if total_invested_adj > 0 else 0
-        
-        cash_flows_adj = [-initial_total_adj]
-        for i in range(1, len(data["Month"])):
-            monthly_contrib_adj = (data["Total_Contributions"][i] - data["Total_Contributions"][i - 1]) / ((1 + inflation_monthly) ** i)
-            cash_flows_adj.append(-monthly_contrib_adj)
-        cash_flows_adj.append(final_total_adj)
-        irr_adj = calculate_irr(cash_flows_adj) * 100
-
-        # ✅ Correct way to compute real CAGR from nominal CAGR and inflation:
-        real_cagr = ((1 + cagr / 100) / (1 + inflation_rate) - 1) * 100
+        col6.metric("IRR (内部收益率)", metrics["irr_label"])
+        col7.metric("CAGR (年化收益率)", f"{metrics['cagr']:.1f}%")
+        col8.metric("Inflation Rate", f"{metrics['inflation_rate'] * 100:.1f}%")
 
+    with tab2:
         col9, col10, col11, col12 = st.columns(4)
-        col9.metric("Final Portfolio (Real)", f"${final_total_adj:,.0f}")
-        col10.metric("Total Invested (Real)", f"${total_invested_adj:,.0f}")
-        col11.metric("Investment Gains (Real)", f"${growth_adj:,.0f}")
-        col12.metric("Total Return (Real)", f"{pct_adj:.1f}%")
-        
+        col9.metric("Final Portfolio (Real)", f"${metrics['final_total_adj']:,.0f}")
+        col10.metric("Total Invested (Real)", f"${metrics['total_invested_adj']:,.0f}")
+        col11.metric("Investment Gains (Real)", f"${metrics['growth_adj']:,.0f}")
+        col12.metric("Total Return (Real)", f"{metrics['pct_adj']:.1f}%")
+
         col13, col14, col15, col16 = st.columns(4)
         col13.metric("Years Simulated", sim_years)
-        col14.metric("IRR (内部收益率) (Real)", f"{irr_adj:.1f}%")
-        col15.metric("CAGR (年化收益率) (Real)", f"{real_cagr:.1f}%")
-        col16.metric("Inflation Rate", f"{inflation_rate * 100:.1f}%")
+        col14.metric("IRR (内部收益率) (Real)", metrics["irr_adj_label"])
+        col15.metric("CAGR (年化收益率) (Real)", f"{metrics['real_cagr']:.1f}%")
+        col16.metric("Inflation Rate", f"{metrics['inflation_rate'] * 100:.1f}%")
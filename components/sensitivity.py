@@ -0,0 +1,57 @@
+import math
+
+import streamlit as st
+import altair as alt
+import pandas as pd
+from models.sensitivity import METRICS, sensitivity_analysis
+
+def display_sensitivity(monthly_plan, params):
+    """
+    Tornado chart of how much each input moves the selected metric
+    """
+    with st.expander("🌪️ Sensitivity Analysis"):
+        col1, col2 = st.columns(2)
+        with col1:
+            metric = st.selectbox(
+                "Metric", list(METRICS), format_func=METRICS.get, key="sensitivity_metric"
+            )
+        with col2:
+            step = st.slider("Perturbation (±%)", 1, 50, 10, 1, key="sensitivity_step") / 100
+
+        analysis = sensitivity_analysis(monthly_plan, step=step, **params)
+        base = analysis["baseline"][metric]
+        if not analysis["rows"] or not base or not math.isfinite(base):
+            st.info("Nothing to analyse for the current inputs.")
+            return
+
+        bars = []
+        for row in analysis["rows"]:
+            for side, sign in (("low", "-"), ("high", "+")):
+                bars.append({
+                    "Input": row["label"],
+                    "Change": f"Input {sign}{step * 100:.0f}%",
+                    "Impact": (row[f"{metric}_{side}"] / base - 1) * 100,
+                    "Elasticity": row[f"{metric}_elasticity"],
+                })
+        chart_data = pd.DataFrame(bars)
+        order = (chart_data.assign(Size=chart_data["Impact"].abs())
+                 .groupby("Input")["Size"].max().sort_values(ascending=False).index.tolist())
+
+        tornado = (
+            alt.Chart(chart_data)
+                .mark_bar(opacity=0.85)
+                .encode(
+                    x=alt.X("Impact:Q", title=f"Change in {METRICS[metric]} (%)"),
+                    y=alt.Y("Input:N", sort=order, title=None),
+                    color=alt.Color("Change:N", title=None),
+                    tooltip=[
+                        "Input:N",
+                        "Change:N",
+                        alt.Tooltip("Impact:Q", format="+.2f"),
+                        alt.Tooltip("Elasticity:Q", format=".3f"),
+                    ]
+                )
+        )
+        st.altair_chart(tornado, use_container_width=True)
+        st.caption("Elasticity: % change in the metric per 1% change in the input. "
+                   "Inputs that are currently zero are not shown.")
@@ -1,4 +1,5 @@
 import streamlit as st
+from models.simulation import RESOLUTIONS
 
 def sidebar_controls():
     st.header("🏦 Initial Account Balances")
@@ -17,6 +18,10 @@ def sidebar_controls():
 
     sim_years = st.slider("Simulation Duration (Years)", 1, 30, 3, key="main_sim_years")
     sim_months = sim_years * 12
+    resolution = st.selectbox(
+        "Compounding Resolution", list(RESOLUTIONS), index=list(RESOLUTIONS).index("monthly"),
+        format_func=lambda key: key.capitalize().replace("Biweekly", "Bi-weekly"), key="main_resolution",
+    )
 
     st.markdown("---"); st.header("📈 Return Rates")
     roth_r  = st.slider("Roth IRA Annual Return (%)",   0.0, 30.0, 10.0, 0.5, key="main_roth_r") / 100
@@ -50,6 +55,7 @@ def sidebar_controls():
         initial_stock=initial_stock,
         sim_years=sim_years,
         sim_months=sim_months,
+        resolution=resolution,
         roth_r=roth_r,
         k401_r=k401_r,
         dca_r=dca_r,
@@ -61,4 +67,27 @@ def sidebar_controls():
         dca_ratio=dca_ratio,
         stock_ratio=stock_ratio,
         inflation_rate=inflation_rate,
-    ) 
\ No newline at end of file
+    ) 
+
+def simulation_params(sidebar_params):
+    """
+    Map the sidebar values onto compound_growth_with_visualization keyword arguments
+    """
+    return dict(
+        roth_ira_cap=sidebar_params["roth_cap"],
+        roth_ira_enabled=sidebar_params["enable_roth"],
+        k401_cap=sidebar_params["k401_cap"],
+        k401_enabled=sidebar_params["enable_k401"],
+        simulation_months=sidebar_params["sim_months"],
+        roth_ira_return=sidebar_params["roth_r"],
+        k401_return=sidebar_params["k401_r"],
+        dca_return=sidebar_params["dca_r"],
+        stock_return=sidebar_params["stock_r"],
+        dca_ratio=sidebar_params["dca_ratio"],
+        stock_ratio=sidebar_params["stock_ratio"],
+        inflation_rate=sidebar_params["inflation_rate"],
+        initial_roth=sidebar_params["initial_roth"],
+        initial_401k=sidebar_params["initial_401k"],
+        initial_dca=sidebar_params["initial_dca"],
+        initial_stock=sidebar_params["initial_stock"],
+    )
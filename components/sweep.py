@@ -0,0 +1,81 @@
+import numpy as np
+import streamlit as st
+import altair as alt
+import pandas as pd
+from models.sweep import SWEEP_PARAMETERS, downsample_grid, sweep_grid
+
+SWEEP_METRICS = {
+    "Total_Adjusted": "Final Portfolio (Real)",
+    "Total": "Final Portfolio",
+    "Total_Contributions": "Total Contributions",
+}
+
+def display_parameter_sweep(monthly_plan, params):
+    """
+    Heatmap of a terminal metric over a grid of two inputs
+    """
+    with st.expander("🗺️ Parameter Sweep"):
+        names = list(SWEEP_PARAMETERS)
+        label = lambda key: SWEEP_PARAMETERS[key][0]
+
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            x_param = st.selectbox("X Axis", names, names.index("stock_return"), format_func=label, key="sweep_x")
+            x_lo, x_hi = _axis_range(x_param, "sweep_x")
+        with col2:
+            y_param = st.selectbox(
+                "Y Axis", names, names.index("monthly_contribution"), format_func=label, key="sweep_y"
+            )
+            y_lo, y_hi = _axis_range(y_param, "sweep_y")
+        with col3:
+            metric = st.selectbox(
+                "Metric", list(SWEEP_METRICS), format_func=SWEEP_METRICS.get, key="sweep_metric"
+            )
+            points = st.slider("Grid Points per Axis", 10, 1000, 200, 10, key="sweep_points")
+
+        if not st.button("Run Sweep", key="sweep_run"):
+            return
+
+        x_values = np.linspace(x_lo, x_hi, points)
+        y_values = np.linspace(y_lo, y_hi, points)
+        try:
+            grid = sweep_grid(x_param, x_values, y_param, y_values, monthly_plan, metric=metric, **params)
+        except ValueError as e:
+            st.warning(str(e))
+            return
+
+        # Bin on the server so the browser only receives a bounded number of cells
+        values, x_edges, y_edges = downsample_grid(grid, x_values, y_values)
+        ys, xs = np.indices(values.shape)
+        chart_data = pd.DataFrame({
+            "x": x_edges[xs.ravel()], "x2": x_edges[xs.ravel() + 1],
+            "y": y_edges[ys.ravel()], "y2": y_edges[ys.ravel() + 1],
+            "Value": values.ravel(),
+        })
+
+        heatmap = (
+            alt.Chart(chart_data)
+                .mark_rect()
+                .encode(
+                    x=alt.X("x:Q", title=label(x_param), scale=alt.Scale(nice=False)),
+                    x2="x2:Q",
+                    y=alt.Y("y:Q", title=label(y_param), scale=alt.Scale(nice=False)),
+                    y2="y2:Q",
+                    color=alt.Color("Value:Q", title=SWEEP_METRICS[metric],
+                                    scale=alt.Scale(scheme="viridis"), legend=alt.Legend(format="$~s")),
+                    tooltip=[
+                        alt.Tooltip("x:Q", title=label(x_param), format=",.4~g"),
+                        alt.Tooltip("y:Q", title=label(y_param), format=",.4~g"),
+                        alt.Tooltip("Value:Q", format="$,.0f"),
+                    ]
+                )
+        )
+        st.altair_chart(heatmap, use_container_width=True)
+        st.caption(f"{points:,} × {points:,} scenarios, averaged into {values.shape[1]} × {values.shape[0]} cells.")
+
+def _axis_range(param, key):
+    _, lo, hi = SWEEP_PARAMETERS[param]
+    step = (hi - lo) / 100
+    low = st.number_input("From", value=float(lo), step=step, key=f"{key}_{param}_lo")
+    high = st.number_input("To", value=float(hi), step=step, key=f"{key}_{param}_hi")
+    return low, high
@@ -0,0 +1,88 @@
+import numpy as np
+import streamlit as st
+import altair as alt
+import pandas as pd
+from models.monte_carlo import BUCKETS
+from models.simulation import terminal_values
+from models.withdrawal import RULES, max_withdrawal_rate, simulate_withdrawals
+
+RULE_LABELS = {
+    "fixed_real": "Fixed Real (4% rule)",
+    "percentage": "Percentage of Portfolio",
+    "guardrail": "Guardrails",
+}
+
+def display_withdrawals(monthly_plan, params):
+    """
+    Draw down the final portfolio over many random return paths
+    """
+    with st.expander("🏖️ Retirement Withdrawals"):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            rule = st.selectbox("Withdrawal Rule", RULES, format_func=RULE_LABELS.get, key="withdrawal_rule")
+            rate = st.slider("Withdrawal Rate (%)", 1.0, 10.0, 4.0, 0.1, key="withdrawal_rate") / 100
+        with col2:
+            years = st.number_input("Retirement Years", 1, 60, 30, key="withdrawal_years")
+            floor = st.slider(
+                "Spending Floor (% of first withdrawal)", 0, 100, 0, 5, key="withdrawal_floor",
+                help="A path also fails once its real withdrawal falls below this share of the first one.",
+            ) / 100
+        with col3:
+            order = st.multiselect(
+                "Draw Order", BUCKETS, default=["ETF DCA", "Stock Picks", "401(k)", "Roth IRA"],
+                key="withdrawal_order", help="Buckets are emptied in this order; unlisted ones come last.",
+            )
+            target = st.slider("Target Success (%)", 50, 99, 90, 1, key="withdrawal_target") / 100
+
+        col1, col2 = st.columns(2)
+        run = col1.button("🏖️ Simulate Withdrawals", key="withdrawal_run")
+        search = col2.button("🔎 Find Maximum Sustainable Rate", key="withdrawal_search")
+        if not (run or search):
+            return
+
+        final = terminal_values(monthly_plan=monthly_plan, **params)
+        balances = [float(final[bucket]) for bucket in BUCKETS]
+        if sum(balances) <= 0:
+            st.info("The accumulation phase ends with an empty portfolio → nothing to withdraw.")
+            return
+
+        settings = dict(
+            rule=rule,
+            withdrawal_months=int(years) * 12,
+            order=list(order) + [bucket for bucket in BUCKETS if bucket not in order],
+            roth_ira_return=params["roth_ira_return"],
+            k401_return=params["k401_return"],
+            dca_return=params["dca_return"],
+            stock_return=params["stock_return"],
+            inflation_rate=params["inflation_rate"],
+            spending_floor=floor,
+        )
+        result = simulate_withdrawals(balances, rate, **settings)
+
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Starting Portfolio", f"${sum(balances):,.0f}")
+        col2.metric("First Year Withdrawal", f"${rate * sum(balances):,.0f}")
+        col3.metric("Success Rate", f"{result['success_rate']:.1%}")
+        col4.metric("Median Final (Real)", f"${np.median(result['terminal_real']):,.0f}")
+
+        if search:
+            best, _ = max_withdrawal_rate(balances, target, max_rate=0.5, **settings)
+            st.success(
+                f"Highest rate with ≥{target:.0%} success: {best:.2%} "
+                f"(${best * sum(balances):,.0f} in the first year)"
+            )
+
+        failed = result["depletion_month"][~result["success"]]
+        if len(failed):
+            chart_data = pd.DataFrame({"Year": (failed - 1) // 12 + 1})
+            histogram = (
+                alt.Chart(chart_data)
+                    .mark_bar(opacity=0.85)
+                    .encode(
+                        x=alt.X("Year:O", title="Year Withdrawals Fail"),
+                        y=alt.Y("count():Q", title="Paths"),
+                        tooltip=["Year:O", alt.Tooltip("count():Q", title="Paths")]
+                    )
+            )
+            st.altair_chart(histogram, use_container_width=True)
+        st.caption("Returns are drawn around the sidebar rates with the Monte Carlo default volatilities.")
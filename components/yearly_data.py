@@ -1,8 +1,24 @@
+import numpy as np
 import streamlit as st
 
-def display_yearly_data(data):
+def build_yearly_rows(data, real=False):
     """
-    Display yearly portfolio data in table format
+    One row per whole year, taken from strided column views (no per-month loop)
+    """
+    suffix = "_Adjusted" if real else ""
+    months = np.asarray(data["Month"])
+    yearly = months % 12 == 0
+    columns = {name: np.asarray(data[name + suffix])[yearly]
+               for name in data.value_columns}
+    return [
+        {"Year": int(month) // 12, **{name: float(values[i]) for name, values in columns.items()}}
+        for i, month in enumerate(months[yearly])
+    ]
+
+def display_yearly_data(data, rows=None):
+    """
+    Display yearly portfolio data in table format.
+    rows: optional precomputed (nominal, real) rows from build_yearly_rows
     """
     st.subheader("📈 Yearly Data")
     
@@ -10,57 +26,33 @@ def display_yearly_data(data):
     yearly_tab1, yearly_tab2 = st.tabs(["💰 Nominal Yearly Data", "📈 Real Yearly Data (Inflation-Adjusted)"])
     
     with yearly_tab1:
-        # Create yearly data from lists (nominal)
-        yearly_data = []
-        for i, month in enumerate(data["Month"]):
-            if month % 12 == 0:  # Only yearly data
-                yearly_data.append({
-                    "Year": month // 12,
-                    "Total": data["Total"][i],
-                    "Roth IRA": data["Roth IRA"][i],
-                    "401(k)": data["401(k)"][i],
-                    "ETF DCA": data["ETF DCA"][i],
-                    "Stock Picks": data["Stock Picks"][i]
-                })
+        # Yearly rows (nominal)
+        yearly_data = rows[0] if rows else build_yearly_rows(data)
         
         if yearly_data:
             # Display as a simple table without pandas
             st.write("**Yearly Portfolio Values (Nominal):**")
             for row in yearly_data:
                 st.write(f"**Year {row['Year']}:**")
-                st.write(f"  Total: ${row['Total']:,.2f}")
-                st.write(f"  Roth IRA: ${row['Roth IRA']:,.2f}")
-                st.write(f"  401(k): ${row['401(k)']:,.2f}")
-                st.write(f"  ETF DCA: ${row['ETF DCA']:,.2f}")
-                st.write(f"  Stock Picks: ${row['Stock Picks']:,.2f}")
+                for name, value in row.items():
+                    if name != "Year":
+                        st.write(f"  {name}: ${value:,.2f}")
                 st.write("---")
         else:
             st.info("No yearly data to display.")
 
     with yearly_tab2:
-        # Create yearly data from lists (inflation-adjusted)
-        yearly_data_adj = []
-        for i, month in enumerate(data["Month"]):
-            if month % 12 == 0:  # Only yearly data
-                yearly_data_adj.append({
-                    "Year": month // 12,
-                    "Total": data["Total_Adjusted"][i],
-                    "Roth IRA": data["Roth IRA_Adjusted"][i],
-                    "401(k)": data["401(k)_Adjusted"][i],
-                    "ETF DCA": data["ETF DCA_Adjusted"][i],
-                    "Stock Picks": data["Stock Picks_Adjusted"][i]
-                })
+        # Yearly rows (inflation-adjusted)
+        yearly_data_adj = rows[1] if rows else build_yearly_rows(data, real=True)
         
         if yearly_data_adj:
             # Display as a simple table without pandas
             st.write("**Yearly Portfolio Values (Real - Inflation-Adjusted):**")
             for row in yearly_data_adj:
                 st.write(f"**Year {row['Year']}:**")
-                st.write(f"  Total: ${row['Total']:,.2f}")
-                st.write(f"  Roth IRA: ${row['Roth IRA']:,.2f}")
-                st.write(f"  401(k): ${row['401(k)']:,.2f}")
-                st.write(f"  ETF DCA: ${row['ETF DCA']:,.2f}")
-                st.write(f"  Stock Picks: ${row['Stock Picks']:,.2f}")
+                for name, value in row.items():
+                    if name != "Year":
+                        st.write(f"  {name}: ${value:,.2f}")
                 st.write("---")
         else:
             st.info("No yearly data to display.") 
\ No newline at end of file
@@ -1,14 +1,24 @@
 import streamlit as st
 import matplotlib.pyplot as plt
 import altair as alt
+from models.incremental import IncrementalSimulator
+from models.schedule import schedule_vector
 from models.simulation import compound_growth_with_visualization
 from utils.irr import calculate_irr
-from components.sidebar import sidebar_controls
-from components.periods import periods_editor
-from components.results import display_results
-from components.charts import display_portfolio_charts
-from components.allocation import display_allocation_breakdown
-from components.yearly_data import display_yearly_data
+from utils.cache import SimulationCache, simulation_key
+from utils.pipeline import Pipeline
+from components.sidebar import sidebar_controls, simulation_params
+from components.periods import periods_editor, schedules_editor
+from components.goal_seek import display_goal_seek
+from components.sensitivity import display_sensitivity
+from components.sweep import display_parameter_sweep
+from components.backtest import display_backtest
+from components.withdrawal import display_withdrawals
+from components.monte_carlo import display_monte_carlo
+from components.results import compute_metrics, display_results
+from components.charts import build_chart_frame, display_portfolio_charts
+from components.allocation import build_allocation_image, display_allocation_breakdown
+from components.yearly_data import build_yearly_rows, display_yearly_data
 
 # -----------------------------------------------------------
 # 🖼  Page config — run only once per session
@@ -28,6 +38,48 @@ def _load_libs():
 
 plt, alt = _load_libs()
 
+# -----------------------------------------------------------
+# 🗄  Simulation results – shared by every session in this process
+# -----------------------------------------------------------
+@st.cache_resource
+def _simulation_cache():
+    return SimulationCache(max_entries=512, max_bytes=256 * 2**20)
+
+# -----------------------------------------------------------
+# 🔁  Result pipeline – stages rerun only when their inputs change
+# -----------------------------------------------------------
+def _growth(monthly_plan, growth_params):
+    # Inflation only affects the lazily derived real series (the deflation stage), so the
+    # nominal run is keyed and simulated without it. On a miss, this session's simulator
+    # resumes monthly runs from the months its previous run shares with the edited plan.
+    simulator = st.session_state.setdefault("incremental_simulator", IncrementalSimulator())
+    params = simulation_params({**growth_params, "inflation_rate": 0.0})
+    if growth_params["resolution"] == "monthly" and not growth_params["schedules"]:
+        simulate = lambda: simulator.run(monthly_plan=monthly_plan, **params)
+    else:
+        simulate = lambda: compound_growth_with_visualization(
+            monthly_plan=monthly_plan, resolution=growth_params["resolution"],
+            schedules=growth_params["schedules"], **params
+        )
+    return _simulation_cache().get_or_compute(simulation_key(growth_params, monthly_plan), simulate)
+
+def _result_pipeline():
+    store = st.session_state.setdefault("pipeline_outputs", {})
+    return (
+        Pipeline(store)
+        .add("growth", _growth, inputs=("monthly_plan", "growth_params"))
+        .add("deflation", lambda inflation_rate, growth: growth.with_inflation(inflation_rate),
+             inputs=("inflation_rate",), depends=("growth",))
+        .add("metrics", lambda sim_years, inflation_rate, deflation: compute_metrics(deflation, sim_years, inflation_rate),
+             inputs=("sim_years", "inflation_rate"), depends=("deflation",))
+        .add("chart_nominal", lambda growth: build_chart_frame(growth), depends=("growth",))
+        .add("chart_real", lambda deflation: build_chart_frame(deflation, real=True), depends=("deflation",))
+        .add("allocation_nominal", lambda growth: build_allocation_image(growth), depends=("growth",))
+        .add("allocation_real", lambda deflation: build_allocation_image(deflation, real=True), depends=("deflation",))
+        .add("yearly_nominal", lambda growth: build_yearly_rows(growth), depends=("growth",))
+        .add("yearly_real", lambda deflation: build_yearly_rows(deflation, real=True), depends=("deflation",))
+    )
+
 # -----------------------------------------------------------
 # 🎛  Interactive UI
 # -----------------------------------------------------------
@@ -41,45 +93,60 @@ def main():
 
     # ---------- Period configuration ----------
     monthly_plan = periods_editor()
+    schedules = schedules_editor(sidebar_params["sim_months"])
+
+    # ---------- Goal seek ----------
+    display_goal_seek(monthly_plan, simulation_params(sidebar_params))
+
+    # ---------- Sensitivity ----------
+    display_sensitivity(monthly_plan, simulation_params(sidebar_params))
+
+    # ---------- Parameter sweep ----------
+    display_parameter_sweep(monthly_plan, simulation_params(sidebar_params))
+
+    # ---------- Historical backtest ----------
+    display_backtest(monthly_plan, simulation_params(sidebar_params))
+
+    # ---------- Withdrawals ----------
+    display_withdrawals(monthly_plan, simulation_params(sidebar_params))
+
+    # ---------- Monte Carlo ----------
+    display_monte_carlo(monthly_plan, simulation_params(sidebar_params))
 
     # ---------- Run simulation ----------
     if st.button("🚀 Run Simulation", type="primary", key="main_run_simulation"):
-        data = compound_growth_with_visualization(
+        # A scheduled inflation rate only changes the deflation stage, as a per-month vector
+        inflation_rate = sidebar_params["inflation_rate"]
+        if "inflation_rate" in schedules:
+            inflation_rate = schedule_vector(schedules["inflation_rate"], inflation_rate, sidebar_params["sim_months"])
+        outputs = _result_pipeline().run(
             monthly_plan=monthly_plan,
-            roth_ira_cap=sidebar_params["roth_cap"],
-            roth_ira_enabled=sidebar_params["enable_roth"],
-            k401_cap=sidebar_params["k401_cap"],
-            k401_enabled=sidebar_params["enable_k401"],
-            simulation_months=sidebar_params["sim_months"],
-            roth_ira_return=sidebar_params["roth_r"],
-            k401_return=sidebar_params["k401_r"],
-            dca_return=sidebar_params["dca_r"],
-            stock_return=sidebar_params["stock_r"],
-            dca_ratio=sidebar_params["dca_ratio"],
-            stock_ratio=sidebar_params["stock_ratio"],
-            inflation_rate=sidebar_params["inflation_rate"],
-            initial_roth=sidebar_params["initial_roth"],
-            initial_401k=sidebar_params["initial_401k"],
-            initial_dca=sidebar_params["initial_dca"],
-            initial_stock=sidebar_params["initial_stock"],
+            growth_params={
+                **{k: v for k, v in sidebar_params.items() if k != "inflation_rate"},
+                "schedules": {k: v for k, v in schedules.items() if k != "inflation_rate"},
+            },
+            inflation_rate=inflation_rate,
+            sim_years=sidebar_params["sim_years"],
         )
+        data = outputs["deflation"]
         
         # ---------- Display Results ----------
         display_results(
             data=data,
             sim_years=sidebar_params["sim_years"],
             sim_months=sidebar_params["sim_months"],
-            inflation_rate=sidebar_params["inflation_rate"]
+            inflation_rate=inflation_rate,
+            metrics=outputs["metrics"],
         )
 
         # ---------- Portfolio growth chart ----------
-        display_portfolio_charts(data)
+        display_portfolio_charts(data, (outputs["chart_nominal"], outputs["chart_real"]))
 
         # ---------- Allocation breakdown ----------
-        display_allocation_breakdown(data)
+        display_allocation_breakdown(data, (outputs["allocation_nominal"], outputs["allocation_real"]))
 
         # ---------- Data table (yearly rows only) ----------
-        display_yearly_data(data)
+        display_yearly_data(data, (outputs["yearly_nominal"], outputs["yearly_real"]))
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
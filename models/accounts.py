@@ -0,0 +1,188 @@
+import numpy as np
+
+# Fields of an account dict and their defaults. "name" and "return" are required.
+ACCOUNT_DEFAULTS = {
+    "annual_cap": None,        # Yearly contribution limit, filled as annual_cap / 12 per month
+    "monthly_cap": None,       # Or a monthly limit; an account with neither only receives its share
+    "priority": 0,             # Capped accounts fill in ascending priority (ties keep list order)
+    "share": 0.0,              # Fraction of what is left after every cap has been filled
+    "initial": 0.0,            # Month-0 balance
+    "enabled": True,           # A disabled account receives nothing
+    "compound_initial": True,  # False: the initial balance is reported at month 0 but never compounds
+    "label": None,             # Prefix of its contribution columns; defaults to the name
+}
+
+
+class AccountSpec:
+    """
+    A list of account dicts compiled into struct-of-arrays form: one entry per account in every
+    array, so allocating and compounding any number of accounts is a handful of array operations.
+
+    Each month's contribution first fills the capped accounts in priority order (a waterfall),
+    each taking min(remaining, cap) like the legacy loop, so a negative amount is drawn from the
+    first enabled capped account; whatever remains is split across accounts by `share`,
+    regardless of caps. The legacy model is
+    Roth IRA (cap) -> 401(k) (cap) -> ETF DCA / Stock Picks (dca_ratio / stock_ratio shares).
+
+    Every numeric field and "enabled" broadcasts against (..., step) arrays: a scalar, a per-month
+    vector (see models.schedule) or a per-scenario column such as values[:, None]. The arrays are
+    (account, ..., 1 or step), the last axis being time, so `varying` accounts have a full one.
+    """
+
+    __slots__ = ("names", "labels", "returns", "monthly_caps", "shares", "enabled", "initial", "start",
+                 "waterfall")
+
+    def __init__(self, accounts):
+        accounts = [{**ACCOUNT_DEFAULTS, **account} for account in accounts]
+        self.names = [account["name"] for account in accounts]
+        if len(set(self.names)) != len(self.names):
+            raise ValueError(f"Account names must be unique: {self.names}")
+        self.labels = [account["label"] or account["name"] for account in accounts]
+
+        caps = []
+        for account in accounts:
+            if account["annual_cap"] is not None and account["monthly_cap"] is not None:
+                raise ValueError(f"Account {account['name']!r} has both an annual and a monthly cap")
+            if account["monthly_cap"] is not None:
+                caps.append(account["monthly_cap"])
+            elif account["annual_cap"] is not None:
+                caps.append(np.true_divide(account["annual_cap"], 12))
+            else:
+                caps.append(np.inf)
+
+        fields = {
+            "returns": [account["return"] for account in accounts],
+            "monthly_caps": caps,
+            "shares": [account["share"] for account in accounts],
+            "enabled": [account["enabled"] for account in accounts],
+            "initial": [account["initial"] for account in accounts],
+        }
+        shapes = {name: [_shape(value) for value in values] for name, values in fields.items()}
+        ndim = max(1, *(len(shape) for field in shapes.values() for shape in field))
+        stacked = {name: _stack(values, shapes[name], ndim) for name, values in fields.items()}
+        self.enabled = stacked["enabled"].astype(bool)
+        self.returns = stacked["returns"]
+        self.monthly_caps = stacked["monthly_caps"]
+        self.shares = np.where(self.enabled, stacked["shares"], 0.0)
+        self.initial = stacked["initial"]
+        compound = np.array([account["compound_initial"] for account in accounts], dtype=bool)
+        self.start = np.where(compound.reshape((-1,) + (1,) * ndim), self.initial, 0.0)
+
+        capped = [i for i, account in enumerate(accounts)
+                  if account["annual_cap"] is not None or account["monthly_cap"] is not None]
+        priorities = [accounts[i]["priority"] for i in capped]
+        self.waterfall = np.array(capped, dtype=int)[np.argsort(priorities, kind="stable")]
+
+    def __len__(self):
+        return len(self.names)
+
+    def __repr__(self):
+        return f"AccountSpec({self.names!r})"
+
+    @property
+    def varying(self):
+        """
+        True when any return or share changes over time.
+        """
+        return self.returns.shape[-1] > 1 or self.shares.shape[-1] > 1
+
+    def take(self, months):
+        """
+        Copy with the per-month returns and shares picked at `months` (0-based), e.g. the month
+        each time step falls in; constant accounts are returned unchanged.
+        """
+        if not self.varying:
+            return self
+        spec = object.__new__(AccountSpec)
+        for name in self.__slots__:
+            setattr(spec, name, getattr(self, name))
+        spec.returns = self.returns[..., months] if self.returns.shape[-1] > 1 else self.returns
+        spec.shares = self.shares[..., months] if self.shares.shape[-1] > 1 else self.shares
+        return spec
+
+    def allocate(self, contributions, step_months=1.0):
+        """
+        (account, ..., step) contributions for a (..., step) array of total contributions per
+        time step. Caps are scaled by `step_months`, the length of each step in months (scalar or
+        (step,)).
+        """
+        remaining = np.asarray(contributions, dtype=float)
+        # Extra leading axes of `contributions` (e.g. scenarios) broadcast against every account
+        shares = _expand(self.shares, remaining.ndim)
+        shape = np.broadcast_shapes(remaining.shape, shares.shape[1:], *(array.shape[1:] for array in
+                                                                         (self.monthly_caps, self.enabled)))
+        # min(remaining, cap) account by account, as the legacy loop does (also for negative amounts)
+        capped = []
+        for account in self.waterfall:
+            amount = np.minimum(remaining, self.monthly_caps[account] * step_months)
+            if not self.enabled[account].all():
+                amount = np.where(self.enabled[account], amount, 0.0)
+            capped.append(amount)
+            remaining = remaining - amount
+        allocation = np.multiply(shares, remaining, out=np.empty((len(self),) + shape))
+        for account, amount in zip(self.waterfall, capped):
+            allocation[account] += amount
+        return allocation
+
+
+def _expand(array, ndim):
+    """
+    (account, ...) array with axes inserted after the account axis to give it ndim + 1 dimensions.
+    """
+    missing = ndim + 1 - array.ndim
+    return array.reshape(array.shape[:1] + (1,) * missing + array.shape[1:]) if missing > 0 else array
+
+
+def _shape(value):
+    return () if isinstance(value, (int, float)) else np.shape(value)
+
+
+def _stack(values, shapes, ndim):
+    """
+    (account, ...) array of per-account values of the given shapes, each broadcast to the common
+    shape of the field and padded with leading axes to `ndim` dimensions.
+    """
+    if not any(shapes):
+        return np.array(values, dtype=float).reshape((-1,) + (1,) * ndim)
+    shape = np.broadcast_shapes(*shapes)
+    stacked = np.empty((len(values),) + (1,) * (ndim - len(shape)) + shape)
+    for i, value in enumerate(values):
+        stacked[i] = value
+    return stacked
+
+
+def compile_accounts(accounts):
+    """
+    AccountSpec for a list of account dicts (an AccountSpec is returned unchanged).
+    """
+    return accounts if isinstance(accounts, AccountSpec) else AccountSpec(accounts)
+
+
+def legacy_accounts(
+    roth_ira_cap=7_000,
+    roth_ira_enabled=True,
+    k401_cap=23_000,
+    k401_enabled=True,
+    roth_ira_return=0.10,
+    k401_return=0.10,
+    dca_return=0.10,
+    stock_return=0.10,
+    dca_ratio=0.60,
+    stock_ratio=0.40,
+    initial_roth=0,
+    initial_401k=0,
+    initial_dca=0,
+    initial_stock=0,
+):
+    """
+    The four accounts of compound_growth_with_visualization as an account list, with its column names.
+    """
+    return [
+        {"name": "Roth IRA", "label": "Roth", "return": roth_ira_return, "annual_cap": roth_ira_cap,
+         "priority": 0, "enabled": roth_ira_enabled, "initial": initial_roth, "compound_initial": False},
+        {"name": "401(k)", "label": "401k", "return": k401_return, "annual_cap": k401_cap,
+         "priority": 1, "enabled": k401_enabled, "initial": initial_401k, "compound_initial": False},
+        {"name": "ETF DCA", "label": "DCA", "return": dca_return, "share": dca_ratio, "initial": initial_dca},
+        {"name": "Stock Picks", "label": "Stock", "return": stock_return, "share": stock_ratio,
+         "initial": initial_stock},
+    ]
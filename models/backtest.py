@@ -0,0 +1,144 @@
+import os
+
+import numpy as np
+from models.accounts import compile_accounts, legacy_accounts
+from models.monte_carlo import BUCKETS, PERCENTILES
+from models.plan import compile_plan
+from models.returns import RETURN_COLUMNS
+from models.simulation import _covering_segments
+from utils.store import Panel, header_path, open_panel
+
+
+def load_history(path, return_column="return", cpi_column="cpi", date_column="date"):
+    """
+    Read monthly asset returns and CPI from a CSV file, a .npy file or a utils.store panel.
+
+    CSV files (and .npy structured arrays) have one row per month holding the simple return of that
+    month in RETURN_COLUMNS and/or `return_column` and the CPI index level at its end; plain 2-D
+    .npy arrays hold the columns (return, cpi). Panels (a Panel, or any file with a JSON header
+    written by utils.store) hold the same named columns and are read zero-copy from their memory
+    map; they must be monthly. The first month only supplies the base CPI level.
+
+    Returns {"roth_ira_return", "k401_return", "dca_return", "stock_return": (H,) monthly returns,
+    "inflation": (H,) monthly CPI inflation, "dates": (H,) labels or None}.
+    """
+    if isinstance(path, Panel) or os.path.exists(header_path(str(path))):
+        panel = path if isinstance(path, Panel) else open_panel(str(path))
+        if panel.frequency != "monthly":
+            raise ValueError(f"History must be monthly, got a {panel.frequency} panel")
+        columns = {name: panel[name] for name in panel.columns}
+        if panel.dates() is not None:
+            columns[date_column] = panel.dates().astype(str)
+    elif str(path).endswith(".npy"):
+        array = np.load(path, mmap_mode="r")
+        if array.dtype.names:
+            columns = {name: array[name] for name in array.dtype.names}
+        else:
+            columns = {return_column: array[:, 0], cpi_column: array[:, 1]}
+    else:
+        import pandas as pd
+        table = pd.read_csv(path)
+        columns = {name: table[name].to_numpy() for name in table.columns}
+
+    if cpi_column not in columns:
+        raise ValueError(f"History has no {cpi_column!r} column")
+    cpi = np.asarray(columns[cpi_column], dtype=float)
+    history = {"inflation": cpi[1:] / cpi[:-1] - 1}
+    for key in RETURN_COLUMNS:
+        column = columns.get(key, columns.get(return_column))
+        if column is None:
+            raise ValueError(f"History has neither {key!r} nor {return_column!r} returns")
+        history[key] = np.asarray(column, dtype=float)[1:]
+    history["dates"] = np.asarray(columns[date_column])[1:] if date_column in columns else None
+    return history
+
+
+def backtest(
+    history,
+    monthly_plan=[(1, 36, 5000)],
+    roth_ira_cap=7_000,
+    roth_ira_enabled=True,
+    k401_cap=23_000,
+    k401_enabled=True,
+    simulation_months=36,
+    dca_ratio=0.60,
+    stock_ratio=0.40,
+    initial_roth=0,
+    initial_401k=0,
+    initial_dca=0,
+    initial_stock=0,
+    percentiles=PERCENTILES,
+):
+    """
+    Replay a history (see load_history) through the four-bucket model for every start month of a
+    `simulation_months` window: returns replace the *_return rates and CPI replaces inflation_rate.
+
+    With L = cumulative log growth and P = prefix sums of exp(-L), a constant contribution c over
+    months a..b of the window starting at s ends at c * exp(L[s + n]) * (P[s + b + 1] - P[s + a]),
+    so all start dates cost O(history length × plan segments) in total.
+
+    Returns {"Start": (S,) start labels, "Percentiles", "Terminal": {bucket: (S,) final values},
+    "Terminal_Adjusted": {...}, "Terminal_Percentiles": {"Total": (P,), "Total_Adjusted": (P,)},
+    "Total_Contributions": float}.
+    """
+    n = simulation_months
+    n_starts = len(history["inflation"]) - n + 1
+    if n_starts < 1:
+        raise ValueError(f"History covers {len(history['inflation'])} months, fewer than the {n}-month window")
+    starts = np.arange(n_starts)
+
+    # Every month of the window falls in one segment (a gap still allocates min(0, cap))
+    segment_starts, segment_ends, amounts = _covering_segments(compile_plan(monthly_plan))
+    first = np.maximum(segment_starts, 1)
+    last = np.minimum(segment_ends, n)
+    active = first <= last
+    first, last = first[active].astype(int), last[active].astype(int)
+    amounts = amounts[active]
+    spec = compile_accounts(legacy_accounts(
+        roth_ira_cap=roth_ira_cap,
+        roth_ira_enabled=roth_ira_enabled,
+        k401_cap=k401_cap,
+        k401_enabled=k401_enabled,
+        dca_ratio=dca_ratio,
+        stock_ratio=stock_ratio,
+        initial_roth=initial_roth,
+        initial_401k=initial_401k,
+        initial_dca=initial_dca,
+        initial_stock=initial_stock,
+    ))
+    buckets = spec.allocate(amounts)
+
+    terminal = {}
+    for bucket, key, contributions, start, initial in zip(BUCKETS, RETURN_COLUMNS, buckets, spec.start[:, 0],
+                                                         spec.initial[:, 0]):
+        log_growth = _cumulative_log_growth(history[key])
+        prefix = np.concatenate(([0.0], np.cumsum(np.exp(-log_growth))))
+        end = log_growth[starts + n]
+        window_sums = prefix[starts[:, None] + last + 1] - prefix[starts[:, None] + first]
+        value = start * np.exp(end - log_growth[starts]) + np.exp(end) * (window_sums * contributions).sum(axis=1)
+        terminal[bucket] = value if n else np.full(n_starts, float(initial))
+    terminal = {"Total": sum(terminal.values()), **terminal}
+
+    inflation = _cumulative_log_growth(history["inflation"])
+    deflator = np.exp(inflation[starts + n] - inflation[starts])
+    terminal_adjusted = {bucket: values / deflator for bucket, values in terminal.items()}
+
+    dates = history.get("dates")
+    return {
+        "Start": starts if dates is None else np.asarray(dates)[starts],
+        "Percentiles": tuple(percentiles),
+        "Terminal": terminal,
+        "Terminal_Adjusted": terminal_adjusted,
+        "Terminal_Percentiles": {
+            "Total": np.percentile(terminal["Total"], percentiles),
+            "Total_Adjusted": np.percentile(terminal_adjusted["Total"], percentiles),
+        },
+        "Total_Contributions": float((amounts * (last - first + 1)).sum()),
+    }
+
+
+def _cumulative_log_growth(monthly_returns):
+    """
+    L[i] = sum(log(1 + r[j]) for j < i), length len(monthly_returns) + 1.
+    """
+    return np.concatenate(([0.0], np.cumsum(np.log1p(np.asarray(monthly_returns, dtype=float)))))
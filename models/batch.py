@@ -0,0 +1,110 @@
+import numpy as np
+from models.simulation import _contribution_schedule, _simulate_arrays
+
+# Per-scenario parameters accepted by simulate_batch, with the same defaults as
+# compound_growth_with_visualization.
+SCENARIO_DEFAULTS = {
+    "roth_ira_cap": 7_000,
+    "roth_ira_enabled": True,
+    "k401_cap": 23_000,
+    "k401_enabled": True,
+    "roth_ira_return": 0.10,
+    "k401_return": 0.10,
+    "dca_return": 0.10,
+    "stock_return": 0.10,
+    "dca_ratio": 0.60,
+    "stock_ratio": 0.40,
+    "inflation_rate": 0.025,
+    "initial_roth": 0,
+    "initial_401k": 0,
+    "initial_dca": 0,
+    "initial_stock": 0,
+}
+
+SERIES = (
+    "Total", "Roth IRA", "401(k)", "ETF DCA", "Stock Picks",
+    "Total_Adjusted", "Roth IRA_Adjusted", "401(k)_Adjusted", "ETF DCA_Adjusted", "Stock Picks_Adjusted",
+    "Total_Contributions", "Roth_Contributions", "401k_Contributions", "DCA_Contributions", "Stock_Contributions",
+)
+
+
+def simulate_batch(
+    scenarios,
+    monthly_plan=[(1, 36, 5000)],
+    simulation_months=36,
+    series=SERIES,
+    chunk_size=4096,
+):
+    """
+    Run many scenarios of compound_growth_with_visualization in one vectorized pass.
+
+    `scenarios` is a dict of columns or a pandas DataFrame keyed by the scalar keyword arguments of
+    compound_growth_with_visualization (see SCENARIO_DEFAULTS); missing columns use the defaults and
+    scalars are broadcast to every row. `monthly_plan` is either one plan shared by all rows or a
+    sequence with one plan per row; a "monthly_plan" column in `scenarios` takes precedence.
+
+    Returns {"Month": (n + 1,) array, <series>: (scenario, n + 1) arrays} for the requested series.
+    Rows are processed `chunk_size` at a time so only the requested outputs are held in full.
+    """
+    columns = _table_columns(scenarios)
+    monthly_plan = columns.pop("monthly_plan", monthly_plan)
+
+    unknown = set(columns) - set(SCENARIO_DEFAULTS)
+    if unknown:
+        raise ValueError(f"Unknown scenario parameters: {sorted(unknown)}")
+    missing = set(series) - set(SERIES)
+    if missing:
+        raise ValueError(f"Unknown series: {sorted(missing)}")
+
+    params = {
+        key: np.asarray(columns.get(key, default), dtype=bool if key.endswith("_enabled") else float)
+        for key, default in SCENARIO_DEFAULTS.items()
+    }
+    if any(value.ndim > 1 for value in params.values()):
+        raise ValueError("Scenario parameters must be scalars or 1-D columns")
+
+    per_row_plan = _is_per_row_plan(monthly_plan)
+    shapes = [value.shape for value in params.values()]
+    if per_row_plan:
+        shapes.append((len(monthly_plan),))
+    n_scenarios = int(np.prod(np.broadcast_shapes(*shapes)))
+    params = {key: np.broadcast_to(value, (n_scenarios,)) for key, value in params.items()}
+
+    if per_row_plan:
+        contributions = None
+    else:
+        contributions = _contribution_schedule(monthly_plan, simulation_months)
+
+    results = {"Month": np.arange(simulation_months + 1)}
+    results.update((key, np.empty((n_scenarios, simulation_months + 1))) for key in series)
+
+    for lo in range(0, n_scenarios, chunk_size):
+        hi = min(lo + chunk_size, n_scenarios)
+        if per_row_plan:
+            chunk_contributions = np.stack(
+                [_contribution_schedule(plan, simulation_months) for plan in monthly_plan[lo:hi]]
+            )
+        else:
+            chunk_contributions = contributions
+        chunk = _simulate_arrays(chunk_contributions, **{key: value[lo:hi] for key, value in params.items()})
+        for key in series:
+            results[key][lo:hi] = chunk[key]
+
+    return results
+
+
+def _table_columns(scenarios):
+    """
+    Normalize a dict of columns or a DataFrame-like table into a plain dict of columns.
+    """
+    if hasattr(scenarios, "to_dict") and hasattr(scenarios, "columns"):
+        return {column: list(scenarios[column]) if column == "monthly_plan" else scenarios[column].to_numpy()
+                for column in scenarios.columns}
+    return dict(scenarios)
+
+
+def _is_per_row_plan(monthly_plan):
+    """
+    A shared plan is a sequence of (start, end, amount) tuples; a per-row plan is a sequence of those.
+    """
+    return not all(len(period) == 3 and all(np.isscalar(x) for x in period) for period in monthly_plan)
@@ -0,0 +1,127 @@
+import numpy as np
+from models.plan import compile_plan
+from models.simulation import terminal_values
+
+
+def solve_contribution_scale(target, real=False, max_scale=1e6, **params):
+    """
+    Factor to multiply every period amount by so the final portfolio reaches `target`.
+
+    `params` are the keyword arguments of terminal_values; `real=True` targets the
+    inflation-adjusted value. `target` and any parameter may be arrays to solve many targets or
+    clients at once. Returns (scale, converged); targets already met by the initial balances give 0.
+    """
+    plan = compile_plan(params.pop("monthly_plan", [(1, 36, 5000)]))
+    key = "Total_Adjusted" if real else "Total"
+
+    def value(scale):
+        return terminal_values(monthly_plan=plan, contribution_scale=scale, **params)[key]
+
+    return _solve_increasing(value, target, lower=0.0, upper=1.0, limit=max_scale)
+
+
+def solve_return(target, real=False, max_return=10.0, **params):
+    """
+    Annual return, applied to all four buckets, at which the final portfolio reaches `target`.
+    Returns (annual_return, converged); unreachable targets give NaN.
+    """
+    plan = compile_plan(params.pop("monthly_plan", [(1, 36, 5000)]))
+    for name in ("roth_ira_return", "k401_return", "dca_return", "stock_return"):
+        params.pop(name, None)
+    key = "Total_Adjusted" if real else "Total"
+
+    def value(rate):
+        return terminal_values(
+            monthly_plan=plan,
+            roth_ira_return=rate,
+            k401_return=rate,
+            dca_return=rate,
+            stock_return=rate,
+            **params,
+        )[key]
+
+    return _solve_increasing(value, target, lower=-0.99, upper=0.10, limit=max_return)
+
+
+def solve_months(target, real=False, max_months=1200, **params):
+    """
+    Smallest simulation length in months whose final portfolio reaches `target`, found by a
+    vectorized bisection over whole months (the value is non-decreasing in the horizon as long as
+    returns are non-negative). Returns (months, reached); months is -1 where max_months is not enough.
+    """
+    plan = compile_plan(params.pop("monthly_plan", [(1, 36, 5000)]))
+    params.pop("simulation_months", None)
+    key = "Total_Adjusted" if real else "Total"
+
+    def value(months):
+        return terminal_values(monthly_plan=plan, simulation_months=months, **params)[key]
+
+    target = np.asarray(target, dtype=float)
+    shape = np.broadcast_shapes(target.shape, np.shape(value(0)))
+    target = np.broadcast_to(target, shape)
+    lo = np.zeros(shape)
+    hi = np.full(shape, float(max_months))
+    reached = value(hi) >= target
+    done = value(lo) >= target
+    hi = np.where(done, 0.0, hi)
+    while np.any(hi - lo > 1):
+        mid = np.floor((lo + hi) / 2)
+        above = value(mid) >= target
+        hi = np.where(above, mid, hi)
+        lo = np.where(above, lo, mid)
+    months = np.where(reached, hi, -1).astype(int)
+    return _unwrap(months, reached)
+
+
+def _solve_increasing(func, target, lower, upper, limit, rtol=1e-10, max_iter=100):
+    """
+    Root of func(x) = target for each element, where func is vectorized and increasing in x.
+
+    The bracket starts at [lower, upper] and the upper end doubles until it passes the target
+    (or `limit`); then Newton steps with a central-difference slope are taken, falling back to
+    bisection whenever a step would leave the bracket.
+    """
+    target = np.asarray(target, dtype=float)
+    shape = np.broadcast_shapes(target.shape, np.shape(func(lower)))
+    target = np.broadcast_to(target, shape)
+    lo = np.full(shape, float(lower))
+    hi = np.full(shape, float(upper))
+
+    f_lo = func(lo) - target
+    f_hi = func(hi) - target
+    while np.any((f_hi < 0) & (hi < limit)):
+        grow = (f_hi < 0) & (hi < limit)
+        lo = np.where(grow, hi, lo)
+        f_lo = np.where(grow, f_hi, f_lo)
+        hi = np.where(grow, np.minimum(hi * 2, limit), hi)
+        f_hi = func(hi) - target
+
+    already = f_lo >= 0
+    solvable = already | (f_hi >= 0)
+    tolerance = rtol * np.maximum(np.abs(target), 1.0)
+
+    x = np.where(already, lo, (lo + hi) / 2)
+    converged = already.copy()
+    for _ in range(max_iter):
+        if np.all(converged | ~solvable):
+            break
+        fx = func(x) - target
+        converged |= solvable & ((np.abs(fx) <= tolerance) | (hi - lo <= 1e-12 * np.maximum(np.abs(x), 1.0)))
+        lo = np.where(fx < 0, x, lo)
+        hi = np.where(fx >= 0, x, hi)
+
+        step = 1e-6 * np.maximum(np.abs(x), 1e-3)
+        slope = (func(x + step) - func(x - step)) / (2 * step)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            newton = x - fx / slope
+        inside = np.isfinite(newton) & (newton > lo) & (newton < hi)
+        x = np.where(converged, x, np.where(inside, newton, (lo + hi) / 2))
+
+    x = np.where(solvable, x, np.nan)
+    return _unwrap(x, converged & solvable)
+
+
+def _unwrap(values, flags):
+    if np.ndim(values) == 0:
+        return values.item(), bool(flags)
+    return values, flags
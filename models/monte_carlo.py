@@ -0,0 +1,313 @@
+import numpy as np
+from models.accounts import compile_accounts, legacy_accounts
+from models.returns import cholesky_factor, draw_bucket_growth, history_returns
+from models.simulation import _compound_varying, _contribution_schedule, _monthly_rate
+from utils.growth_table import GROWTH_TABLE
+from utils.sketch import SKETCH_ACCURACY, QuantileSketch
+
+BUCKETS = ("Roth IRA", "401(k)", "ETF DCA", "Stock Picks")
+PERCENTILES = (5, 25, 50, 75, 95)
+# Bytes of an out-of-core (e.g. memory-mapped) path matrix read at once when computing bands
+_SUMMARY_BLOCK_BYTES = 64 * 2**20
+
+
+def monte_carlo_simulation(
+    monthly_plan=[(1, 36, 5000)],
+    roth_ira_cap=7_000,
+    roth_ira_enabled=True,
+    k401_cap=23_000,
+    k401_enabled=True,
+    simulation_months=36,
+    roth_ira_return=0.10,
+    k401_return=0.10,
+    dca_return=0.10,
+    stock_return=0.10,
+    roth_ira_volatility=0.15,
+    k401_volatility=0.15,
+    dca_volatility=0.15,
+    stock_volatility=0.20,
+    distribution="lognormal",
+    correlation=None,
+    history=None,
+    block_months=12,
+    dca_ratio=0.60,
+    stock_ratio=0.40,
+    inflation_rate=0.025,
+    initial_roth=0,
+    initial_401k=0,
+    initial_dca=0,
+    initial_stock=0,
+    n_paths=10_000,
+    chunk_size=1_000,
+    seed=0,
+    percentiles=PERCENTILES,
+    paths_out=None,
+):
+    """
+    Stochastic version of compound_growth_with_visualization: every bucket draws monthly returns
+    from `distribution` ("normal" or "lognormal") around its *_return with its *_volatility.
+    `correlation` (4 × 4, BUCKETS order) correlates the buckets' shocks; `history` instead
+    block-bootstraps `block_months`-long runs of historical returns (see draw_bucket_growth).
+
+    Paths are simulated `chunk_size` at a time, each chunk with its own child of SeedSequence(seed),
+    so a given (seed, chunk_size) always reproduces the same paths. Returns
+    {"Month", "Percentiles", "Total": (percentile, month) bands, "Total_Adjusted": real bands,
+     "Terminal": {bucket: (n_paths,) final values}, "Terminal_Adjusted": {...}}.
+
+    `paths_out` is an optional (n_paths, simulation_months + 1) array, e.g. a np.memmap or
+    utils.store.PathWriter.array, that receives every total path chunk by chunk instead of an
+    in-memory matrix; bands are then computed a block of months at a time, so runs larger than
+    RAM only hold one chunk of paths plus one block of months. Without it the whole matrix is
+    allocated: use monte_carlo_streaming when only the bands are needed.
+    """
+    model = _path_model(
+        monthly_plan=monthly_plan,
+        roth_ira_cap=roth_ira_cap,
+        roth_ira_enabled=roth_ira_enabled,
+        k401_cap=k401_cap,
+        k401_enabled=k401_enabled,
+        simulation_months=simulation_months,
+        returns=(roth_ira_return, k401_return, dca_return, stock_return),
+        volatilities=(roth_ira_volatility, k401_volatility, dca_volatility, stock_volatility),
+        distribution=distribution,
+        correlation=correlation,
+        history=history,
+        block_months=block_months,
+        dca_ratio=dca_ratio,
+        stock_ratio=stock_ratio,
+        inflation_rate=inflation_rate,
+        initial=(initial_roth, initial_401k, initial_dca, initial_stock),
+    )
+
+    totals = np.empty((n_paths, simulation_months + 1)) if paths_out is None else paths_out
+    terminal = np.empty((n_paths, len(BUCKETS)))
+    chunks = _chunks(n_paths, chunk_size)
+    for (lo, hi), chunk_seed in zip(chunks, _chunk_seeds(seed, len(chunks))):
+        totals[lo:hi], terminal[lo:hi] = _simulate_chunk(np.random.default_rng(chunk_seed), hi - lo, model)
+
+    return _summarize(totals, terminal, model, percentiles)
+
+
+def monte_carlo_streaming(
+    monthly_plan=[(1, 36, 5000)],
+    roth_ira_cap=7_000,
+    roth_ira_enabled=True,
+    k401_cap=23_000,
+    k401_enabled=True,
+    simulation_months=36,
+    roth_ira_return=0.10,
+    k401_return=0.10,
+    dca_return=0.10,
+    stock_return=0.10,
+    roth_ira_volatility=0.15,
+    k401_volatility=0.15,
+    dca_volatility=0.15,
+    stock_volatility=0.20,
+    distribution="lognormal",
+    correlation=None,
+    history=None,
+    block_months=12,
+    dca_ratio=0.60,
+    stock_ratio=0.40,
+    inflation_rate=0.025,
+    initial_roth=0,
+    initial_401k=0,
+    initial_dca=0,
+    initial_stock=0,
+    n_paths=10_000,
+    chunk_size=1_000,
+    seed=0,
+    percentiles=PERCENTILES,
+    accuracy=SKETCH_ACCURACY,
+):
+    """
+    monte_carlo_simulation without the path matrix: each chunk of paths is folded into per-month
+    QuantileSketches (plus running mean and variance) and dropped, so memory is
+    O(months × sketch bins) for any n_paths. Same paths as monte_carlo_simulation for the same
+    (seed, chunk_size); each band is within `accuracy` relative error of the path at its rank.
+
+    Returns {"Month", "Percentiles", "Total": (percentile, month) bands, "Total_Adjusted",
+    "Mean", "Mean_Adjusted", "Std", "Std_Adjusted": (month,), "Terminal_Percentiles":
+    {"Total", bucket...: (percentile,)}, "Sketch": QuantileSketch of the monthly totals,
+    "Terminal_Sketch": QuantileSketch of the final bucket values}.
+    """
+    model = _path_model(
+        monthly_plan=monthly_plan,
+        roth_ira_cap=roth_ira_cap,
+        roth_ira_enabled=roth_ira_enabled,
+        k401_cap=k401_cap,
+        k401_enabled=k401_enabled,
+        simulation_months=simulation_months,
+        returns=(roth_ira_return, k401_return, dca_return, stock_return),
+        volatilities=(roth_ira_volatility, k401_volatility, dca_volatility, stock_volatility),
+        distribution=distribution,
+        correlation=correlation,
+        history=history,
+        block_months=block_months,
+        dca_ratio=dca_ratio,
+        stock_ratio=stock_ratio,
+        inflation_rate=inflation_rate,
+        initial=(initial_roth, initial_401k, initial_dca, initial_stock),
+    )
+    chunks = _chunks(n_paths, chunk_size)
+    tasks = [(lo, hi, chunk_seed) for (lo, hi), chunk_seed in zip(chunks, _chunk_seeds(seed, len(chunks)))]
+    sketches = _sketch_chunks(model, tasks, accuracy)
+    return _summarize_sketches(*sketches, model, percentiles)
+
+
+def _path_model(
+    monthly_plan,
+    roth_ira_cap,
+    roth_ira_enabled,
+    k401_cap,
+    k401_enabled,
+    simulation_months,
+    returns,
+    volatilities,
+    distribution,
+    dca_ratio,
+    stock_ratio,
+    inflation_rate,
+    initial,
+    correlation=None,
+    history=None,
+    block_months=12,
+):
+    """
+    Everything a chunk needs that does not depend on the random draws, as compact arrays.
+    """
+    # Only the allocation and starting balances are used; the returns are drawn per path
+    initial_roth, initial_401k, initial_dca, initial_stock = initial
+    spec = compile_accounts(legacy_accounts(
+        roth_ira_cap=roth_ira_cap,
+        roth_ira_enabled=roth_ira_enabled,
+        k401_cap=k401_cap,
+        k401_enabled=k401_enabled,
+        dca_ratio=dca_ratio,
+        stock_ratio=stock_ratio,
+        initial_roth=initial_roth,
+        initial_401k=initial_401k,
+        initial_dca=initial_dca,
+        initial_stock=initial_stock,
+    ))
+    if correlation is not None and cholesky_factor(correlation).shape != (len(BUCKETS), len(BUCKETS)):
+        raise ValueError(f"Correlation matrix must be {len(BUCKETS)} × {len(BUCKETS)}, one row per bucket")
+    return {
+        "months": simulation_months,
+        "contributions": spec.allocate(_contribution_schedule(monthly_plan, simulation_months)),
+        "returns": np.asarray(returns, dtype=float),
+        "volatilities": np.asarray(volatilities, dtype=float),
+        "distribution": distribution,
+        "correlation": None if correlation is None else np.asarray(correlation, dtype=float),
+        "history": None if history is None else history_returns(history),
+        "block_months": block_months,
+        "initial": spec.initial[:, 0],
+        "start": spec.start[:, 0],
+        "deflator": GROWTH_TABLE.powers(_monthly_rate(inflation_rate), 0, simulation_months + 1),
+    }
+
+
+def _chunks(n_paths, chunk_size):
+    return [(lo, min(lo + chunk_size, n_paths)) for lo in range(0, n_paths, chunk_size)]
+
+
+def _chunk_seeds(seed, n_chunks):
+    """
+    One independent SeedSequence per chunk; chunk i always gets the same stream.
+    """
+    return np.random.SeedSequence(seed).spawn(n_chunks)
+
+
+def _draw_chunk_growth(rng, n_paths, model):
+    """
+    (bucket, path, month) monthly growth factors for one chunk.
+    """
+    return draw_bucket_growth(
+        rng,
+        model["returns"],
+        model["volatilities"],
+        (n_paths, model["months"]),
+        model["distribution"],
+        correlation=model["correlation"],
+        history=model["history"],
+        block_months=model["block_months"],
+    )
+
+
+def _simulate_chunk(rng, n_paths, model):
+    """
+    Simulate one chunk of paths; returns ((path, month + 1) totals, (path, bucket) terminal values).
+    """
+    growth = _draw_chunk_growth(rng, n_paths, model)
+    values = _compound_varying(model["start"][:, None, None], growth, model["contributions"][:, None, :])
+
+    totals = np.empty((n_paths, model["months"] + 1))
+    totals[:, 0] = model["initial"].sum()
+    totals[:, 1:] = values.sum(axis=0)
+    if model["months"]:
+        terminal = values[:, :, -1].T
+    else:
+        terminal = np.broadcast_to(model["initial"], (n_paths, len(BUCKETS)))
+    return totals, terminal
+
+
+def _summarize(totals, terminal, model, percentiles):
+    """
+    Percentile bands per month plus the terminal-value distribution. Real bands are the nominal
+    bands divided by the (deterministic) deflator, since percentiles commute with positive scaling.
+    """
+    deflator = model["deflator"]
+    if type(totals) is np.ndarray:
+        bands = np.percentile(totals, percentiles, axis=0)
+    else:
+        bands = np.empty((len(percentiles), totals.shape[1]))
+        block = max(1, _SUMMARY_BLOCK_BYTES // max(8 * totals.shape[0], 1))
+        for lo in range(0, totals.shape[1], block):
+            bands[:, lo:lo + block] = np.percentile(np.asarray(totals[:, lo:lo + block]), percentiles, axis=0)
+    terminal_values = {"Total": np.array(totals[:, -1])}
+    terminal_values.update((bucket, terminal[:, i]) for i, bucket in enumerate(BUCKETS))
+    return {
+        "Month": list(range(model["months"] + 1)),
+        "Percentiles": tuple(percentiles),
+        "Total": bands,
+        "Total_Adjusted": bands / deflator,
+        "Terminal": terminal_values,
+        "Terminal_Adjusted": {bucket: values / deflator[-1] for bucket, values in terminal_values.items()},
+    }
+
+
+def _sketch_chunks(model, tasks, accuracy):
+    """
+    Simulate the (lo, hi, seed) chunks in `tasks` into (monthly totals, terminal bucket) sketches.
+    Sketches of disjoint task lists merge into the sketches of their union.
+    """
+    totals = QuantileSketch(model["months"] + 1, accuracy)
+    terminal = QuantileSketch(len(BUCKETS), accuracy)
+    for lo, hi, chunk_seed in tasks:
+        chunk_totals, chunk_terminal = _simulate_chunk(np.random.default_rng(chunk_seed), hi - lo, model)
+        totals.update(chunk_totals)
+        terminal.update(chunk_terminal)
+    return totals, terminal
+
+
+def _summarize_sketches(totals, terminal, model, percentiles):
+    """
+    _summarize for sketched paths; real statistics divide by the deterministic deflator.
+    """
+    deflator = model["deflator"]
+    bands = totals.percentiles(percentiles)
+    terminal_bands = {"Total": bands[:, -1]}
+    terminal_bands.update(zip(BUCKETS, terminal.percentiles(percentiles).T))
+    return {
+        "Month": list(range(model["months"] + 1)),
+        "Percentiles": tuple(percentiles),
+        "Total": bands,
+        "Total_Adjusted": bands / deflator,
+        "Mean": totals.mean,
+        "Mean_Adjusted": totals.mean / deflator,
+        "Std": totals.std,
+        "Std_Adjusted": totals.std / deflator,
+        "Terminal_Percentiles": terminal_bands,
+        "Sketch": totals,
+        "Terminal_Sketch": terminal,
+    }
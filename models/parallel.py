@@ -0,0 +1,270 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+from models.batch import SERIES, _is_per_row_plan, _table_columns, simulate_batch
+from models.monte_carlo import (
+    BUCKETS, PERCENTILES, _chunk_seeds, _chunks, _path_model, _simulate_chunk, _sketch_chunks,
+    _summarize, _summarize_sketches,
+)
+from utils.sketch import SKETCH_ACCURACY
+
+
+def monte_carlo_parallel(
+    monthly_plan=[(1, 36, 5000)],
+    roth_ira_cap=7_000,
+    roth_ira_enabled=True,
+    k401_cap=23_000,
+    k401_enabled=True,
+    simulation_months=36,
+    roth_ira_return=0.10,
+    k401_return=0.10,
+    dca_return=0.10,
+    stock_return=0.10,
+    roth_ira_volatility=0.15,
+    k401_volatility=0.15,
+    dca_volatility=0.15,
+    stock_volatility=0.20,
+    distribution="lognormal",
+    correlation=None,
+    history=None,
+    block_months=12,
+    dca_ratio=0.60,
+    stock_ratio=0.40,
+    inflation_rate=0.025,
+    initial_roth=0,
+    initial_401k=0,
+    initial_dca=0,
+    initial_stock=0,
+    n_paths=10_000,
+    chunk_size=1_000,
+    seed=0,
+    percentiles=PERCENTILES,
+    workers=None,
+):
+    """
+    monte_carlo_simulation with its chunks spread over a process pool.
+
+    Chunk i is always seeded with the i-th SeedSequence child of `seed`, whichever worker runs it,
+    so the output is identical to monte_carlo_simulation for any number of workers. Workers write
+    their paths straight into shared-memory arrays instead of sending results back.
+    """
+    model = _path_model(
+        monthly_plan=monthly_plan,
+        roth_ira_cap=roth_ira_cap,
+        roth_ira_enabled=roth_ira_enabled,
+        k401_cap=k401_cap,
+        k401_enabled=k401_enabled,
+        simulation_months=simulation_months,
+        returns=(roth_ira_return, k401_return, dca_return, stock_return),
+        volatilities=(roth_ira_volatility, k401_volatility, dca_volatility, stock_volatility),
+        distribution=distribution,
+        correlation=correlation,
+        history=history,
+        block_months=block_months,
+        dca_ratio=dca_ratio,
+        stock_ratio=stock_ratio,
+        inflation_rate=inflation_rate,
+        initial=(initial_roth, initial_401k, initial_dca, initial_stock),
+    )
+    chunks = _chunks(n_paths, chunk_size)
+    tasks = [(lo, hi, chunk_seed) for (lo, hi), chunk_seed in zip(chunks, _chunk_seeds(seed, len(chunks)))]
+    layout = {
+        "totals": (n_paths, simulation_months + 1),
+        "terminal": (n_paths, len(BUCKETS)),
+    }
+
+    outputs = _run_sharded(_monte_carlo_task, model, tasks, layout, workers)
+    return _summarize(outputs["totals"], outputs["terminal"], model, percentiles)
+
+
+def monte_carlo_streaming_parallel(
+    monthly_plan=[(1, 36, 5000)],
+    roth_ira_cap=7_000,
+    roth_ira_enabled=True,
+    k401_cap=23_000,
+    k401_enabled=True,
+    simulation_months=36,
+    roth_ira_return=0.10,
+    k401_return=0.10,
+    dca_return=0.10,
+    stock_return=0.10,
+    roth_ira_volatility=0.15,
+    k401_volatility=0.15,
+    dca_volatility=0.15,
+    stock_volatility=0.20,
+    distribution="lognormal",
+    correlation=None,
+    history=None,
+    block_months=12,
+    dca_ratio=0.60,
+    stock_ratio=0.40,
+    inflation_rate=0.025,
+    initial_roth=0,
+    initial_401k=0,
+    initial_dca=0,
+    initial_stock=0,
+    n_paths=10_000,
+    chunk_size=1_000,
+    seed=0,
+    percentiles=PERCENTILES,
+    accuracy=SKETCH_ACCURACY,
+    workers=None,
+):
+    """
+    monte_carlo_streaming with its chunks spread over a process pool. Each worker sketches a
+    contiguous run of chunks and sends back only its sketches, which are merged here; bands are
+    identical to monte_carlo_streaming and moments equal up to floating-point rounding.
+    """
+    model = _path_model(
+        monthly_plan=monthly_plan,
+        roth_ira_cap=roth_ira_cap,
+        roth_ira_enabled=roth_ira_enabled,
+        k401_cap=k401_cap,
+        k401_enabled=k401_enabled,
+        simulation_months=simulation_months,
+        returns=(roth_ira_return, k401_return, dca_return, stock_return),
+        volatilities=(roth_ira_volatility, k401_volatility, dca_volatility, stock_volatility),
+        distribution=distribution,
+        correlation=correlation,
+        history=history,
+        block_months=block_months,
+        dca_ratio=dca_ratio,
+        stock_ratio=stock_ratio,
+        inflation_rate=inflation_rate,
+        initial=(initial_roth, initial_401k, initial_dca, initial_stock),
+    )
+    chunks = _chunks(n_paths, chunk_size)
+    tasks = [(lo, hi, chunk_seed) for (lo, hi), chunk_seed in zip(chunks, _chunk_seeds(seed, len(chunks)))]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(tasks)))
+
+    groups = [tasks[i * len(tasks) // workers:(i + 1) * len(tasks) // workers] for i in range(workers)]
+    if workers == 1:
+        parts = [_sketch_chunks(model, groups[0], accuracy)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_sketch_chunks, [model] * workers, groups, [accuracy] * workers))
+
+    totals, terminal = parts[0]
+    for part_totals, part_terminal in parts[1:]:
+        totals.merge(part_totals)
+        terminal.merge(part_terminal)
+    return _summarize_sketches(totals, terminal, model, percentiles)
+
+
+def simulate_batch_parallel(
+    scenarios,
+    monthly_plan=[(1, 36, 5000)],
+    simulation_months=36,
+    series=SERIES,
+    chunk_size=4096,
+    workers=None,
+):
+    """
+    simulate_batch with its rows sharded over a process pool; same arguments and results.
+    Each worker receives a compact column slice and writes its rows into shared memory.
+    """
+    columns = _table_columns(scenarios)
+    monthly_plan = columns.pop("monthly_plan", monthly_plan)
+    per_row_plan = _is_per_row_plan(monthly_plan)
+
+    shapes = [np.shape(value) for value in columns.values()]
+    if per_row_plan:
+        shapes.append((len(monthly_plan),))
+    n_scenarios = int(np.prod(np.broadcast_shapes(*shapes))) if shapes else 1
+    columns = {key: np.broadcast_to(value, (n_scenarios,)) for key, value in columns.items()}
+
+    job = {
+        "monthly_plan": None if per_row_plan else monthly_plan,
+        "simulation_months": simulation_months,
+        "series": tuple(series),
+        "chunk_size": chunk_size,
+    }
+    tasks = [
+        (lo, hi, (
+            {key: np.ascontiguousarray(value[lo:hi]) for key, value in columns.items()},
+            monthly_plan[lo:hi] if per_row_plan else None,
+        ))
+        for lo, hi in _chunks(n_scenarios, chunk_size)
+    ]
+    layout = {key: (n_scenarios, simulation_months + 1) for key in series}
+
+    results = {"Month": np.arange(simulation_months + 1)}
+    results.update(_run_sharded(_batch_task, job, tasks, layout, workers))
+    return results
+
+
+# -----------------------------------------------------------
+# Shared-memory plumbing
+# -----------------------------------------------------------
+def _run_sharded(task_fn, job, tasks, layout, workers):
+    """
+    Allocate one shared float64 block per output in `layout`, run task_fn(job, handles, lo, hi, payload)
+    for every (lo, hi, payload) task (in-process when workers <= 1) and return private copies of the blocks.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    blocks = {key: SharedMemory(create=True, size=max(int(np.prod(shape)) * 8, 1)) for key, shape in layout.items()}
+    try:
+        handles = {key: (blocks[key].name, shape) for key, shape in layout.items()}
+        if workers <= 1 or len(tasks) <= 1:
+            for lo, hi, payload in tasks:
+                task_fn(job, handles, lo, hi, payload)
+        else:
+            with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+                futures = [pool.submit(task_fn, job, handles, lo, hi, payload) for lo, hi, payload in tasks]
+                for future in futures:
+                    future.result()
+        return {key: np.ndarray(layout[key], buffer=blocks[key].buf).copy() for key in layout}
+    finally:
+        for block in blocks.values():
+            block.close()
+            block.unlink()
+
+
+def _attach(handles):
+    """
+    Map the parent's shared blocks into this process as numpy arrays.
+    """
+    blocks, arrays = [], {}
+    for key, (name, shape) in handles.items():
+        block = SharedMemory(name=name)
+        blocks.append(block)
+        arrays[key] = np.ndarray(shape, buffer=block.buf)
+    return blocks, arrays
+
+
+def _detach(blocks, arrays):
+    arrays.clear()
+    for block in blocks:
+        block.close()
+
+
+def _monte_carlo_task(model, handles, lo, hi, seed):
+    blocks, arrays = _attach(handles)
+    try:
+        totals, terminal = _simulate_chunk(np.random.default_rng(seed), hi - lo, model)
+        arrays["totals"][lo:hi] = totals
+        arrays["terminal"][lo:hi] = terminal
+    finally:
+        _detach(blocks, arrays)
+
+
+def _batch_task(job, handles, lo, hi, payload):
+    columns, row_plans = payload
+    blocks, arrays = _attach(handles)
+    try:
+        part = simulate_batch(
+            columns,
+            monthly_plan=job["monthly_plan"] if row_plans is None else row_plans,
+            simulation_months=job["simulation_months"],
+            series=job["series"],
+            chunk_size=job["chunk_size"],
+        )
+        for key in job["series"]:
+            arrays[key][lo:hi] = part[key]
+    finally:
+        _detach(blocks, arrays)
@@ -0,0 +1,142 @@
+import heapq
+from bisect import bisect_right
+
+import numpy as np
+
+
+class CompiledPlan:
+    """
+    A monthly_plan [(start_month, end_month, monthly_contribution), ...] compiled into sorted,
+    non-overlapping segments. Where periods overlap the first one listed wins, exactly like the
+    engine's "first matching period" scan, so iterating a CompiledPlan yields an equivalent plan.
+    """
+
+    __slots__ = ("periods", "starts", "ends", "amounts", "sources", "_dense")
+
+    def __init__(self, monthly_plan):
+        self.periods = [tuple(period) for period in monthly_plan]
+        self.starts, self.ends, self.amounts, self.sources = _resolve(self.periods)
+        self._dense = {}
+
+    def __iter__(self):
+        return iter(zip(self.starts, self.ends, self.amounts))
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __eq__(self, other):
+        return isinstance(other, CompiledPlan) and self.periods == other.periods
+
+    def __hash__(self):
+        return hash(tuple(self.periods))
+
+    def __repr__(self):
+        return f"CompiledPlan({self.periods!r})"
+
+    def amount_at(self, month):
+        """
+        Contribution for one month in O(log segments).
+        """
+        i = bisect_right(self.starts, month) - 1
+        if i >= 0 and month <= self.ends[i]:
+            return self.amounts[i]
+        return 0
+
+    def contributions(self, simulation_months):
+        """
+        Read-only dense vector of contributions for months 1..simulation_months, memoized per horizon.
+        """
+        dense = self._dense.get(simulation_months)
+        if dense is None:
+            dense = np.zeros(simulation_months)
+            for start, end, amt in self:
+                lo = max(start, 1) - 1
+                hi = min(end, simulation_months)
+                if lo < hi:
+                    dense[lo:hi] = amt
+            dense.flags.writeable = False
+            self._dense[simulation_months] = dense
+        return dense
+
+    def overlap_report(self):
+        """
+        Month ranges covered by more than one period, with the period that wins and the ones it
+        shadows (indices into the original plan): [{"start", "end", "winner", "shadowed"}, ...].
+        """
+        report = []
+        for start, end, active in _sweep(self.periods):
+            if len(active) > 1:
+                winner = min(active)
+                shadowed = sorted(active - {winner})
+                if report and report[-1]["end"] + 1 == start and report[-1]["winner"] == winner \
+                        and report[-1]["shadowed"] == shadowed:
+                    report[-1]["end"] = end
+                else:
+                    report.append({"start": start, "end": end, "winner": winner, "shadowed": shadowed})
+        return report
+
+
+def compile_plan(monthly_plan):
+    """
+    Compile a monthly_plan once so it can be reused across runs; compiled plans pass through.
+    """
+    if isinstance(monthly_plan, CompiledPlan):
+        return monthly_plan
+    return CompiledPlan(monthly_plan)
+
+
+def _boundaries(periods):
+    """
+    Period indices opening / closing at each month boundary, and the sorted boundaries themselves.
+    Periods with start > end never match and are ignored.
+    """
+    opening, closing = {}, {}
+    for index, (start, end, _) in enumerate(periods):
+        if start <= end:
+            opening.setdefault(start, []).append(index)
+            closing.setdefault(end + 1, []).append(index)
+    bounds = sorted(set(opening) | set(closing))
+    return opening, closing, bounds
+
+
+def _resolve(periods):
+    """
+    Sweep the period boundaries keeping a min-heap of active period indices (lazily pruned),
+    so each elementary range is assigned to its first listed period in O(P log P) overall.
+    """
+    opening, closing, bounds = _boundaries(periods)
+
+    starts, ends, amounts, sources = [], [], [], []
+    active, closed = [], set()
+    for bound, next_bound in zip(bounds, bounds[1:]):
+        closed.update(closing.get(bound, ()))
+        for index in opening.get(bound, ()):
+            heapq.heappush(active, index)
+        while active and active[0] in closed:
+            heapq.heappop(active)
+        if not active:
+            continue
+
+        winner = active[0]
+        if sources and sources[-1] == winner and ends[-1] + 1 == bound:
+            ends[-1] = next_bound - 1
+        else:
+            starts.append(bound)
+            ends.append(next_bound - 1)
+            amounts.append(periods[winner][2])
+            sources.append(winner)
+    return starts, ends, amounts, sources
+
+
+def _sweep(periods):
+    """
+    Yield (start, end, active period indices) for every elementary month range of the plan.
+    """
+    opening, closing, bounds = _boundaries(periods)
+
+    active = set()
+    for bound, next_bound in zip(bounds, bounds[1:]):
+        active.difference_update(closing.get(bound, ()))
+        active.update(opening.get(bound, ()))
+        if active:
+            yield bound, next_bound - 1, set(active)
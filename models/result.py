@@ -0,0 +1,250 @@
+import numpy as np
+from utils.growth_table import GROWTH_TABLE
+
+VALUE_COLUMNS = ("Total", "Roth IRA", "401(k)", "ETF DCA", "Stock Picks")
+MONTHLY_CONTRIBUTION_COLUMNS = (
+    "Monthly_Contributions", "Roth_Monthly_Contributions", "401k_Monthly_Contributions",
+    "DCA_Monthly_Contributions", "Stock_Monthly_Contributions",
+)
+# Columns stored in the block; everything else is derived from them on first access.
+CORE_COLUMNS = VALUE_COLUMNS + MONTHLY_CONTRIBUTION_COLUMNS
+
+ADJUSTED_COLUMNS = {name + "_Adjusted": name for name in VALUE_COLUMNS}
+CUMULATIVE_COLUMNS = {
+    "Total_Contributions": "Monthly_Contributions",
+    "Roth_Contributions": "Roth_Monthly_Contributions",
+    "401k_Contributions": "401k_Monthly_Contributions",
+    "DCA_Contributions": "DCA_Monthly_Contributions",
+    "Stock_Contributions": "Stock_Monthly_Contributions",
+}
+
+# The series of the original dict-of-lists result, in order.
+COLUMNS = VALUE_COLUMNS + tuple(ADJUSTED_COLUMNS) + tuple(CUMULATIVE_COLUMNS)
+
+
+def cumulative_column(monthly):
+    """
+    Name of the running total of a monthly contribution column, e.g.
+    "Monthly_Contributions" -> "Total_Contributions", "Roth_Monthly_Contributions" -> "Roth_Contributions".
+    """
+    if monthly == "Monthly_Contributions":
+        return "Total_Contributions"
+    return monthly[:-len("Monthly_Contributions")] + "Contributions"
+
+
+class SimulationResult:
+    """
+    Columnar simulation output. Only the nominal series are stored, in one contiguous
+    (column, month) float64 block: "Total", one value column per account and the contribution
+    made each month ("Monthly_Contributions" and "<label>_Monthly_Contributions" per account).
+    Real values ("<name>_Adjusted"), cumulative contributions ("<label>_Contributions") and cash
+    flows are derived on first access from a single deflator vector and memoized.
+
+    Reads like the old dict of lists (data["Month"], data["Total"][-1], data.keys(), ...);
+    slice() selects a month range without copying and with_inflation() re-derives the real
+    series for another inflation rate without re-running the growth model. inflation_rate is an
+    annual rate, or a vector of annual rates for months 1, 2, ... (the last one holds after it).
+    """
+
+    __slots__ = ("_block", "_index", "_first_month", "_lo", "_hi", "inflation_rate", "_derived")
+
+    def __init__(self, block, inflation_rate, columns=CORE_COLUMNS, first_month=0, window=None, derived=None):
+        self._block = block
+        self._index = {name: i for i, name in enumerate(columns)}
+        self._first_month = first_month
+        self._lo, self._hi = window or (0, block.shape[1])
+        self.inflation_rate = inflation_rate
+        # Full-length derived columns, shared with slices of this result
+        self._derived = {} if derived is None else derived
+
+    @classmethod
+    def from_series(cls, series, inflation_rate):
+        """
+        Build a result from a {column: sequence} mapping holding at least VALUE_COLUMNS and either
+        the monthly or the cumulative contribution columns. Any derived columns supplied are kept
+        as-is instead of being recomputed.
+        """
+        n = len(series[VALUE_COLUMNS[0]])
+        block = np.empty((len(CORE_COLUMNS), n))
+        for i, name in enumerate(VALUE_COLUMNS):
+            block[i] = series[name]
+        for i, (cumulative, monthly) in enumerate(CUMULATIVE_COLUMNS.items(), len(VALUE_COLUMNS)):
+            if monthly in series:
+                block[i] = series[monthly]
+            else:
+                block[i, :1] = 0.0
+                block[i, 1:] = np.diff(series[cumulative])
+
+        derived = {name: np.asarray(series[name], dtype=float)
+                   for name in (*ADJUSTED_COLUMNS, *CUMULATIVE_COLUMNS) if name in series}
+        return cls(block, inflation_rate, derived=derived)
+
+    # ---------- dict-compatible access ----------
+    def __getitem__(self, key):
+        if key == "Month":
+            return self.months
+        if key in self._index:
+            return self._block[self._index[key], self._lo:self._hi]
+        return self._full_derived(key)[self._lo:self._hi]
+
+    def __contains__(self, key):
+        return key == "Month" or key in self._index or self._source(key) is not None
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def keys(self):
+        values = self.value_columns
+        monthly = [name for name in self._index if name.endswith("Monthly_Contributions")]
+        return ["Month", *values, *(name + "_Adjusted" for name in values),
+                *(cumulative_column(name) for name in monthly), *monthly]
+
+    def values(self):
+        return [self[key] for key in self.keys()]
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    # ---------- columnar helpers ----------
+    @property
+    def value_columns(self):
+        """
+        "Total" followed by one value column per account, in block order.
+        """
+        return [name for name in self._index if not name.endswith("Monthly_Contributions")]
+
+    @property
+    def accounts(self):
+        return [name for name in self.value_columns if name != "Total"]
+
+    @property
+    def months(self):
+        return np.arange(self._first_month + self._lo, self._first_month + self._hi)
+
+    @property
+    def nbytes(self):
+        return self._block.nbytes + sum(value.nbytes for value in self._derived.values())
+
+    @property
+    def max_nbytes(self):
+        """
+        Bytes held once every derived column and the deflator have been memoized.
+        """
+        n_derived = len(self.value_columns) + sum(name.endswith("Monthly_Contributions") for name in self._index)
+        return self._block.nbytes + (n_derived + 1) * self._block.shape[1] * self._block.itemsize
+
+    def freeze(self):
+        """
+        Make the stored block and derived columns read-only, so a result shared between sessions
+        cannot be modified in place through the columns it hands out. Returns the result.
+        """
+        self._block.flags.writeable = False
+        for value in self._derived.values():
+            value.flags.writeable = False
+        return self
+
+    @property
+    def deflator(self):
+        """
+        (1 + monthly inflation) ** month for the months of this result (the running product of
+        the monthly factors for a per-month inflation vector).
+        """
+        return self._full_derived("_deflator")[self._lo:self._hi]
+
+    def cash_flows(self, real=False):
+        """
+        Investor cash flows for IRR: -initial total, -each month's contribution, +final total.
+        With real=True every flow is deflated to month-0 dollars.
+        """
+        suffix = "_Adjusted" if real else ""
+        monthly = self["Monthly_Contributions"][1:]
+        if real:
+            monthly = monthly / self.deflator[1:]
+        total = self["Total" + suffix]
+        return np.concatenate(([-total[0]], -monthly, [total[-1]]))
+
+    def slice(self, start=None, stop=None):
+        """
+        Months [start, stop) as a SimulationResult sharing this block and its derived columns.
+        """
+        offset = self._first_month + self._lo
+        lo, hi, _ = slice(
+            None if start is None else max(start - offset, 0),
+            None if stop is None else max(stop - offset, 0),
+        ).indices(self._hi - self._lo)
+        window = (self._lo + lo, self._lo + hi)
+        return SimulationResult(self._block, self.inflation_rate, tuple(self._index), self._first_month,
+                                window, self._derived)
+
+    def with_inflation(self, inflation_rate):
+        """
+        Same nominal simulation re-deflated at another inflation rate (no growth re-run).
+        """
+        if np.array_equal(inflation_rate, self.inflation_rate):
+            return self
+        return SimulationResult(self._block, inflation_rate, tuple(self._index), self._first_month,
+                                (self._lo, self._hi))
+
+    def to_dict(self):
+        """
+        The legacy dict of plain Python lists.
+        """
+        data = {"Month": self.months.tolist()}
+        data.update((name, self[name].tolist()) for name in self.keys()[1:]
+                    if not name.endswith("Monthly_Contributions"))
+        return data
+
+    def __repr__(self):
+        months = self.months
+        span = f"{months[0]}..{months[-1]}" if len(months) else "empty"
+        inflation = self.inflation_rate if np.ndim(self.inflation_rate) == 0 else "schedule"
+        return f"SimulationResult(months={span}, inflation_rate={inflation})"
+
+    # ---------- lazy derivation ----------
+    def _full_derived(self, key):
+        value = self._derived.get(key)
+        if value is None:
+            value = self._derive(key)
+            value.flags.writeable = False
+            self._derived[key] = value
+        return value
+
+    def _source(self, key):
+        """
+        ("adjusted" | "cumulative", stored column) a derived column is computed from, or None.
+        """
+        if key.endswith("_Adjusted") and key[:-len("_Adjusted")] in self._index:
+            return "adjusted", key[:-len("_Adjusted")]
+        if key.endswith("_Contributions"):
+            if key == "Total_Contributions":
+                monthly = "Monthly_Contributions"
+            else:
+                monthly = key[:-len("Contributions")] + "Monthly_Contributions"
+            if monthly in self._index and not key.endswith("Monthly_Contributions"):
+                return "cumulative", monthly
+        return None
+
+    def _derive(self, key):
+        if key == "_deflator":
+            months = np.arange(self._first_month, self._first_month + self._block.shape[1])
+            if np.ndim(self.inflation_rate):
+                rates = np.asarray(self.inflation_rate, dtype=float)
+                if months[-1] > len(rates):
+                    rates = np.concatenate((rates, np.full(months[-1] - len(rates), rates[-1])))
+                factors = np.concatenate(([1.0], np.cumprod((1 + rates) ** (1 / 12))))
+                return factors[months]
+            inflation_monthly = (1 + self.inflation_rate) ** (1 / 12) - 1
+            return GROWTH_TABLE.powers(inflation_monthly, months[0], months[-1] + 1)
+        source = self._source(key)
+        if source is None:
+            raise KeyError(key)
+        kind, column = source
+        if kind == "adjusted":
+            return self._block[self._index[column]] / self._full_derived("_deflator")
+        return np.cumsum(self._block[self._index[column]])
@@ -0,0 +1,130 @@
+from functools import lru_cache
+
+import numpy as np
+
+DISTRIBUTIONS = ("normal", "lognormal")
+# Per-bucket monthly return columns of a history (see models.backtest.load_history), in bucket order
+RETURN_COLUMNS = ("roth_ira_return", "k401_return", "dca_return", "stock_return")
+
+
+def draw_growth_factors(rng, annual_return, annual_volatility, shape, distribution="lognormal"):
+    """
+    Draw monthly growth factors (1 + r) for one bucket.
+
+    `annual_return` is the expected annual return, matching the deterministic
+    (1 + r) ** (1/12) conversion, and `annual_volatility` scales by sqrt(12).
+    - normal:    r ~ N((1 + mean) ** (1/12) - 1, vol / sqrt(12))
+    - lognormal: log(1 + r) ~ N(log(1 + mean) / 12 - s**2 / 2, s), s = vol / sqrt(12),
+                 so E[1 + r] equals the deterministic monthly growth factor.
+    """
+    return growth_from_normals(rng.standard_normal(shape), annual_return, annual_volatility, distribution)
+
+
+def growth_from_normals(z, annual_return, annual_volatility, distribution="lognormal"):
+    """
+    Monthly growth factors for given standard-normal shocks `z`, as in draw_growth_factors;
+    lets antithetic or quasi-random shocks drive the same return model.
+    """
+    monthly_vol = annual_volatility / np.sqrt(12)
+    if distribution == "normal":
+        monthly_mean = (1 + annual_return) ** (1 / 12) - 1
+        return 1 + (monthly_mean + monthly_vol * z)
+    if distribution == "lognormal":
+        log_mean = np.log1p(annual_return) / 12 - monthly_vol ** 2 / 2
+        return np.exp(log_mean + monthly_vol * z)
+    raise ValueError(f"Unknown distribution: {distribution!r} (expected one of {DISTRIBUTIONS})")
+
+
+def draw_bucket_growth(
+    rng,
+    annual_returns,
+    annual_volatilities,
+    shape,
+    distribution="lognormal",
+    correlation=None,
+    history=None,
+    block_months=12,
+):
+    """
+    (bucket, *shape) monthly growth factors for all buckets at once.
+
+    - default:     independent draw_growth_factors per bucket
+    - correlation: a (bucket, bucket) correlation matrix; the shocks of all buckets and paths are
+                   correlated in one batched Cholesky transform (see correlated_normals)
+    - history:     a load_history dict, or an (H, bucket) array of monthly simple returns; paths are
+                   circular block bootstraps of `block_months` consecutive months, all buckets
+                   taken from the same months so their co-movement is kept. Replaces the
+                   returns, volatilities and distribution.
+    """
+    if history is not None:
+        return bootstrap_growth_factors(rng, history, shape, block_months)
+    if correlation is None:
+        return np.stack([
+            draw_growth_factors(rng, mean, vol, shape, distribution)
+            for mean, vol in zip(annual_returns, annual_volatilities)
+        ])
+    z = correlated_normals(rng, correlation, shape)
+    return np.stack([
+        growth_from_normals(z[i], mean, vol, distribution)
+        for i, (mean, vol) in enumerate(zip(annual_returns, annual_volatilities))
+    ])
+
+
+def correlated_normals(rng, correlation, shape):
+    """
+    (bucket, *shape) standard normals whose buckets are correlated by `correlation`: independent
+    shocks multiplied by its (cached) Cholesky factor in a single matrix product.
+    """
+    factor = cholesky_factor(correlation)
+    z = rng.standard_normal((len(factor), int(np.prod(shape))))
+    return (factor @ z).reshape((len(factor),) + tuple(shape))
+
+
+def cholesky_factor(correlation):
+    """
+    Lower-triangular L with L @ L.T == correlation, computed once per distinct matrix.
+    """
+    correlation = np.ascontiguousarray(correlation, dtype=float)
+    if correlation.ndim != 2 or correlation.shape[0] != correlation.shape[1]:
+        raise ValueError(f"Correlation matrix must be square, got shape {correlation.shape}")
+    return _cholesky(correlation.tobytes(), correlation.shape[0])
+
+
+@lru_cache(maxsize=64)
+def _cholesky(key, size):
+    correlation = np.frombuffer(key).reshape(size, size)
+    if not np.allclose(correlation, correlation.T):
+        raise ValueError("Correlation matrix must be symmetric")
+    if not np.allclose(np.diag(correlation), 1.0):
+        raise ValueError("Correlation matrix must have ones on its diagonal")
+    try:
+        factor = np.linalg.cholesky(correlation)
+    except np.linalg.LinAlgError:
+        raise ValueError("Correlation matrix must be positive definite") from None
+    factor.setflags(write=False)
+    return factor
+
+
+def history_returns(history):
+    """
+    (H, bucket) monthly simple returns of a load_history dict (an array is returned as is).
+    """
+    if isinstance(history, dict):
+        return np.column_stack([np.asarray(history[key], dtype=float) for key in RETURN_COLUMNS])
+    return np.asarray(history, dtype=float)
+
+
+def bootstrap_growth_factors(rng, history, shape, block_months=12):
+    """
+    (bucket, *shape) growth factors resampled from a history in blocks of `block_months`
+    consecutive months, wrapping around its end (circular block bootstrap).
+    """
+    returns = history_returns(history)
+    n_months = shape[-1]
+    if not len(returns):
+        raise ValueError("History has no months to resample")
+    n_blocks = -(-n_months // block_months)
+    starts = rng.integers(0, len(returns), size=tuple(shape[:-1]) + (n_blocks,))
+    months = (starts[..., None] + np.arange(block_months)) % len(returns)
+    months = months.reshape(tuple(shape[:-1]) + (n_blocks * block_months,))[..., :n_months]
+    return np.moveaxis(1 + returns[months], -1, 0)
@@ -0,0 +1,44 @@
+import numpy as np
+from models.plan import compile_plan
+
+# Keyword arguments of compound_growth_with_visualization that accept a schedule, with labels
+SCHEDULE_PARAMETERS = {
+    "roth_ira_return": "Roth IRA Return",
+    "k401_return": "401(k) Return",
+    "dca_return": "ETF DCA Return",
+    "stock_return": "Stock Picks Return",
+    "dca_ratio": "ETF DCA Allocation",
+    "inflation_rate": "Inflation",
+}
+
+
+def schedule_vector(schedule, default, simulation_months):
+    """
+    (simulation_months,) values for months 1..simulation_months of a schedule
+    [(start_month, end_month, value), ...], the same model as monthly_plan: where periods overlap
+    the first one listed wins, and months no period covers keep `default`.
+    """
+    values = np.full(simulation_months, float(default))
+    for start, end, value in compile_plan(schedule):
+        lo = max(start, 1) - 1
+        hi = min(end, simulation_months)
+        if lo < hi:
+            values[lo:hi] = value
+    return values
+
+
+def apply_schedules(schedules, simulation_months, **params):
+    """
+    `params` with every scheduled entry replaced by its per-month vector. When dca_ratio is
+    scheduled and stock_ratio is not, stock_ratio moves opposite to it so their sum is kept.
+    """
+    unknown = set(schedules) - set(params)
+    if unknown:
+        raise ValueError(f"Cannot schedule {sorted(unknown)}: not a simulation parameter")
+    scheduled = dict(params)
+    for key, schedule in schedules.items():
+        if schedule:
+            scheduled[key] = schedule_vector(schedule, params[key], simulation_months)
+    if schedules.get("dca_ratio") and not schedules.get("stock_ratio") and "stock_ratio" in params:
+        scheduled["stock_ratio"] = params["dca_ratio"] + params["stock_ratio"] - scheduled["dca_ratio"]
+    return scheduled
@@ -0,0 +1,115 @@
+import numpy as np
+from models.batch import SCENARIO_DEFAULTS, simulate_batch
+from models.plan import compile_plan
+from utils.irr import annualize_irr, irr_batch
+
+# Scalar inputs that are perturbed, with their display labels
+PARAMETERS = {
+    "roth_ira_return": "Roth IRA Return",
+    "k401_return": "401(k) Return",
+    "dca_return": "ETF DCA Return",
+    "stock_return": "Stock Picks Return",
+    "roth_ira_cap": "Roth IRA Limit",
+    "k401_cap": "401(k) Limit",
+    "dca_ratio": "ETF DCA Allocation",
+    "inflation_rate": "Inflation Rate",
+    "initial_roth": "Initial Roth IRA",
+    "initial_401k": "Initial 401(k)",
+    "initial_dca": "Initial ETF DCA",
+    "initial_stock": "Initial Stock Picks",
+}
+
+METRICS = {
+    "terminal": "Final Portfolio",
+    "terminal_real": "Final Portfolio (Real)",
+    "irr": "IRR",
+    "cagr": "CAGR",
+}
+
+
+def sensitivity_analysis(monthly_plan=[(1, 36, 5000)], simulation_months=36, step=0.10, **params):
+    """
+    One-at-a-time sensitivity of the headline metrics to every scalar input and period amount.
+
+    Each input in PARAMETERS and each period amount is moved down and up by `step` (relative) while
+    everything else stays at its base value; the base case and all 2 * k perturbed scenarios are
+    simulated together in a single simulate_batch call and their IRRs solved in one irr_batch call.
+    dca_ratio moves against stock_ratio so the split keeps its sum, and ratios are clipped to
+    [0, sum]. Inputs whose base value is zero are skipped, since their elasticity is undefined.
+
+    Returns {"baseline": {metric: value}, "rows": [...]} with one row per input:
+    {"parameter", "label", "base", "low", "high", "<metric>_low", "<metric>_high",
+    "<metric>_elasticity"} for every metric in METRICS. The elasticity is the arc elasticity
+    ((y_high - y_low) / y_base) / ((x_high - x_low) / x_base).
+    """
+    plan = compile_plan(monthly_plan)
+    base = {**SCENARIO_DEFAULTS, **params}
+    split = base["dca_ratio"] + base["stock_ratio"]
+
+    rows, scenarios, plans = [], [base], [plan]
+    for key, label in PARAMETERS.items():
+        value = base[key]
+        if value == 0:
+            continue
+        low, high = value * (1 - step), value * (1 + step)
+        if key == "dca_ratio":
+            low, high = np.clip((low, high), 0, split)
+        rows.append({"parameter": key, "label": label, "base": value, "low": low, "high": high})
+        for moved in (low, high):
+            scenario = {**base, key: moved}
+            if key == "dca_ratio":
+                scenario["stock_ratio"] = split - moved
+            scenarios.append(scenario)
+            plans.append(plan)
+
+    for i, (start, end, amt) in enumerate(plan.periods):
+        if amt == 0:
+            continue
+        low, high = amt * (1 - step), amt * (1 + step)
+        rows.append({"parameter": f"period_{i + 1}", "label": f"Period {i + 1} Amount",
+                     "base": amt, "low": low, "high": high})
+        for moved in (low, high):
+            periods = list(plan.periods)
+            periods[i] = (start, end, moved)
+            scenarios.append(base)
+            plans.append(periods)
+
+    columns = {key: [scenario[key] for scenario in scenarios] for key in SCENARIO_DEFAULTS}
+    columns["monthly_plan"] = plans
+    metrics = _metrics(simulate_batch(
+        columns,
+        simulation_months=simulation_months,
+        series=("Total", "Total_Adjusted", "Total_Contributions"),
+    ), simulation_months)
+
+    baseline = {name: float(values[0]) for name, values in metrics.items()}
+    for i, row in enumerate(rows):
+        span = (row["high"] - row["low"]) / row["base"]
+        for name, values in metrics.items():
+            low, high = values[1 + 2 * i], values[2 + 2 * i]
+            row[f"{name}_low"] = float(low)
+            row[f"{name}_high"] = float(high)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                row[f"{name}_elasticity"] = float((high - low) / baseline[name] / span)
+    return {"baseline": baseline, "rows": rows}
+
+
+def _metrics(results, simulation_months):
+    """
+    Terminal nominal and real value, annual IRR and CAGR of every scenario row.
+    """
+    total = results["Total"]
+    cumulative = results["Total_Contributions"]
+    monthly = np.diff(cumulative, axis=1)
+    flows = np.concatenate((-total[:, :1], -monthly, total[:, -1:]), axis=1)
+    monthly_irr, converged = irr_batch(flows)
+
+    invested = total[:, 0] + cumulative[:, -1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cagr = np.where(invested > 0, (total[:, -1] / invested) ** (12 / simulation_months) - 1, 0.0)
+    return {
+        "terminal": total[:, -1],
+        "terminal_real": results["Total_Adjusted"][:, -1],
+        "irr": np.where(converged, annualize_irr(monthly_irr), np.nan),
+        "cagr": cagr,
+    }
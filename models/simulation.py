@@ -1,4 +1,15 @@
+import functools
 import math
+import numpy as np
+from models.accounts import compile_accounts, legacy_accounts
+from models.plan import compile_plan
+from models.schedule import apply_schedules
+from utils.growth_table import GROWTH_TABLE
+from models.result import SimulationResult
+
+# Compounding steps per year for each time-step resolution
+RESOLUTIONS = {"daily": 365, "weekly": 52, "biweekly": 26, "monthly": 12, "annual": 1}
+
 
 def compound_growth_with_visualization(
     monthly_plan=[(1, 36, 5000)],        # [(start_month, end_month, monthly_contribution)]
@@ -18,11 +29,391 @@ def compound_growth_with_visualization(
     initial_401k=0,
     initial_dca=0,
     initial_stock=0,
+    backend="numpy",
+    resolution="monthly",
+    schedules=None,
 ):
     """
     Simulates and visualizes compound investment growth with different return rates for each investment type.
-    Returns a dict of all tracked values and contributions.
+    Returns a SimulationResult of all tracked values and contributions; it reads like the
+    original dict of lists ("Month", "Total", ...) and to_dict() gives exactly that dict.
+
+    backend="numpy" evaluates the whole horizon with array operations; backend="python"
+    runs the original month-by-month loop and is kept as the reference implementation.
+    resolution (a key of RESOLUTIONS, numpy backend only) sets the compounding step; the
+    result is always reported per month.
+
+    schedules (numpy backend only) maps keys of models.schedule.SCHEDULE_PARAMETERS to
+    [(start_month, end_month, value), ...] glide paths; months outside every period keep the
+    scalar argument. Scheduled returns and ratios become per-month vectors of one vectorized
+    pass, and a scheduled inflation_rate deflates month by month.
+    """
+    if backend == "numpy":
+        engine = functools.partial(_numpy_growth, resolution=resolution, schedules=schedules)
+    elif backend == "python":
+        if resolution != "monthly" or schedules:
+            raise ValueError("The python backend only supports monthly resolution without schedules")
+        engine = _python_growth
+    else:
+        raise ValueError(f"Unknown backend: {backend!r} (expected 'python' or 'numpy')")
+
+    data = engine(
+        monthly_plan=monthly_plan,
+        roth_ira_cap=roth_ira_cap,
+        roth_ira_enabled=roth_ira_enabled,
+        k401_cap=k401_cap,
+        k401_enabled=k401_enabled,
+        simulation_months=simulation_months,
+        roth_ira_return=roth_ira_return,
+        k401_return=k401_return,
+        dca_return=dca_return,
+        stock_return=stock_return,
+        dca_ratio=dca_ratio,
+        stock_ratio=stock_ratio,
+        inflation_rate=inflation_rate,
+        initial_roth=initial_roth,
+        initial_401k=initial_401k,
+        initial_dca=initial_dca,
+        initial_stock=initial_stock,
+    )
+    return data if isinstance(data, SimulationResult) else SimulationResult.from_series(data, inflation_rate)
+
+
+def simulate_accounts(
+    accounts,
+    monthly_plan=[(1, 36, 5000)],
+    simulation_months=36,
+    inflation_rate=0.025,
+    resolution="monthly",
+):
+    """
+    Simulate any list of accounts (see models.accounts) under a monthly_plan. Allocation and
+    compounding run over (account, step) arrays, so extra accounts such as an HSA or a bond
+    sleeve only add rows. Returns a SimulationResult with one value column per account name and
+    "<label>_Monthly_Contributions" columns.
+
+    With a finer or coarser `resolution` than monthly, the plan's cumulative contributions are
+    interpolated onto the step grid (so bi-weekly pay gets 12/26 of the monthly amount per step),
+    caps and returns are scaled to each step's length (the last step may be partial), and the step
+    series are sampled at the last step completed by each month boundary, so the result stays
+    monthly however many steps were simulated (with annual steps, months 1-11 repeat month 0).
+
+    Per-month account returns or shares (simulation_months long) are compounded as a growth
+    factor per step, and `inflation_rate` may be a per-month vector of annual rates.
     """
+    if resolution not in RESOLUTIONS:
+        raise ValueError(f"Unknown resolution: {resolution!r} (expected one of {list(RESOLUTIONS)})")
+    steps_per_year = RESOLUTIONS[resolution]
+    spec = compile_accounts(accounts)
+    contributions = _contribution_schedule(monthly_plan, simulation_months)
+    if steps_per_year == 12:
+        values, allocation = _account_balances(spec, contributions)
+    else:
+        contributions, step_months, samples = _step_schedule(contributions, steps_per_year)
+        # Month each step starts in, for per-month returns and shares
+        step_start = np.cumsum(step_months) - step_months
+        spec = spec.take(np.minimum((step_start + 1e-9).astype(int), max(simulation_months - 1, 0)))
+        values, allocation = _account_balances(spec, contributions, step_months)
+
+    values = _with_initial(spec.initial[:, 0], values)
+    allocation = _with_initial(0.0, np.vstack((contributions, allocation)))
+    if steps_per_year != 12:
+        values = values[:, samples]
+        cumulative = np.cumsum(allocation, axis=1)[:, samples]
+        allocation = np.diff(cumulative, axis=1, prepend=0.0)
+
+    n_accounts = len(spec)
+    block = np.empty((2 * n_accounts + 2, simulation_months + 1))
+    block[1:n_accounts + 1] = values
+    block[0] = values.sum(axis=0)
+    block[n_accounts + 1:] = allocation
+
+    columns = ["Total", *spec.names, "Monthly_Contributions",
+               *(label + "_Monthly_Contributions" for label in spec.labels)]
+    return SimulationResult(block, inflation_rate, columns)
+
+
+def _step_schedule(monthly_contributions, steps_per_year):
+    """
+    Contributions per time step from a (month,) schedule, by interpolating the cumulative
+    contributions linearly within each month; also returns each step's length in months and the
+    step sampled for each month boundary, the last one completed by then (the final month always
+    maps to the final step).
+    """
+    n = len(monthly_contributions)
+    n_steps = math.ceil(n * steps_per_year / 12 - 1e-9)
+    cumulative = np.concatenate(([0.0], np.cumsum(monthly_contributions)))
+    boundaries = np.minimum(np.arange(n_steps + 1) * (12 / steps_per_year), n)
+    step_contributions = np.diff(np.interp(boundaries, np.arange(n + 1), cumulative))
+    # The last step ending at or before each boundary; the epsilon absorbs round-off at exact boundaries
+    samples = np.minimum(np.floor(np.arange(n + 1) * (steps_per_year / 12) + 1e-9).astype(int), n_steps)
+    samples[-1] = n_steps
+    return step_contributions, np.diff(boundaries), samples
+
+
+def terminal_values(
+    monthly_plan=[(1, 36, 5000)],
+    roth_ira_cap=7_000,
+    roth_ira_enabled=True,
+    k401_cap=23_000,
+    k401_enabled=True,
+    simulation_months=36,
+    roth_ira_return=0.10,
+    k401_return=0.10,
+    dca_return=0.10,
+    stock_return=0.10,
+    dca_ratio=0.60,
+    stock_ratio=0.40,
+    inflation_rate=0.025,
+    initial_roth=0,
+    initial_401k=0,
+    initial_dca=0,
+    initial_stock=0,
+    contribution_scale=1.0,
+):
+    """
+    Final values of compound_growth_with_visualization without building the monthly series.
+
+    Within each plan segment the contribution, and therefore every bucket's capped share, is
+    constant, so a segment's contribution to the final balance is the annuity
+    c * g**(T - end) * (g**n - 1) / (g - 1). Cost is O(number of periods), not O(months).
+
+    Returns the last element of every series ("Total", "Roth IRA", ..., "Total_Adjusted", ...,
+    "Total_Contributions", ...). `contribution_scale` multiplies every period amount. Any argument
+    except monthly_plan may be an array; arrays broadcast together and the results have their shape.
+    """
+    starts, ends, amounts = _covering_segments(compile_plan(monthly_plan))
+    months = _column(simulation_months)
+    starts = np.maximum(starts, 1)
+    ends = np.minimum(ends, months)
+    counts = np.maximum(ends - starts + 1, 0)
+    amounts = amounts * _column(contribution_scale)
+
+    params = dict(
+        roth_ira_cap=roth_ira_cap,
+        roth_ira_enabled=roth_ira_enabled,
+        k401_cap=k401_cap,
+        k401_enabled=k401_enabled,
+        roth_ira_return=roth_ira_return,
+        k401_return=k401_return,
+        dca_return=dca_return,
+        stock_return=stock_return,
+        dca_ratio=dca_ratio,
+        stock_ratio=stock_ratio,
+        initial_roth=initial_roth,
+        initial_401k=initial_401k,
+        initial_dca=initial_dca,
+        initial_stock=initial_stock,
+    )
+    ndim = max(months.ndim - 1, amounts.ndim - 1, *map(np.ndim, params.values()))
+    spec = compile_accounts(_legacy_columns(ndim, **params))
+    # (account, ..., segment) contributions per month of each segment
+    allocation = spec.allocate(amounts)
+
+    values = []
+    for account in range(len(spec)):
+        rate = _monthly_rate(_unbroadcast(spec.returns[account]))
+        segment_values = allocation[account] * _annuity_factor(rate, counts) * (1 + rate) ** (months - ends)
+        value = _unbroadcast(spec.start[account])[..., 0] * (1 + rate[..., 0]) ** months[..., 0]
+        value = value + segment_values.sum(axis=-1)
+        values.append(np.where(months[..., 0] == 0, _unbroadcast(spec.initial[account])[..., 0], value))
+
+    total = sum(values)
+    deflator = (1 + _monthly_rate(inflation_rate)) ** months[..., 0]
+    result = {"Total": total, **dict(zip(spec.names, values))}
+    result.update([(name + "_Adjusted", value / deflator) for name, value in result.items()])
+    result["Total_Contributions"] = (amounts * counts).sum(axis=-1)
+    result.update((label + "_Contributions", (contributions * counts).sum(axis=-1))
+                  for label, contributions in zip(spec.labels, allocation))
+    shape = np.broadcast_shapes(*(np.shape(value) for value in result.values()))
+    return {key: _scalar_or_array(np.broadcast_to(value, shape)) for key, value in result.items()}
+
+
+def _covering_segments(plan):
+    """
+    (starts, ends, amounts) of a compiled plan plus zero-amount segments for the months it leaves
+    uncovered from month 1 on (the last one open-ended), so every month falls in one segment: a
+    month without a contribution still allocates min(0, cap) to a negatively capped account.
+    """
+    segments = []
+    month = 1
+    for start, end, amount in plan:
+        if end < month:
+            continue
+        if start > month:
+            segments.append((month, start - 1, 0.0))
+        segments.append((start, end, amount))
+        month = end + 1
+    segments.append((month, np.inf, 0.0))
+    return np.array(segments, dtype=float).T
+
+
+def _annuity_factor(monthly_rate, counts):
+    """
+    sum(g**k for k in 0..n-1) with g = 1 + monthly_rate; equals n when the rate is zero.
+    """
+    safe_rate = np.where(monthly_rate == 0, 1.0, monthly_rate)
+    return np.where(monthly_rate == 0, counts, np.expm1(counts * np.log1p(monthly_rate)) / safe_rate)
+
+
+def _scalar_or_array(value):
+    return float(value) if np.ndim(value) == 0 else np.array(value)
+
+
+# -----------------------------------------------------------
+# NumPy engine
+# -----------------------------------------------------------
+def _monthly_rate(annual_rate):
+    """
+    Convert an annual return (scalar or array) to the equivalent monthly return.
+    """
+    return (1 + np.asarray(annual_rate, dtype=float)) ** (1 / 12) - 1
+
+
+def _column(value, dtype=float):
+    """
+    Shape a per-scenario parameter so it broadcasts against (..., month) arrays.
+    """
+    return np.asarray(value, dtype=dtype)[..., None]
+
+
+def _contribution_schedule(monthly_plan, simulation_months):
+    """
+    Dense vector of the contribution made in months 1..simulation_months (first matching period wins).
+    Compiled plans memoize the vector, so passing a CompiledPlan makes repeated runs free.
+    """
+    return compile_plan(monthly_plan).contributions(simulation_months)
+
+
+def _compound(start, monthly_rate, contributions, out=None):
+    """
+    Month-end balances for v[t] = v[t-1] * (1 + monthly_rate) + contributions[t], t = 1..n,
+    evaluated as the scaled cumulative sum g**t * (start + sum(c[k] / g**k)). The powers g**t come
+    from the shared growth table when the rate is on its grid.
+    """
+    growth = GROWTH_TABLE.powers(monthly_rate, 1, contributions.shape[-1] + 1)
+    return np.multiply(growth, start + np.cumsum(contributions / growth, axis=-1), out=out)
+
+
+def _compound_varying(start, growth_factors, contributions):
+    """
+    Same recurrence as _compound with a per-month growth factor (1 + r[t]), e.g. one row per
+    Monte Carlo path: cumprod(g)[t] * (start + sum(c[k] / cumprod(g)[k])).
+    """
+    growth = np.cumprod(growth_factors, axis=-1)
+    return growth * (start + np.cumsum(contributions / growth, axis=-1))
+
+
+def _with_initial(initial, series):
+    """
+    Prepend the month-0 value to a (..., n) series, giving (..., n + 1).
+    """
+    out = np.empty(series.shape[:-1] + (series.shape[-1] + 1,))
+    out[..., 0] = initial
+    out[..., 1:] = series
+    return out
+
+
+def _account_balances(spec, contributions, step_months=1.0, start=None):
+    """
+    The kernel every engine compounds accounts with: (account, ..., step) end-of-step balances
+    and contributions of `spec` for a (..., step) schedule of total contributions, starting from
+    `start` (spec.start by default, (account, ..., 1)). Steps are `step_months` long; monthly steps
+    with constant returns take the shared growth table.
+    """
+    start = spec.start if start is None else start
+    allocation = spec.allocate(contributions, step_months)
+    if np.ndim(step_months) == 0 and step_months == 1:
+        monthly_rate = _monthly_rate(spec.returns)
+        if spec.returns.shape[-1] > 1:
+            return _compound_varying(start, 1 + monthly_rate, allocation), allocation
+        if monthly_rate.ndim == 2:
+            return _compound(start, monthly_rate, allocation), allocation
+        # Per-scenario rates: account by account, so an account whose rate and start are the same
+        # in every scenario compounds with a single table row
+        values = np.empty(allocation.shape)
+        for account in range(len(spec)):
+            _compound(_unbroadcast(start[account]), _unbroadcast(monthly_rate[account]), allocation[account],
+                      out=values[account])
+        return values, allocation
+    return _compound_varying(start, (1 + spec.returns) ** (step_months / 12), allocation), allocation
+
+
+def _legacy_columns(ndim, **params):
+    """
+    legacy_accounts for scalar or per-scenario parameters, each made a column with `ndim` scenario
+    axes, so the account arrays line up with other (..., step) arrays.
+    """
+    def column(value):
+        return _column(np.reshape(value, (1,) * (ndim - np.ndim(value)) + np.shape(value)))
+
+    return legacy_accounts(**{key: value if np.isscalar(value) else column(value) for key, value in params.items()})
+
+
+def _unbroadcast(array):
+    """
+    `array` with every axis it is constant along cut to length 1, e.g. one account's row of a spec
+    field that was stacked with (and so broadcast to) other accounts' per-scenario values.
+    """
+    for axis, length in enumerate(array.shape):
+        if length > 1:
+            first = array[(slice(None),) * axis + (slice(0, 1),)]
+            if (array == first).all():
+                array = first
+    return array
+
+
+def _simulate_arrays(contributions, inflation_rate, **params):
+    """
+    The legacy model with every derived series, computed eagerly for many scenarios at once:
+    `contributions` is a (..., n) schedule for months 1..n, every other argument a scalar or a
+    per-scenario array. Returns (..., n + 1) arrays keyed like the dict of
+    compound_growth_with_visualization (without "Month").
+    """
+    contributions = np.asarray(contributions, dtype=float)
+    spec = compile_accounts(_legacy_columns(max(map(np.ndim, params.values())), **params))
+    values, allocation = _account_balances(spec, contributions)
+    values = _with_initial(spec.initial[..., 0], values)
+    shape = values.shape[1:]
+    deflator = GROWTH_TABLE.powers(_column(_monthly_rate(inflation_rate)), 0, shape[-1])
+
+    series = {"Total": values.sum(axis=0), **dict(zip(spec.names, values))}
+    series.update([(name + "_Adjusted", value / deflator) for name, value in series.items()])
+    series["Total_Contributions"] = np.broadcast_to(np.cumsum(_with_initial(0.0, contributions), axis=-1), shape)
+    series.update((label + "_Contributions", np.cumsum(_with_initial(0.0, monthly), axis=-1))
+                  for label, monthly in zip(spec.labels, allocation))
+    return series
+
+
+def _numpy_growth(monthly_plan, simulation_months, inflation_rate, resolution="monthly", schedules=None, **params):
+    if schedules:
+        params = apply_schedules(schedules, simulation_months, inflation_rate=inflation_rate, **params)
+        inflation_rate = params.pop("inflation_rate")
+    return simulate_accounts(legacy_accounts(**params), monthly_plan, simulation_months, inflation_rate, resolution)
+
+
+# -----------------------------------------------------------
+# Reference month-by-month loop
+# -----------------------------------------------------------
+def _python_growth(
+    monthly_plan,
+    roth_ira_cap,
+    roth_ira_enabled,
+    k401_cap,
+    k401_enabled,
+    simulation_months,
+    roth_ira_return,
+    k401_return,
+    dca_return,
+    stock_return,
+    dca_ratio,
+    stock_ratio,
+    inflation_rate,
+    initial_roth,
+    initial_401k,
+    initial_dca,
+    initial_stock,
+):
     # Convert annual returns to monthly returns
     roth_ira_monthly = (1 + roth_ira_return) ** (1 / 12) - 1
     k401_monthly = (1 + k401_return) ** (1 / 12) - 1
@@ -47,13 +438,11 @@ def compound_growth_with_visualization(
     dca_contributions = [0]
     stock_contributions = [0]
     
+    plan = compile_plan(monthly_plan)
+
     for month in range(1, simulation_months + 1):
-        # Determine current monthly contribution
-        monthly_contribution = 0
-        for start, end, amt in monthly_plan:
-            if start <= month <= end:
-                monthly_contribution = amt
-                break
+        # Determine current monthly contribution (first matching period wins)
+        monthly_contribution = plan.amount_at(month)
 
         # Allocate contributions
         roth_ira_monthly_contrib = min(monthly_contribution, roth_ira_cap / 12) if roth_ira_enabled else 0
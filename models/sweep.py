@@ -0,0 +1,110 @@
+import numpy as np
+from models.batch import SCENARIO_DEFAULTS
+from models.plan import compile_plan
+from models.simulation import terminal_values
+
+# Inputs that can be put on a sweep axis, with labels and default ranges. "monthly_contribution"
+# replaces the plan with one flat contribution; "contribution_scale" multiplies the plan's amounts.
+SWEEP_PARAMETERS = {
+    "roth_ira_return": ("Roth IRA Return", 0.0, 0.30),
+    "k401_return": ("401(k) Return", 0.0, 0.30),
+    "dca_return": ("ETF DCA Return", 0.0, 0.30),
+    "stock_return": ("Stock Picks Return", 0.0, 0.30),
+    "roth_ira_cap": ("Roth IRA Limit", 0.0, 30_000.0),
+    "k401_cap": ("401(k) Limit", 0.0, 70_000.0),
+    "dca_ratio": ("ETF DCA Allocation", 0.0, 1.0),
+    "inflation_rate": ("Inflation Rate", 0.0, 0.10),
+    "initial_roth": ("Initial Roth IRA", 0.0, 500_000.0),
+    "initial_401k": ("Initial 401(k)", 0.0, 500_000.0),
+    "initial_dca": ("Initial ETF DCA", 0.0, 500_000.0),
+    "initial_stock": ("Initial Stock Picks", 0.0, 500_000.0),
+    "simulation_months": ("Horizon (Months)", 12, 480),
+    "monthly_contribution": ("Monthly Contribution", 0.0, 20_000.0),
+    "contribution_scale": ("Contribution Multiplier", 0.0, 3.0),
+}
+
+
+def sweep_grid(
+    x_param,
+    x_values,
+    y_param,
+    y_values,
+    monthly_plan=[(1, 36, 5000)],
+    metric="Total_Adjusted",
+    tile_size=250_000,
+    **params,
+):
+    """
+    Terminal `metric` (any key of terminal_values) over the grid x_values × y_values of two
+    inputs from SWEEP_PARAMETERS, everything else fixed at `params`.
+
+    Uses the closed-form terminal_values, so no monthly series is built; the grid is evaluated
+    in tiles of whole y-rows holding about `tile_size` points each, which bounds the temporaries
+    at any grid size. When dca_ratio is swept and stock_ratio is not, stock_ratio moves with it
+    so the split keeps its sum. Returns a (len(y_values), len(x_values)) array.
+    """
+    if x_param == y_param or {x_param, y_param} == {"monthly_contribution", "contribution_scale"}:
+        raise ValueError("Sweep axes must be two different inputs")
+    unknown = {x_param, y_param} - set(SWEEP_PARAMETERS)
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters: {sorted(unknown)}")
+
+    x_values = np.asarray(x_values, dtype=float)
+    y_values = np.asarray(y_values, dtype=float)
+    base = {**SCENARIO_DEFAULTS, "simulation_months": 36, "contribution_scale": 1.0, **params}
+    plan = compile_plan(monthly_plan)
+    if "monthly_contribution" in (x_param, y_param):
+        horizons = [base["simulation_months"]]
+        horizons += [values.max() for param, values in ((x_param, x_values), (y_param, y_values))
+                     if param == "simulation_months"]
+        plan = compile_plan([(1, int(np.rint(max(horizons))), 1.0)])
+
+    grid = np.empty((len(y_values), len(x_values)))
+    rows_per_tile = max(1, tile_size // max(len(x_values), 1))
+    for lo in range(0, len(y_values), rows_per_tile):
+        hi = min(lo + rows_per_tile, len(y_values))
+        tile = dict(base)
+        tile.update(_axis(x_param, x_values[None, :]))
+        tile.update(_axis(y_param, y_values[lo:hi, None]))
+        if "dca_ratio" in (x_param, y_param):
+            tile["stock_ratio"] = base["dca_ratio"] + base["stock_ratio"] - tile["dca_ratio"]
+        grid[lo:hi] = terminal_values(monthly_plan=plan, **tile)[metric]
+    return grid
+
+
+def downsample_grid(grid, x_values, y_values, max_bins=60):
+    """
+    Block-mean a sweep grid to at most max_bins × max_bins cells for plotting.
+    Returns (values, x_edges, y_edges); edges have one more entry than the binned axis.
+    """
+    x_values = np.asarray(x_values, dtype=float)
+    y_values = np.asarray(y_values, dtype=float)
+    y_index = np.array_split(np.arange(len(y_values)), min(max_bins, len(y_values)))
+    x_index = np.array_split(np.arange(len(x_values)), min(max_bins, len(x_values)))
+    y_starts = [index[0] for index in y_index]
+    x_starts = [index[0] for index in x_index]
+
+    sums = np.add.reduceat(np.add.reduceat(grid, y_starts, axis=0), x_starts, axis=1)
+    counts = np.outer([len(index) for index in y_index], [len(index) for index in x_index])
+    return sums / counts, _edges(x_values, x_index), _edges(y_values, y_index)
+
+
+def _axis(param, values):
+    if param == "monthly_contribution":
+        return {"contribution_scale": values}
+    if param == "simulation_months":
+        return {param: np.rint(values).astype(int)}
+    return {param: values}
+
+
+def _edges(values, groups):
+    """
+    Cell edges around groups of sorted axis values: midpoints between neighbouring groups,
+    padded by half a step at both ends.
+    """
+    if len(values) == 1:
+        half_step = abs(values[0]) / 10 or 0.5
+    else:
+        half_step = (values[-1] - values[0]) / (len(values) - 1) / 2
+    inner = [(values[group[0] - 1] + values[group[0]]) / 2 for group in groups[1:]]
+    return np.array([values[0] - half_step, *inner, values[-1] + half_step])
@@ -0,0 +1,291 @@
+import importlib.util
+import math
+from collections import deque
+from statistics import NormalDist
+
+import numpy as np
+from models.monte_carlo import BUCKETS, PERCENTILES, _chunks, _draw_chunk_growth, _path_model
+from models.returns import cholesky_factor, growth_from_normals
+from models.simulation import _compound_varying
+
+SAMPLING = ("pseudo", "antithetic", "sobol")
+
+
+def monte_carlo_estimate(
+    monthly_plan=[(1, 36, 5000)],
+    roth_ira_cap=7_000,
+    roth_ira_enabled=True,
+    k401_cap=23_000,
+    k401_enabled=True,
+    simulation_months=36,
+    roth_ira_return=0.10,
+    k401_return=0.10,
+    dca_return=0.10,
+    stock_return=0.10,
+    roth_ira_volatility=0.15,
+    k401_volatility=0.15,
+    dca_volatility=0.15,
+    stock_volatility=0.20,
+    distribution="lognormal",
+    correlation=None,
+    history=None,
+    block_months=12,
+    dca_ratio=0.60,
+    stock_ratio=0.40,
+    inflation_rate=0.025,
+    initial_roth=0,
+    initial_401k=0,
+    initial_dca=0,
+    initial_stock=0,
+    n_paths=2_000,
+    replicates=10,
+    sampling="pseudo",
+    control_variate=False,
+    chunk_size=1_000,
+    seed=0,
+    percentiles=PERCENTILES,
+):
+    """
+    Terminal-value percentiles of monte_carlo_simulation's model with their standard errors,
+    using fewer paths through variance reduction.
+
+    sampling:
+    - pseudo:     independent normal shocks, as in monte_carlo_simulation
+    - antithetic: every shock path z is paired with -z
+    - sobol:      scrambled Sobol points (needs scipy, an optional dependency), with each
+                  bucket's monthly shocks built by Brownian-bridge ordering so the first
+                  dimensions set the terminal outcome
+    control_variate: reweight the paths so that a control with known distribution matches it
+    exactly. The control is the first-order change of the deterministic (closed-form) result in
+    every shock, C = sum(a[b, t] * z[b, t]), which is exactly normal; the weights make the mean
+    of C and the frequencies of C below its own percentiles exact (regression control
+    variates), and the percentiles are read off the weighted distribution.
+
+    `correlation` correlates the buckets' shocks as in monte_carlo_simulation; the independent
+    shocks above are mixed by its Cholesky factor month by month, and the control follows suit.
+    `history` block-bootstraps historical returns as in monte_carlo_simulation; resampled months
+    have no normal shocks to pair, stratify or linearize, so only pseudo sampling without a
+    control variate applies (the replicate standard errors still do).
+
+    The n_paths are split into `replicates` independent runs (independent scrambles for sobol);
+    the standard error of every estimate is the spread of the replicate estimates. The effective
+    sample size is the number of plain Monte Carlo paths with the same standard error.
+
+    Returns {"Percentiles", "n_paths", "Terminal_Percentiles": {"Total", "Total_Adjusted": (P,)},
+    "Standard_Error": {...}, "Effective_Sample_Size": (P,), "Mean": {"Total", "Total_Adjusted"},
+    "Mean_Standard_Error": {...}, "Mean_Effective_Sample_Size"}.
+    """
+    if sampling not in SAMPLING:
+        raise ValueError(f"Unknown sampling: {sampling!r} (expected one of {SAMPLING})")
+    if sampling == "sobol" and importlib.util.find_spec("scipy") is None:
+        raise ImportError("sampling='sobol' needs scipy (pip install scipy)")
+    if history is not None and (sampling != "pseudo" or control_variate):
+        raise ValueError("A bootstrapped history supports only pseudo sampling without a control variate")
+    if replicates < 2 or n_paths < 2 * replicates:
+        raise ValueError("Standard errors need at least 2 replicates of at least 2 paths")
+    if simulation_months < 1:
+        raise ValueError("Variance reduction needs at least one simulated month")
+
+    model = _path_model(
+        monthly_plan=monthly_plan,
+        roth_ira_cap=roth_ira_cap,
+        roth_ira_enabled=roth_ira_enabled,
+        k401_cap=k401_cap,
+        k401_enabled=k401_enabled,
+        simulation_months=simulation_months,
+        returns=(roth_ira_return, k401_return, dca_return, stock_return),
+        volatilities=(roth_ira_volatility, k401_volatility, dca_volatility, stock_volatility),
+        distribution=distribution,
+        correlation=correlation,
+        history=history,
+        block_months=block_months,
+        dca_ratio=dca_ratio,
+        stock_ratio=stock_ratio,
+        inflation_rate=inflation_rate,
+        initial=(initial_roth, initial_401k, initial_dca, initial_stock),
+    )
+    coefficients = _control_coefficients(model) if control_variate else None
+    q = np.asarray(percentiles, dtype=float) / 100
+
+    sizes = np.diff(np.linspace(0, n_paths, replicates + 1).astype(int))
+    estimates = np.empty((replicates, len(q)))
+    means = np.empty(replicates)
+    pooled_values, pooled_weights = [], []
+    for size, replicate_seed in zip(sizes, np.random.SeedSequence(seed).spawn(replicates)):
+        values, control = _simulate_replicate(model, size, sampling, replicate_seed, chunk_size, coefficients)
+        weights = _control_weights(control, q) if control is not None else np.full(size, 1 / size)
+        estimates[len(pooled_values)] = _weighted_quantiles(values, weights, q)
+        means[len(pooled_values)] = weights @ values
+        pooled_values.append(values)
+        pooled_weights.append(weights / replicates)
+
+    values = np.concatenate(pooled_values)
+    weights = np.concatenate(pooled_weights)
+    estimate = _weighted_quantiles(values, weights, q)
+    standard_error = estimates.std(axis=0, ddof=1) / math.sqrt(replicates)
+    mean = float(weights @ values)
+    mean_error = float(means.std(ddof=1) / math.sqrt(replicates))
+
+    deflator = model["deflator"][-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        effective = n_paths * (_plain_quantile_error(values, weights, q, n_paths) / standard_error) ** 2
+        mean_effective = float(values.var(ddof=1) / mean_error ** 2) if mean_error else math.inf
+    return {
+        "Percentiles": tuple(percentiles),
+        "n_paths": n_paths,
+        "Terminal_Percentiles": {"Total": estimate, "Total_Adjusted": estimate / deflator},
+        "Standard_Error": {"Total": standard_error, "Total_Adjusted": standard_error / deflator},
+        "Effective_Sample_Size": np.where(standard_error > 0, effective, np.inf),
+        "Mean": {"Total": mean, "Total_Adjusted": mean / deflator},
+        "Mean_Standard_Error": {"Total": mean_error, "Total_Adjusted": mean_error / deflator},
+        "Mean_Effective_Sample_Size": mean_effective,
+    }
+
+
+def _simulate_replicate(model, n_paths, sampling, seed, chunk_size, coefficients):
+    """
+    Terminal totals (n_paths,) of one replicate, and the standardized control of every path
+    (or None): C divided by its standard deviation, so exactly standard normal.
+    """
+    months = model["months"]
+    if sampling == "sobol":
+        from scipy.stats import qmc
+        engine = qmc.Sobol(len(BUCKETS) * months, scramble=True, seed=np.random.default_rng(seed))
+        plan = _bridge_plan(months)
+    else:
+        rng = np.random.default_rng(seed)
+
+    values = np.empty(n_paths)
+    control = None if coefficients is None else np.empty(n_paths)
+    for lo, hi in _chunks(n_paths, chunk_size):
+        n = hi - lo
+        if model["history"] is not None:
+            growth = _draw_chunk_growth(rng, n, model)
+        else:
+            if sampling == "sobol":
+                z = _brownian_bridge(_sobol_normals(engine, n, months), plan)
+            elif sampling == "antithetic":
+                half = rng.standard_normal((len(BUCKETS), (n + 1) // 2, months))
+                z = np.concatenate((half, -half), axis=1)[:, :n]
+            else:
+                z = rng.standard_normal((len(BUCKETS), n, months))
+            if model["correlation"] is not None:
+                z = np.einsum("ab,bpt->apt", cholesky_factor(model["correlation"]), z)
+            growth = np.stack([
+                growth_from_normals(z[i], mean, vol, model["distribution"])
+                for i, (mean, vol) in enumerate(zip(model["returns"], model["volatilities"]))
+            ])
+
+        balances = _compound_varying(model["start"][:, None, None], growth, model["contributions"][:, None, :])
+        values[lo:hi] = balances[:, :, -1].sum(axis=0)
+        if coefficients is not None:
+            control[lo:hi] = np.einsum("bpt,bt->p", z, coefficients)
+    if coefficients is not None:
+        correlation = np.eye(len(BUCKETS)) if model["correlation"] is None else model["correlation"]
+        control /= np.sqrt(np.einsum("at,ab,bt->", coefficients, correlation, coefficients))
+    return values, control
+
+
+def _control_coefficients(model):
+    """
+    (bucket, month) derivatives a[b, t] of the deterministic terminal total in the shock z[b, t].
+
+    With the recurrence V[t] = V[t-1] * G[t] + c[t], dV[T]/dG[t] = V[t-1] * g**(T - t) along the
+    deterministic path, and dG/dz is s * g (lognormal) or s (normal), s the monthly volatility.
+    Returns None when every volatility is zero, since there is nothing to control.
+    """
+    months = model["months"]
+    growth = (1 + model["returns"]) ** (1 / 12)
+    volatility = model["volatilities"] / np.sqrt(12)
+    if not volatility.any():
+        return None
+
+    path = _compound_varying(
+        model["start"][:, None], np.repeat(growth[:, None], months, axis=1), model["contributions"]
+    )
+    previous = np.concatenate((model["start"][:, None], path[:, :-1]), axis=1)
+    remaining = growth[:, None] ** (months - np.arange(1, months + 1))
+    slope = volatility * (growth if model["distribution"] == "lognormal" else 1.0)
+    return slope[:, None] * previous * remaining
+
+
+def _control_weights(control, q):
+    """
+    Regression control-variate weights for a standard-normal control: they sum to one and make
+    the weighted mean of the control zero and its weighted frequency below each of its
+    q-quantiles exactly q.
+    """
+    n = len(control)
+    # Known-mean controls: C itself (mean 0) and 1{C <= its p-quantile} - p
+    controls = np.column_stack(
+        [control] + [(control <= NormalDist().inv_cdf(p)) - p for p in q if 0 < p < 1]
+    )
+
+    centered = controls - controls.mean(axis=0)
+    covariance = centered.T @ centered / n
+    beta = np.linalg.lstsq(covariance, controls.mean(axis=0), rcond=None)[0]
+    return (1 - centered @ beta) / n
+
+
+def _weighted_quantiles(values, weights, q):
+    """
+    Inverse of the weighted empirical distribution at every q. Negative control weights can
+    make the cumulative weight dip, so it is made non-decreasing first.
+    """
+    order = np.argsort(values)
+    cumulative = np.maximum.accumulate(np.cumsum(weights[order]))
+    index = np.searchsorted(cumulative, q * cumulative[-1], side="left")
+    return values[order][np.minimum(index, len(values) - 1)]
+
+
+def _plain_quantile_error(values, weights, q, n_paths):
+    """
+    Standard error of plain Monte Carlo quantiles from n_paths paths, sqrt(q(1-q)/n) / density,
+    with the density at each quantile from a difference of the estimated distribution.
+    """
+    h = np.minimum(0.02, np.minimum(q, 1 - q) / 2)
+    spread = _weighted_quantiles(values, weights, np.minimum(q + h, 1)) - _weighted_quantiles(values, weights, np.maximum(q - h, 0))
+    return spread / np.where(h > 0, 2 * h, 1) * np.sqrt(q * (1 - q) / n_paths)
+
+
+def _sobol_normals(engine, n_paths, months):
+    """
+    (bucket, path, bridge position) standard normals from the next n_paths Sobol points.
+    Dimensions are interleaved so that the first ones are every bucket's first bridge point.
+    """
+    from scipy.special import ndtri
+    z = ndtri(np.clip(engine.random(n_paths), 1e-12, 1 - 1e-12))
+    return z.reshape(n_paths, months, len(BUCKETS)).transpose(2, 0, 1)
+
+
+def _bridge_plan(n_steps):
+    """
+    Brownian-bridge construction order: (point, left, right) triples, the terminal point first
+    and then the midpoints of ever shorter intervals, breadth first.
+    """
+    plan = [(n_steps, 0, None)]
+    pending = deque([(0, n_steps)])
+    while pending:
+        left, right = pending.popleft()
+        if right - left < 2:
+            continue
+        middle = (left + right) // 2
+        plan.append((middle, left, right))
+        pending.extend(((left, middle), (middle, right)))
+    return plan
+
+
+def _brownian_bridge(z, plan):
+    """
+    Monthly unit-variance increments (..., month) of Brownian paths whose points are set in
+    `plan` order by the standard normals z[..., k].
+    """
+    n_steps = z.shape[-1]
+    walk = np.zeros(z.shape[:-1] + (n_steps + 1,))
+    for k, (point, left, right) in enumerate(plan):
+        if right is None:
+            walk[..., point] = math.sqrt(point) * z[..., k]
+            continue
+        mean = ((right - point) * walk[..., left] + (point - left) * walk[..., right]) / (right - left)
+        walk[..., point] = mean + math.sqrt((point - left) * (right - point) / (right - left)) * z[..., k]
+    return np.diff(walk, axis=-1)
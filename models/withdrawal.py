@@ -0,0 +1,263 @@
+import math
+
+import numpy as np
+from models.monte_carlo import BUCKETS, _chunk_seeds, _chunks
+from models.returns import draw_bucket_growth, history_returns
+from models.simulation import _monthly_rate
+from utils.growth_table import GROWTH_TABLE
+
+RULES = ("fixed_real", "percentage", "guardrail")
+# (upper band, lower band, adjustment): the real withdrawal is cut by `adjustment` when the current
+# withdrawal rate exceeds the initial one by more than `upper`, and raised when it is `lower` below.
+GUARDRAILS = (0.20, 0.20, 0.10)
+
+
+def simulate_withdrawals(
+    balances,
+    withdrawal_rate=0.04,
+    rule="fixed_real",
+    withdrawal_months=360,
+    order=BUCKETS,
+    roth_ira_return=0.10,
+    k401_return=0.10,
+    dca_return=0.10,
+    stock_return=0.10,
+    roth_ira_volatility=0.15,
+    k401_volatility=0.15,
+    dca_volatility=0.15,
+    stock_volatility=0.20,
+    distribution="lognormal",
+    correlation=None,
+    history=None,
+    block_months=12,
+    inflation_rate=0.025,
+    spending_floor=0.0,
+    guardrails=GUARDRAILS,
+    n_paths=2_000,
+    chunk_size=1_000,
+    seed=0,
+):
+    """
+    Decumulation over `withdrawal_months` for many random return paths at once.
+
+    `balances` are the bucket values at retirement, (4,) in BUCKETS order or (n_paths, 4) per path
+    (e.g. monte_carlo_simulation's terminal values). Each month every bucket grows by a draw from
+    `distribution`, correlated by `correlation` or block-bootstrapped from `history` as in
+    monte_carlo_simulation, then the month's withdrawal is taken from the buckets in `order`,
+    emptying one before touching the next. `withdrawal_rate` (scalar or per
+    path) is annual:
+    - fixed_real: withdrawal_rate × starting total per year, indexed to inflation
+    - percentage: withdrawal_rate × current total per year
+    - guardrail:  fixed_real, re-checked every 12 months against the `guardrails` bands
+    A path fails in the first month it cannot fund its withdrawal or its real withdrawal drops
+    below `spending_floor` × the first one. Failed paths are dropped from the monthly loop.
+
+    Returns {"success_rate", "success": (n_paths,), "depletion_month": (n_paths,) (-1 if never),
+    "terminal": (n_paths,) final totals, "terminal_real": (n_paths,), "withdrawn_real": (n_paths,)}.
+    """
+    model = _withdrawal_model(
+        balances,
+        n_paths,
+        rule=rule,
+        withdrawal_months=withdrawal_months,
+        order=order,
+        roth_ira_return=roth_ira_return,
+        k401_return=k401_return,
+        dca_return=dca_return,
+        stock_return=stock_return,
+        roth_ira_volatility=roth_ira_volatility,
+        k401_volatility=k401_volatility,
+        dca_volatility=dca_volatility,
+        stock_volatility=stock_volatility,
+        distribution=distribution,
+        correlation=correlation,
+        history=history,
+        block_months=block_months,
+        inflation_rate=inflation_rate,
+        spending_floor=spending_floor,
+        guardrails=guardrails,
+    )
+    rates = np.broadcast_to(np.asarray(withdrawal_rate, dtype=float), (n_paths,))
+
+    depletion = np.empty(n_paths, dtype=int)
+    terminal = np.empty(n_paths)
+    withdrawn = np.empty(n_paths)
+    chunks = _chunks(n_paths, chunk_size)
+    for (lo, hi), chunk_seed in zip(chunks, _chunk_seeds(seed, len(chunks))):
+        growth = _draw_growth(np.random.default_rng(chunk_seed), hi - lo, model)
+        depletion[lo:hi], terminal[lo:hi], withdrawn[lo:hi] = _decumulate(
+            growth, model["balances"][:, lo:hi], rates[lo:hi], model
+        )
+
+    success = depletion < 0
+    return {
+        "success_rate": float(success.mean()),
+        "success": success,
+        "depletion_month": depletion,
+        "terminal": terminal,
+        "terminal_real": terminal / model["deflator"][-1],
+        "withdrawn_real": withdrawn,
+    }
+
+
+def max_withdrawal_rate(
+    balances,
+    success_probability=0.90,
+    max_rate=1.0,
+    tol=1e-5,
+    n_paths=2_000,
+    chunk_size=1_000,
+    seed=0,
+    **params,
+):
+    """
+    Highest annual withdrawal_rate whose success rate is at least `success_probability`.
+
+    Every path faces the same return draws at every rate, so each path has its own sustainable
+    rate; all of them are bisected together (one vectorized run per step, chunk by chunk) and the
+    answer is the matching order statistic. `params` are the other simulate_withdrawals arguments.
+    Returns (rate, path_rates) with each path's sustainable rate.
+    """
+    model = _withdrawal_model(balances, n_paths, **params)
+
+    path_rates = np.empty(n_paths)
+    steps = max(1, math.ceil(math.log2(max_rate / tol)))
+    chunks = _chunks(n_paths, chunk_size)
+    for (lo, hi), chunk_seed in zip(chunks, _chunk_seeds(seed, len(chunks))):
+        growth = _draw_growth(np.random.default_rng(chunk_seed), hi - lo, model)
+        balances_chunk = model["balances"][:, lo:hi]
+        low = np.zeros(hi - lo)
+        high = np.full(hi - lo, float(max_rate))
+        sustained = _decumulate(growth, balances_chunk, high, model)[0] < 0
+        low[sustained] = max_rate
+        for _ in range(steps):
+            mid = (low + high) / 2
+            success = _decumulate(growth, balances_chunk, mid, model)[0] < 0
+            low = np.where(success, mid, low)
+            high = np.where(success, high, mid)
+        path_rates[lo:hi] = low
+
+    # Largest rate that at least ceil(p * n) paths sustain
+    needed = max(1, math.ceil(success_probability * n_paths - 1e-9))
+    rate = float(np.sort(path_rates)[::-1][needed - 1])
+    return rate, path_rates
+
+
+def _withdrawal_model(
+    balances,
+    n_paths,
+    rule="fixed_real",
+    withdrawal_months=360,
+    order=BUCKETS,
+    roth_ira_return=0.10,
+    k401_return=0.10,
+    dca_return=0.10,
+    stock_return=0.10,
+    roth_ira_volatility=0.15,
+    k401_volatility=0.15,
+    dca_volatility=0.15,
+    stock_volatility=0.20,
+    distribution="lognormal",
+    correlation=None,
+    history=None,
+    block_months=12,
+    inflation_rate=0.025,
+    spending_floor=0.0,
+    guardrails=GUARDRAILS,
+):
+    """
+    Everything the monthly loop needs that does not depend on the draws, with buckets in draw order.
+    """
+    if rule not in RULES:
+        raise ValueError(f"Unknown withdrawal rule: {rule!r} (expected one of {RULES})")
+    positions = [BUCKETS.index(bucket) for bucket in order]
+    if sorted(positions) != list(range(len(BUCKETS))):
+        raise ValueError(f"order must list each of {BUCKETS} once")
+
+    balances = np.broadcast_to(np.asarray(balances, dtype=float), (n_paths, len(BUCKETS)))
+    return {
+        "rule": rule,
+        "months": withdrawal_months,
+        "balances": balances[:, positions].T,
+        "returns": np.array([roth_ira_return, k401_return, dca_return, stock_return])[positions],
+        "volatilities": np.array(
+            [roth_ira_volatility, k401_volatility, dca_volatility, stock_volatility]
+        )[positions],
+        "distribution": distribution,
+        "correlation": None if correlation is None else np.asarray(correlation, dtype=float)[np.ix_(positions, positions)],
+        "history": None if history is None else history_returns(history)[:, positions],
+        "block_months": block_months,
+        "deflator": GROWTH_TABLE.powers(_monthly_rate(inflation_rate), 0, withdrawal_months + 1),
+        "spending_floor": spending_floor,
+        "guardrails": guardrails,
+    }
+
+
+def _draw_growth(rng, n_paths, model):
+    """
+    (bucket, path, month) growth factors for one chunk, buckets in draw order.
+    """
+    return draw_bucket_growth(
+        rng,
+        model["returns"],
+        model["volatilities"],
+        (n_paths, model["months"]),
+        model["distribution"],
+        correlation=model["correlation"],
+        history=model["history"],
+        block_months=model["block_months"],
+    )
+
+
+def _decumulate(growth, balances, rates, model):
+    """
+    Monthly withdrawal loop over the live paths of one chunk.
+    Returns (depletion month or -1, final nominal total, total real withdrawals) per path.
+    """
+    n_paths = balances.shape[1]
+    rule, deflator = model["rule"], model["deflator"]
+    upper, lower, adjustment = model["guardrails"]
+
+    depletion = np.full(n_paths, -1)
+    terminal = np.zeros(n_paths)
+    withdrawn = np.zeros(n_paths)
+
+    live = np.arange(n_paths)
+    values = balances.copy()
+    real_draw = rates * values.sum(axis=0) / 12  # monthly withdrawal in month-0 dollars
+    floor = model["spending_floor"] * real_draw
+    spent = np.zeros(n_paths)
+
+    for month in range(1, model["months"] + 1):
+        values *= growth[:, live, month - 1]
+        total = values.sum(axis=0)
+
+        if rule == "percentage":
+            draw = rates * total / 12
+            current_real = draw / deflator[month]
+        else:
+            if rule == "guardrail" and month > 1 and (month - 1) % 12 == 0:
+                current_rate = real_draw * deflator[month] * 12 / np.maximum(total, 1e-300)
+                real_draw = np.where(current_rate > rates * (1 + upper), real_draw * (1 - adjustment),
+                            np.where(current_rate < rates * (1 - lower), real_draw * (1 + adjustment), real_draw))
+            current_real = real_draw
+            draw = real_draw * deflator[month]
+
+        failed = (total < draw) | (current_real < floor)
+        # Take the withdrawal from the buckets in order, each up to its balance
+        taken_before = np.cumsum(values, axis=0) - values
+        values -= np.clip(draw - taken_before, 0.0, values)
+        spent += np.minimum(draw, total) / deflator[month]
+
+        if failed.any():
+            depletion[live[failed]] = month
+            withdrawn[live[failed]] = spent[failed]
+            keep = ~failed
+            live, values, spent = live[keep], values[:, keep], spent[keep]
+            rates, real_draw, floor = rates[keep], real_draw[keep], floor[keep]
+            if not len(live):
+                break
+
+    terminal[live] = values.sum(axis=0)
+    withdrawn[live] = spent
+    return depletion, terminal, withdrawn
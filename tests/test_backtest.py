@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+import pytest
+from models.backtest import backtest, load_history
+from models.returns import RETURN_COLUMNS
+from models.simulation import compound_growth_with_visualization
+from utils.store import write_panel
+
+PLAN = [(1, 12, 1_500), (13, 30, 2_500), (40, 48, 900)]
+PARAMS = dict(roth_ira_cap=6_000, k401_cap=12_000, dca_ratio=0.7, stock_ratio=0.3,
+              initial_roth=3_000, initial_401k=2_000, initial_dca=8_000, initial_stock=4_000)
+
+
+def random_table(rng, months=120):
+    cpi = 100 * np.cumprod(np.concatenate(([1.0], 1 + rng.normal(0.002, 0.003, months))))
+    table = {"date": pd.date_range("2000-01-31", periods=months + 1, freq="ME").strftime("%Y-%m").to_numpy(),
+             "cpi": cpi}
+    for key in RETURN_COLUMNS:
+        table[key] = rng.normal(0.006, 0.04, months + 1)
+    return table
+
+
+def csv_history(directory, table):
+    path = directory / "history.csv"
+    pd.DataFrame(table).to_csv(path, index=False)
+    return load_history(str(path))
+
+
+def window_run(history, start, months, **params):
+    """
+    The scalar engine over one window, with the window's returns and inflation as monthly schedules.
+    """
+    schedules = {}
+    for key in (*RETURN_COLUMNS, "inflation"):
+        rates = history[key][start:start + months]
+        name = "inflation_rate" if key == "inflation" else key
+        schedules[name] = [(m + 1, m + 1, (1 + rate) ** 12 - 1) for m, rate in enumerate(rates)]
+    return compound_growth_with_visualization(monthly_plan=PLAN, simulation_months=months, schedules=schedules,
+                                              **params)
+
+
+@pytest.mark.parametrize("months", [1, 24, 60])
+def test_rolling_windows_match_per_window_runs(tmp_path, months):
+    table = random_table(np.random.default_rng(3))
+    history = csv_history(tmp_path, table)
+    result = backtest(history, monthly_plan=PLAN, simulation_months=months, **PARAMS)
+
+    n_starts = len(history["inflation"]) - months + 1
+    assert len(result["Start"]) == n_starts
+    assert result["Start"][0] == table["date"][1]
+    for start in range(n_starts):
+        run = window_run(history, start, months, **PARAMS)
+        for bucket in ("Total", "Roth IRA", "401(k)", "ETF DCA", "Stock Picks"):
+            assert result["Terminal"][bucket][start] == pytest.approx(run[bucket][-1], rel=1e-9), (start, bucket)
+            assert result["Terminal_Adjusted"][bucket][start] == pytest.approx(run[bucket + "_Adjusted"][-1],
+                                                                               rel=1e-9), (start, bucket)
+    assert result["Total_Contributions"] == pytest.approx(run["Total_Contributions"][-1])
+    np.testing.assert_allclose(result["Terminal_Percentiles"]["Total"],
+                               np.percentile(result["Terminal"]["Total"], result["Percentiles"]))
+
+
+def test_window_longer_than_history_is_rejected(tmp_path):
+    history = csv_history(tmp_path, random_table(np.random.default_rng(0), months=12))
+    with pytest.raises(ValueError):
+        backtest(history, simulation_months=13)
+
+
+def test_panel_and_npy_history_match_csv(tmp_path):
+    table = random_table(np.random.default_rng(5))
+    expected = csv_history(tmp_path, table)
+
+    columns = ["cpi", *RETURN_COLUMNS]
+    panel = write_panel(str(tmp_path / "panel.npy"), np.array([table[name] for name in columns]), columns,
+                        start=str(table["date"][0]))
+    structured = np.zeros(len(table["cpi"]), dtype=[(name, float) for name in columns])
+    for name in columns:
+        structured[name] = table[name]
+    np.save(tmp_path / "structured.npy", structured)
+
+    for source in (panel, str(tmp_path / "panel.npy"), str(tmp_path / "structured.npy")):
+        history = load_history(source)
+        for key in (*RETURN_COLUMNS, "inflation"):
+            # pandas' default CSV float parser can be off by an ulp from the binary sources
+            np.testing.assert_allclose(history[key], expected[key], rtol=1e-12, atol=1e-15, err_msg=key)
+    np.testing.assert_array_equal(load_history(panel)["dates"], expected["dates"])
+
+
+def test_single_return_column_feeds_every_bucket(tmp_path):
+    cpi = np.array([100.0, 101.0, 101.5, 103.0])
+    returns = np.array([0.0, 0.01, -0.02, 0.03])
+    np.save(tmp_path / "plain.npy", np.column_stack((returns, cpi)))
+    history = load_history(str(tmp_path / "plain.npy"))
+    for key in RETURN_COLUMNS:
+        np.testing.assert_array_equal(history[key], returns[1:])
+    np.testing.assert_allclose(history["inflation"], cpi[1:] / cpi[:-1] - 1)
+    assert history["dates"] is None
+
+
+def test_missing_columns_are_rejected(tmp_path):
+    np.save(tmp_path / "no_cpi.npy", np.zeros(3, dtype=[("return", float)]))
+    with pytest.raises(ValueError):
+        load_history(str(tmp_path / "no_cpi.npy"))
+    np.save(tmp_path / "no_returns.npy", np.ones(3, dtype=[("cpi", float)]))
+    with pytest.raises(ValueError):
+        load_history(str(tmp_path / "no_returns.npy"))
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+from models.batch import SERIES, simulate_batch
+from models.simulation import compound_growth_with_visualization
+
+
+def random_rows(rng, n):
+    dca_ratio = rng.uniform(0, 1, n)
+    return {
+        "roth_ira_cap": rng.integers(0, 10_000, n).astype(float),
+        "roth_ira_enabled": rng.integers(0, 2, n).astype(bool),
+        "k401_cap": rng.integers(0, 30_000, n).astype(float),
+        "stock_return": rng.uniform(0, 0.3, n),
+        "dca_return": rng.uniform(0, 0.3, n),
+        "dca_ratio": dca_ratio,
+        "stock_ratio": 1 - dca_ratio,
+        "inflation_rate": rng.uniform(0, 0.1, n),
+        "initial_dca": rng.integers(0, 50_000, n).astype(float),
+        "initial_roth": rng.integers(0, 50_000, n).astype(float),
+    }
+
+
+def row(columns, i):
+    return {key: (value[i] if np.ndim(value) else value) for key, value in columns.items()}
+
+
+def assert_rows_match(result, columns, plans, months):
+    for i, plan in enumerate(plans):
+        expected = compound_growth_with_visualization(monthly_plan=plan, simulation_months=months, **row(columns, i))
+        for key in SERIES:
+            np.testing.assert_allclose(result[key][i], expected[key], rtol=1e-12, atol=1e-9, err_msg=key)
+
+
+def test_shared_plan_matches_row_by_row_runs():
+    rng = np.random.default_rng(21)
+    columns = random_rows(rng, 25)
+    plan = [(1, 24, 3_000), (12, 48, 6_000)]
+    result = simulate_batch(columns, plan, simulation_months=48, chunk_size=7)
+    np.testing.assert_array_equal(result["Month"], np.arange(49))
+    assert_rows_match(result, columns, [plan] * 25, 48)
+
+
+def test_per_row_plans_from_a_dataframe():
+    rng = np.random.default_rng(22)
+    columns = random_rows(rng, 12)
+    plans = [[(1, int(rng.integers(1, 36)), float(rng.integers(0, 8_000)))] for _ in range(12)]
+    table = pd.DataFrame({**columns, "monthly_plan": plans})
+    result = simulate_batch(table, simulation_months=36, chunk_size=5)
+    assert_rows_match(result, columns, plans, 36)
+
+
+def test_scalars_broadcast_and_unknown_inputs_are_rejected():
+    result = simulate_batch({"stock_return": [0.05, 0.1]}, series=("Total",))
+    expected = compound_growth_with_visualization(stock_return=0.1)["Total"]
+    np.testing.assert_allclose(result["Total"][1], expected, rtol=1e-12)
+    assert set(result) == {"Month", "Total"}
+    with pytest.raises(ValueError):
+        simulate_batch({"bond_return": [0.05]})
+    with pytest.raises(ValueError):
+        simulate_batch({}, series=("Bonds",))
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+from models.simulation import compound_growth_with_visualization
+from utils.cache import SimulationCache, estimate_bytes, simulation_key
+
+
+def test_cached_results_are_read_only():
+    cache = SimulationCache()
+    result = cache.put("key", compound_growth_with_visualization())
+    with pytest.raises(ValueError):
+        result["Total"][-1] = 0.0
+    with pytest.raises(ValueError):
+        result["Total_Adjusted"][-1] = 0.0
+    arrays = cache.put("arrays", {"values": np.ones(3)})
+    with pytest.raises(ValueError):
+        arrays["values"][0] = 0.0
+
+
+def test_size_covers_lazily_derived_columns():
+    result = compound_growth_with_visualization(simulation_months=120)
+    estimate = estimate_bytes(result)
+    for key in result.keys():
+        result[key]
+    result.deflator
+    assert result.nbytes <= estimate
+
+
+def test_byte_budget_evicts_least_recently_used():
+    size = estimate_bytes(compound_growth_with_visualization(simulation_months=120))
+    cache = SimulationCache(max_bytes=2 * size)
+    for key in "abc":
+        cache.put(key, compound_growth_with_visualization(simulation_months=120))
+    assert "a" not in cache and "b" in cache and "c" in cache
+    assert cache.stats()["evictions"] == 1
+
+
+def test_equivalent_parameters_share_a_key():
+    assert simulation_key({"cap": 7000, "rate": np.float64(0.1)}, [(1, 12, 500)]) == \
+        simulation_key({"cap": 7000.0, "rate": 0.1}, [(1, 12, 500.0)])
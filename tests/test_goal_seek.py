@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+from models.goal_seek import solve_contribution_scale, solve_months, solve_return
+from models.simulation import compound_growth_with_visualization
+
+PLAN = [(1, 24, 2_000), (25, 120, 4_500)]
+PARAMS = dict(simulation_months=180, initial_dca=10_000, initial_stock=5_000, inflation_rate=0.03)
+
+
+def final(key="Total", monthly_plan=PLAN, **overrides):
+    return compound_growth_with_visualization(monthly_plan=monthly_plan, **{**PARAMS, **overrides})[key][-1]
+
+
+@pytest.mark.parametrize("real", [False, True])
+def test_solved_contribution_scale_reaches_the_target(real):
+    key = "Total_Adjusted" if real else "Total"
+    for target in (250_000, 1_000_000, 5_000_000):
+        scale, converged = solve_contribution_scale(target, real=real, monthly_plan=PLAN, **PARAMS)
+        assert converged
+        scaled = [(start, end, amount * scale) for start, end, amount in PLAN]
+        assert final(key, monthly_plan=scaled) == pytest.approx(target, rel=1e-8)
+
+
+@pytest.mark.parametrize("real", [False, True])
+def test_solved_return_reaches_the_target(real):
+    key = "Total_Adjusted" if real else "Total"
+    for target in (300_000, 900_000, 3_000_000):
+        rate, converged = solve_return(target, real=real, monthly_plan=PLAN, **PARAMS)
+        assert converged
+        rates = dict(roth_ira_return=rate, k401_return=rate, dca_return=rate, stock_return=rate)
+        assert final(key, **rates) == pytest.approx(target, rel=1e-8)
+
+
+def test_solved_months_is_the_first_month_at_the_target():
+    params = {key: value for key, value in PARAMS.items() if key != "simulation_months"}
+    for target in (100_000, 500_000, 1_500_000):
+        months, reached = solve_months(target, monthly_plan=PLAN, **params)
+        assert reached
+        series = compound_growth_with_visualization(monthly_plan=PLAN, simulation_months=months, **params)["Total"]
+        assert series[-1] >= target
+        assert series[-2] < target
+
+
+def test_targets_are_solved_elementwise():
+    targets = np.array([250_000, 1_000_000, 5_000_000])
+    scales, converged = solve_contribution_scale(targets, monthly_plan=PLAN, **PARAMS)
+    assert converged.all()
+    for target, scale in zip(targets, scales):
+        assert scale == pytest.approx(solve_contribution_scale(target, monthly_plan=PLAN, **PARAMS)[0], rel=1e-8)
+
+
+def test_target_met_by_initial_balances_needs_nothing():
+    scale, converged = solve_contribution_scale(1_000, monthly_plan=PLAN, **PARAMS)
+    assert converged and scale == 0.0
+    months, reached = solve_months(1_000, monthly_plan=PLAN, initial_dca=10_000)
+    assert reached and months == 0
+
+
+def test_unreachable_targets_are_reported():
+    scale, converged = solve_contribution_scale(1e15, max_scale=10, monthly_plan=PLAN, **PARAMS)
+    assert not converged
+    rate, converged = solve_return(1e30, max_return=1.0, monthly_plan=PLAN, **PARAMS)
+    assert not converged and np.isnan(rate)
+    months, reached = solve_months(1e9, max_months=240, monthly_plan=PLAN)
+    assert not reached and months == -1
@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+from models.simulation import _monthly_rate
+from utils.growth_table import GROWTH_TABLE, MAX_MONTHS, SLIDER_RATES
+
+
+@pytest.mark.parametrize("annual_rate", SLIDER_RATES.tolist())
+def test_every_slider_rate_hits_the_table(annual_rate):
+    # Callers hold the rate from a scalar (deflators, incremental runs) or a vector (accounts, batches)
+    assert _monthly_rate(annual_rate) in GROWTH_TABLE
+    assert _monthly_rate(np.array([annual_rate] * 4))[0] in GROWTH_TABLE
+
+
+def test_lookups_match_computed_powers():
+    for annual_rate in SLIDER_RATES:
+        scalar = _monthly_rate(float(annual_rate))
+        column = _monthly_rate(np.array([annual_rate, 0.123]))[:, None]
+        np.testing.assert_array_equal(GROWTH_TABLE.powers(scalar, 0, MAX_MONTHS + 1),
+                                      (1 + scalar) ** np.arange(MAX_MONTHS + 1))
+        np.testing.assert_array_equal(GROWTH_TABLE.powers(column, 1, 37), (1 + column) ** np.arange(1, 37))
+
+
+def test_off_grid_rates_and_long_horizons_are_computed():
+    rate = _monthly_rate(0.0777)
+    assert rate not in GROWTH_TABLE
+    np.testing.assert_array_equal(GROWTH_TABLE.powers(rate, 0, 12), (1 + rate) ** np.arange(12))
+    rate = _monthly_rate(0.10)
+    np.testing.assert_array_equal(GROWTH_TABLE.powers(rate, 0, MAX_MONTHS + 50),
+                                  (1 + rate) ** np.arange(MAX_MONTHS + 50))
@@ -0,0 +1,33 @@
+import numpy as np
+from models.incremental import IncrementalSimulator
+from models.simulation import compound_growth_with_visualization
+
+COLUMNS = ("Total", "Roth IRA", "401(k)", "ETF DCA", "Stock Picks", "Total_Contributions", "Total_Adjusted")
+
+
+def test_resumed_runs_match_a_full_recompute():
+    rng = np.random.default_rng(4)
+    simulator = IncrementalSimulator()
+    params = dict(initial_dca=5_000, initial_roth=2_000, stock_return=0.12, inflation_rate=0.03)
+    plan = [(1, 60, 3_000)]
+    resumed = []
+    for _ in range(60):
+        # Edit the plan (and sometimes the horizon), as the periods editor does between reruns
+        start = int(rng.integers(1, 60))
+        plan = plan[:3] + [(start, int(rng.integers(start, 72)), float(rng.integers(0, 6_000)))]
+        months = int(rng.choice([48, 60, 72]))
+        result = simulator.run(monthly_plan=plan, simulation_months=months, **params)
+        expected = compound_growth_with_visualization(monthly_plan=plan, simulation_months=months, **params)
+        resumed.append(simulator.resumed_from)
+        for column in COLUMNS:
+            np.testing.assert_allclose(result[column], expected[column], rtol=1e-12, err_msg=column)
+    assert max(resumed) > 0
+
+
+def test_parameter_changes_rerun_in_full():
+    simulator = IncrementalSimulator()
+    simulator.run(monthly_plan=[(1, 36, 5_000)])
+    result = simulator.run(monthly_plan=[(1, 36, 5_000)], stock_return=0.2)
+    assert simulator.resumed_from == 0
+    np.testing.assert_allclose(result["Total"], compound_growth_with_visualization(stock_return=0.2)["Total"],
+                               rtol=1e-12)
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+from utils.irr import calculate_irr, irr_batch
+
+
+def npv(rate, flows):
+    return np.sum(np.asarray(flows) / (1 + rate) ** np.arange(len(flows)))
+
+
+def investment_flows(rng, max_months=360):
+    months = int(rng.integers(2, max_months))
+    monthly = rng.uniform(0, 5_000, months)
+    final = monthly.sum() * rng.uniform(0.3, 4.0)
+    return np.concatenate(([-rng.uniform(0, 50_000)], -monthly, [final]))
+
+
+def test_batch_roots_zero_the_npv():
+    rng = np.random.default_rng(1)
+    streams = [investment_flows(rng) for _ in range(200)]
+    width = max(map(len, streams))
+    # Trailing zeros do not change a stream's NPV, so ragged streams batch as one array
+    batch = np.array([np.pad(flows, (0, width - len(flows))) for flows in streams])
+    rates, converged = irr_batch(batch)
+    assert converged.all()
+    for rate, flows in zip(rates, streams):
+        assert abs(npv(rate, flows)) <= 1e-8 * np.abs(flows).sum()
+
+
+def test_batch_matches_numpy_financial():
+    npf = pytest.importorskip("numpy_financial")
+    rng = np.random.default_rng(2)
+    # numpy_financial solves a polynomial per stream, so keep these short
+    for _ in range(50):
+        flows = investment_flows(rng, max_months=120)
+        rates, converged = irr_batch([flows])
+        assert converged[0]
+        np.testing.assert_allclose(rates[0], npf.irr(flows), rtol=1e-8, atol=1e-12)
+
+
+def test_streams_without_a_root_are_flagged():
+    rates, converged = irr_batch([[-100, -50, -10], [100, 10, 10]])
+    assert not converged.any() and np.isnan(rates).all()
+    assert calculate_irr([-100, -50, -10]) == 0.0
+    assert calculate_irr([]) == 0.0
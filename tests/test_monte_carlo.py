@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+from models.monte_carlo import BUCKETS, PERCENTILES, monte_carlo_simulation, monte_carlo_streaming
+from models.simulation import compound_growth_with_visualization
+from utils.sketch import SKETCH_ACCURACY
+
+PARAMS = dict(monthly_plan=[(1, 60, 2_000)], simulation_months=60, initial_dca=10_000, initial_roth=5_000,
+              stock_return=0.12, n_paths=3_000, chunk_size=500, seed=42)
+ZERO_VOLATILITY = dict(roth_ira_volatility=0.0, k401_volatility=0.0, dca_volatility=0.0, stock_volatility=0.0)
+
+
+@pytest.mark.parametrize("distribution", ["normal", "lognormal"])
+def test_zero_volatility_paths_follow_the_deterministic_engine(distribution):
+    result = monte_carlo_simulation(distribution=distribution, **ZERO_VOLATILITY, **PARAMS)
+    expected = compound_growth_with_visualization(
+        monthly_plan=PARAMS["monthly_plan"], simulation_months=60, initial_dca=10_000, initial_roth=5_000,
+        stock_return=0.12,
+    )
+    for band, real_band in zip(result["Total"], result["Total_Adjusted"]):
+        np.testing.assert_allclose(band, expected["Total"], rtol=1e-10)
+        np.testing.assert_allclose(real_band, expected["Total_Adjusted"], rtol=1e-10)
+    for bucket in BUCKETS:
+        np.testing.assert_allclose(result["Terminal"][bucket], expected[bucket][-1], rtol=1e-10)
+
+
+def test_bands_are_percentiles_of_reproducible_paths():
+    paths = np.empty((PARAMS["n_paths"], PARAMS["simulation_months"] + 1))
+    result = monte_carlo_simulation(paths_out=paths, **PARAMS)
+    again = monte_carlo_simulation(**PARAMS)
+    np.testing.assert_array_equal(result["Total"], again["Total"])
+    np.testing.assert_array_equal(result["Total"], np.percentile(paths, PERCENTILES, axis=0))
+    np.testing.assert_array_equal(result["Terminal"]["Total"], paths[:, -1])
+    np.testing.assert_allclose(sum(result["Terminal"][bucket] for bucket in BUCKETS), paths[:, -1], rtol=1e-12)
+    assert np.all(np.diff(result["Total"][:, 1:], axis=0) > 0)
+    assert not np.array_equal(monte_carlo_simulation(**{**PARAMS, "seed": 7})["Total"], result["Total"])
+
+
+def test_streamed_bands_match_exact_percentiles():
+    exact = monte_carlo_simulation(**PARAMS)
+    streamed = monte_carlo_streaming(**PARAMS)
+    # Sketch bands sit between neighbouring order statistics, up to the relative accuracy
+    gap = np.abs(streamed["Total"] - exact["Total"]) / exact["Total"]
+    assert np.nanmax(gap[:, 1:]) < 2 * SKETCH_ACCURACY
+    terminal = np.percentile(exact["Terminal"]["Total"], PERCENTILES)
+    np.testing.assert_allclose(streamed["Terminal_Percentiles"]["Total"], terminal, rtol=2 * SKETCH_ACCURACY)
+
+    paths = np.empty((PARAMS["n_paths"], PARAMS["simulation_months"] + 1))
+    monte_carlo_simulation(paths_out=paths, **PARAMS)
+    np.testing.assert_allclose(streamed["Mean"], paths.mean(axis=0), rtol=1e-12)
+    np.testing.assert_allclose(streamed["Std"][1:], paths.std(axis=0, ddof=1)[1:], rtol=1e-9)
@@ -0,0 +1,35 @@
+import numpy as np
+from models.batch import simulate_batch
+from models.monte_carlo import monte_carlo_simulation, monte_carlo_streaming
+from models.parallel import monte_carlo_parallel, monte_carlo_streaming_parallel, simulate_batch_parallel
+
+PARAMS = dict(monthly_plan=[(1, 60, 2_000)], simulation_months=60, initial_dca=10_000, n_paths=3_000,
+              chunk_size=500, seed=42)
+
+
+def test_parallel_paths_match_serial():
+    serial = monte_carlo_simulation(**PARAMS)
+    parallel = monte_carlo_parallel(workers=2, **PARAMS)
+    np.testing.assert_array_equal(parallel["Total"], serial["Total"])
+    for bucket, values in serial["Terminal"].items():
+        np.testing.assert_array_equal(parallel["Terminal"][bucket], values)
+
+
+def test_parallel_sketches_match_serial():
+    serial = monte_carlo_streaming(**PARAMS)
+    parallel = monte_carlo_streaming_parallel(workers=2, **PARAMS)
+    np.testing.assert_array_equal(parallel["Total"], serial["Total"])
+    np.testing.assert_allclose(parallel["Mean"], serial["Mean"], rtol=1e-12)
+    np.testing.assert_allclose(parallel["Std"], serial["Std"], rtol=1e-9)
+
+
+def test_parallel_batch_matches_serial():
+    rng = np.random.default_rng(5)
+    scenarios = {"stock_return": rng.uniform(0, 0.3, 40), "inflation_rate": rng.uniform(0, 0.1, 40)}
+    plans = [[(1, int(rng.integers(1, 36)), 4_000.0)] for _ in range(40)]
+    for plan in ([(1, 36, 5_000)], plans):
+        serial = simulate_batch(scenarios, plan, chunk_size=16)
+        parallel = simulate_batch_parallel(scenarios, plan, chunk_size=16, workers=2)
+        assert set(parallel) == set(serial)
+        for key, value in serial.items():
+            np.testing.assert_array_equal(parallel[key], value, err_msg=key)
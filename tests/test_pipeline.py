@@ -0,0 +1,66 @@
+import numpy as np
+from models.simulation import compound_growth_with_visualization
+from utils.pipeline import Pipeline
+
+PLAN = [(1, 120, 2_500)]
+
+
+def result_pipeline(store, growth_runs):
+    def growth(monthly_plan, growth_params):
+        growth_runs.append(monthly_plan)
+        return compound_growth_with_visualization(monthly_plan=monthly_plan, inflation_rate=0.0, **growth_params)
+
+    return (
+        Pipeline(store)
+        .add("growth", growth, inputs=("monthly_plan", "growth_params"))
+        .add("deflation", lambda inflation_rate, growth: growth.with_inflation(inflation_rate),
+             inputs=("inflation_rate",), depends=("growth",))
+        .add("final_real", lambda deflation: deflation["Total_Adjusted"][-1], depends=("deflation",))
+        .add("final_nominal", lambda growth: growth["Total"][-1], depends=("growth",))
+    )
+
+
+def run(pipeline, monthly_plan=PLAN, inflation_rate=0.025, **growth_params):
+    return pipeline.run(monthly_plan=monthly_plan, inflation_rate=inflation_rate,
+                        growth_params={"simulation_months": 120, **growth_params})
+
+
+def test_first_run_executes_every_stage():
+    pipeline = result_pipeline({}, [])
+    run(pipeline)
+    assert pipeline.executed == ["growth", "deflation", "final_real", "final_nominal"]
+
+
+def test_unchanged_inputs_reuse_every_stage():
+    store, growth_runs = {}, []
+    first = run(result_pipeline(store, growth_runs))
+    pipeline = result_pipeline(store, growth_runs)
+    second = run(pipeline)
+    assert pipeline.executed == []
+    assert len(growth_runs) == 1
+    assert all(second[name] is first[name] for name in first)
+
+
+def test_inflation_change_does_not_rerun_growth():
+    store, growth_runs = {}, []
+    pipeline = result_pipeline(store, growth_runs)
+    first = run(pipeline, inflation_rate=0.025)
+    outputs = run(pipeline, inflation_rate=0.06)
+    assert pipeline.executed == ["deflation", "final_real"]
+    assert len(growth_runs) == 1
+    assert outputs["growth"] is first["growth"]
+
+    fresh = compound_growth_with_visualization(monthly_plan=PLAN, simulation_months=120, inflation_rate=0.06)
+    np.testing.assert_allclose(outputs["deflation"]["Total_Adjusted"], fresh["Total_Adjusted"], rtol=1e-12)
+    assert outputs["final_real"] == fresh["Total_Adjusted"][-1]
+
+
+def test_growth_change_reruns_every_downstream_stage():
+    store, growth_runs = {}, []
+    pipeline = result_pipeline(store, growth_runs)
+    run(pipeline)
+    outputs = run(pipeline, monthly_plan=[(1, 120, 3_000)])
+    assert pipeline.executed == ["growth", "deflation", "final_real", "final_nominal"]
+    assert len(growth_runs) == 2
+    fresh = compound_growth_with_visualization(monthly_plan=[(1, 120, 3_000)], simulation_months=120)
+    assert outputs["final_nominal"] == fresh["Total"][-1]
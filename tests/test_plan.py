@@ -0,0 +1,49 @@
+import numpy as np
+from models.plan import compile_plan
+
+
+def first_match(plan, month):
+    # The engine's original scan: the first listed period covering the month wins
+    for start, end, amount in plan:
+        if start <= month <= end:
+            return amount
+    return 0
+
+
+def random_plan(rng):
+    plan = []
+    for _ in range(rng.integers(1, 8)):
+        start = int(rng.integers(-5, 60))
+        plan.append((start, int(rng.integers(start - 3, 80)), float(rng.integers(0, 5_000))))
+    return plan
+
+
+def test_overlaps_resolve_to_the_first_listed_period():
+    rng = np.random.default_rng(3)
+    for _ in range(300):
+        plan = random_plan(rng)
+        compiled = compile_plan(plan)
+        expected = [first_match(plan, month) for month in range(1, 73)]
+        np.testing.assert_array_equal(compiled.contributions(72), expected)
+        assert [compiled.amount_at(month) for month in range(-10, 90)] == \
+            [first_match(plan, month) for month in range(-10, 90)]
+        # Segments are sorted, disjoint and iterate as an equivalent plan
+        segments = list(compiled)
+        assert all(a[1] < b[0] for a, b in zip(segments, segments[1:]))
+        np.testing.assert_array_equal(compile_plan(segments).contributions(72), expected)
+
+
+def test_overlap_report_names_winner_and_shadowed_periods():
+    rng = np.random.default_rng(5)
+    for _ in range(200):
+        plan = random_plan(rng)
+        covered = {}
+        for month in range(-10, 90):
+            active = [i for i, (start, end, _) in enumerate(plan) if start <= month <= end]
+            if len(active) > 1:
+                covered[month] = (active[0], active[1:])
+        reported = {}
+        for entry in compile_plan(plan).overlap_report():
+            for month in range(entry["start"], entry["end"] + 1):
+                reported[month] = (entry["winner"], entry["shadowed"])
+        assert reported == covered
@@ -0,0 +1,119 @@
+import numpy as np
+import pytest
+from models.result import COLUMNS, SimulationResult
+from models.simulation import compound_growth_with_visualization
+
+PARAMS = dict(monthly_plan=[(1, 60, 3_000), (61, 120, 9_000)], simulation_months=120,
+              initial_roth=5_000, initial_dca=20_000, initial_stock=10_000, inflation_rate=0.03)
+
+
+@pytest.fixture(scope="module")
+def result():
+    return compound_growth_with_visualization(**PARAMS)
+
+
+def test_to_dict_matches_the_legacy_dict(result):
+    legacy = compound_growth_with_visualization(backend="python", **PARAMS).to_dict()
+    data = result.to_dict()
+    assert list(data) == ["Month", *COLUMNS]
+    assert data["Month"] == legacy["Month"]
+    for column in COLUMNS:
+        assert all(isinstance(value, float) for value in data[column])
+        np.testing.assert_allclose(data[column], legacy[column], rtol=1e-9, atol=1e-6, err_msg=column)
+
+
+def test_from_series_round_trips_the_legacy_dict(result):
+    rebuilt = SimulationResult.from_series(result.to_dict(), PARAMS["inflation_rate"])
+    for key in result.keys():
+        np.testing.assert_allclose(rebuilt[key], result[key], rtol=1e-12, atol=1e-9, err_msg=key)
+
+
+@pytest.mark.parametrize("start, stop", [(None, None), (0, 1), (12, 48), (100, None), (None, 30), (200, 300), (50, 10)])
+def test_slice_matches_slicing_every_column(result, start, stop):
+    window = result.slice(start, stop)
+    expected = slice(start, stop)
+    assert window.months.tolist() == result.months.tolist()[expected]
+    for key in result.keys():
+        np.testing.assert_array_equal(window[key], result[key][expected], err_msg=key)
+
+
+def test_nested_slices_use_absolute_months(result):
+    window = result.slice(24, 96).slice(36, 60)
+    assert window.months.tolist() == list(range(36, 60))
+    for key in result.keys():
+        np.testing.assert_array_equal(window[key], result[key][36:60], err_msg=key)
+
+
+def test_slice_shares_the_block(result):
+    window = result.slice(12, 48)
+    assert np.shares_memory(window["Total"], result["Total"])
+    # Derived columns are memoized once for the full horizon and shared by every slice
+    assert np.shares_memory(window["Total_Adjusted"], result["Total_Adjusted"])
+
+
+def test_reads_like_a_dict(result):
+    assert "Month" in result and "Roth IRA_Adjusted" in result and "DCA_Contributions" in result
+    assert "Missing" not in result and result.get("Missing", 0) == 0
+    assert len(result) == len(result.keys())
+    assert [key for key, _ in result.items()] == list(result)
+    with pytest.raises(KeyError):
+        result["Missing"]
+
+
+# The legacy loop computes every real and cumulative series up front
+def eager(inflation_rate):
+    return compound_growth_with_visualization(backend="python", **{**PARAMS, "inflation_rate": inflation_rate})
+
+
+def test_derived_columns_are_computed_on_first_access():
+    result = compound_growth_with_visualization(**PARAMS)
+    assert not result._derived
+    first = result["Total_Adjusted"]
+    assert set(result._derived) == {"_deflator", "Total_Adjusted"}
+    assert np.shares_memory(result["Total_Adjusted"], first)
+    assert not first.flags.writeable
+
+
+@pytest.mark.parametrize("inflation_rate", [0.0, 0.025, 0.07])
+def test_lazy_columns_match_the_eager_loop(inflation_rate):
+    result = compound_growth_with_visualization(**{**PARAMS, "inflation_rate": inflation_rate})
+    expected = eager(inflation_rate)
+    for column in COLUMNS:
+        np.testing.assert_allclose(result[column], expected[column], rtol=1e-9, atol=1e-6, err_msg=column)
+
+
+@pytest.mark.parametrize("inflation_rate", [0.0, 0.025, 0.07])
+def test_with_inflation_matches_a_fresh_run(result, inflation_rate):
+    result["Total_Adjusted"]
+    rederived = result.with_inflation(inflation_rate)
+    fresh = compound_growth_with_visualization(**{**PARAMS, "inflation_rate": inflation_rate})
+    assert np.shares_memory(rederived["Total"], result["Total"])
+    for key in result.keys():
+        np.testing.assert_allclose(rederived[key], fresh[key], rtol=1e-12, atol=1e-9, err_msg=key)
+    # The original keeps its own real series
+    original = eager(PARAMS["inflation_rate"])
+    np.testing.assert_allclose(result["Total_Adjusted"], original["Total_Adjusted"], rtol=1e-9)
+
+
+def test_with_inflation_keeps_the_slice_window(result):
+    window = result.slice(12, 48).with_inflation(0.05)
+    expected = result.with_inflation(0.05)["Total_Adjusted"][12:48]
+    np.testing.assert_allclose(window["Total_Adjusted"], expected, rtol=1e-12)
+
+
+def test_per_month_inflation_compounds_month_by_month(result):
+    rates = np.linspace(0.01, 0.08, 60)
+    rederived = result.with_inflation(rates)
+    # The last rate holds for the months after the vector ends
+    monthly = np.concatenate((rates, np.full(60, rates[-1])))
+    deflator = np.concatenate(([1.0], np.cumprod([(1 + rate) ** (1 / 12) for rate in monthly])))
+    np.testing.assert_allclose(rederived.deflator, deflator, rtol=1e-12)
+    np.testing.assert_allclose(rederived["ETF DCA_Adjusted"], result["ETF DCA"] / deflator, rtol=1e-12)
+
+
+def test_real_cash_flows_deflate_every_flow(result):
+    expected = eager(PARAMS["inflation_rate"])
+    deflator = [(1 + (1 + PARAMS["inflation_rate"]) ** (1 / 12) - 1) ** month for month in expected["Month"]]
+    monthly = np.diff(expected["Total_Contributions"]) / deflator[1:]
+    flows = np.concatenate(([-expected["Total_Adjusted"][0]], -monthly, [expected["Total_Adjusted"][-1]]))
+    np.testing.assert_allclose(result.cash_flows(real=True), flows, rtol=1e-9)
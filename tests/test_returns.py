@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+from models.monte_carlo import monte_carlo_simulation
+from models.returns import (
+    RETURN_COLUMNS, bootstrap_growth_factors, cholesky_factor, correlated_normals, draw_bucket_growth,
+    draw_growth_factors,
+)
+
+CORRELATION = np.array([
+    [1.0, 0.9, 0.6, 0.3],
+    [0.9, 1.0, 0.5, 0.2],
+    [0.6, 0.5, 1.0, 0.4],
+    [0.3, 0.2, 0.4, 1.0],
+])
+RETURNS = (0.05, 0.07, 0.09, 0.12)
+VOLATILITIES = (0.10, 0.15, 0.15, 0.25)
+
+
+@pytest.mark.parametrize("distribution", ["normal", "lognormal"])
+def test_growth_factors_have_the_deterministic_mean(distribution):
+    growth = draw_growth_factors(np.random.default_rng(0), 0.08, 0.2, (400_000,), distribution)
+    # Standard error of the mean is about 0.058 / sqrt(400k) ≈ 1e-4
+    assert growth.mean() == pytest.approx(1.08 ** (1 / 12), abs=4e-4)
+    assert growth.std() == pytest.approx(0.2 / np.sqrt(12), rel=0.01)
+
+
+def test_identity_correlation_reproduces_independent_draws():
+    shape = (50, 24)
+    independent = draw_bucket_growth(np.random.default_rng(4), RETURNS, VOLATILITIES, shape)
+    correlated = draw_bucket_growth(np.random.default_rng(4), RETURNS, VOLATILITIES, shape, correlation=np.eye(4))
+    np.testing.assert_allclose(correlated, independent, rtol=1e-12)
+
+
+@pytest.mark.parametrize("chunk_size", [500, 3_000])
+def test_identity_correlation_reproduces_independent_paths(chunk_size):
+    params = dict(monthly_plan=[(1, 60, 2_000)], simulation_months=60, initial_dca=10_000, n_paths=3_000,
+                  chunk_size=chunk_size, seed=42)
+    independent = monte_carlo_simulation(**params)
+    correlated = monte_carlo_simulation(correlation=np.eye(4), **params)
+    np.testing.assert_allclose(correlated["Total"], independent["Total"], rtol=1e-12)
+
+
+def test_correlated_normals_follow_the_matrix():
+    factor = cholesky_factor(CORRELATION)
+    np.testing.assert_allclose(factor @ factor.T, CORRELATION, atol=1e-12)
+    np.testing.assert_array_equal(factor, np.tril(factor))
+    z = correlated_normals(np.random.default_rng(1), CORRELATION, (200, 500))
+    assert z.shape == (4, 200, 500)
+    np.testing.assert_allclose(np.corrcoef(z.reshape(4, -1)), CORRELATION, atol=0.01)
+
+
+def test_cholesky_factor_is_cached_and_read_only():
+    factor = cholesky_factor(CORRELATION)
+    assert cholesky_factor(CORRELATION.copy()) is factor
+    with pytest.raises(ValueError):
+        factor[0, 0] = 2.0
+
+
+@pytest.mark.parametrize("correlation", [
+    np.eye(4)[:3],                                      # not square
+    np.ones((2, 2, 2)),                                 # not a matrix
+    np.array([[1.0, 0.5], [0.2, 1.0]]),                 # asymmetric
+    np.array([[2.0, 0.5], [0.5, 1.0]]),                 # diagonal is not one
+    np.array([[1.0, 0.9, -0.9], [0.9, 1.0, 0.9], [-0.9, 0.9, 1.0]]),  # not positive definite
+])
+def test_invalid_correlations_are_rejected(correlation):
+    with pytest.raises(ValueError):
+        cholesky_factor(correlation)
+
+
+def test_bootstrap_resamples_circular_blocks_of_whole_months():
+    months = 10
+    # Each bucket's return encodes the month it came from
+    history = np.arange(months)[:, None] / 1_000 + np.arange(4) / 10
+    growth = bootstrap_growth_factors(np.random.default_rng(2), history, (300, 37), block_months=6)
+    assert growth.shape == (4, 300, 37)
+
+    source = np.rint((growth - 1 - np.arange(4)[:, None, None] / 10) * 1_000).astype(int)
+    # Every bucket takes the same month
+    assert (source == source[0]).all()
+    # Within each block the months run on consecutively, wrapping past the end of the history
+    blocks = source[0][:, :36].reshape(300, 6, 6)
+    np.testing.assert_array_equal(np.diff(blocks, axis=-1) % months, 1)
+    assert ((blocks[..., 0] + 5) >= months).any()
+    assert set(np.unique(source)) == set(range(months))
+
+
+def test_bootstrap_accepts_a_history_dict():
+    rng = np.random.default_rng(3)
+    history = {key: rng.normal(0.005, 0.03, 24) for key in RETURN_COLUMNS}
+    array = np.column_stack([history[key] for key in RETURN_COLUMNS])
+    from_dict = draw_bucket_growth(np.random.default_rng(9), RETURNS, VOLATILITIES, (20, 30), history=history)
+    from_array = bootstrap_growth_factors(np.random.default_rng(9), array, (20, 30))
+    np.testing.assert_array_equal(from_dict, from_array)
+    with pytest.raises(ValueError):
+        bootstrap_growth_factors(rng, np.empty((0, 4)), (2, 3))
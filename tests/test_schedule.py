@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+from models.schedule import SCHEDULE_PARAMETERS, apply_schedules, schedule_vector
+from models.simulation import compound_growth_with_visualization
+
+PARAMS = dict(roth_ira_cap=6_000, k401_cap=18_000, roth_ira_return=0.07, k401_return=0.08, dca_return=0.09,
+              stock_return=0.11, dca_ratio=0.7, stock_ratio=0.3, inflation_rate=0.025, initial_roth=5_000,
+              initial_401k=8_000, initial_dca=20_000, initial_stock=3_000)
+
+
+def value_at(schedule, default, month):
+    """
+    The first period of `schedule` covering `month`, else `default`.
+    """
+    for start, end, value in schedule:
+        if start <= month <= end:
+            return value
+    return default
+
+
+def loop_growth(monthly_plan, simulation_months, schedules, **params):
+    """
+    The python backend's month-by-month loop, with every scheduled parameter looked up per month.
+    """
+    values = {"roth": 0.0, "k401": 0.0, "dca": params["initial_dca"], "stock": params["initial_stock"]}
+    total = [params["initial_roth"] + params["initial_401k"] + values["dca"] + values["stock"]]
+    deflator = [1.0]
+    for month in range(1, simulation_months + 1):
+        current = {key: value_at(schedules.get(key, []), params[key], month) for key in SCHEDULE_PARAMETERS}
+        current["stock_ratio"] = params["stock_ratio"]
+        if "dca_ratio" in schedules:
+            current["stock_ratio"] = params["dca_ratio"] + params["stock_ratio"] - current["dca_ratio"]
+        contribution = value_at(monthly_plan, 0.0, month)
+        roth = min(contribution, params["roth_ira_cap"] / 12)
+        k401 = min(contribution - roth, params["k401_cap"] / 12)
+        rest = contribution - roth - k401
+        flows = {"roth": roth, "k401": k401, "dca": rest * current["dca_ratio"], "stock": rest * current["stock_ratio"]}
+        returns = {"roth": "roth_ira_return", "k401": "k401_return", "dca": "dca_return", "stock": "stock_return"}
+        for bucket, key in returns.items():
+            values[bucket] = values[bucket] * (1 + current[key]) ** (1 / 12) + flows[bucket]
+        total.append(sum(values.values()))
+        deflator.append(deflator[-1] * (1 + current["inflation_rate"]) ** (1 / 12))
+    return np.array(total), np.array(total) / np.array(deflator)
+
+
+def random_schedule(rng, months, low, high):
+    periods = []
+    for _ in range(rng.integers(1, 4)):
+        # Periods may overlap, run past the horizon or start before month 1
+        start = int(rng.integers(-2, months + 3))
+        periods.append((start, int(rng.integers(start, months + 6)), float(rng.uniform(low, high))))
+    return periods
+
+
+def test_schedule_vector_matches_a_month_by_month_lookup():
+    rng = np.random.default_rng(11)
+    for _ in range(100):
+        months = int(rng.integers(0, 60))
+        schedule = random_schedule(rng, months, -1.0, 1.0)
+        expected = [value_at(schedule, 0.5, month) for month in range(1, months + 1)]
+        np.testing.assert_array_equal(schedule_vector(schedule, 0.5, months), expected)
+
+
+def test_scheduled_runs_match_a_month_by_month_loop():
+    rng = np.random.default_rng(12)
+    for _ in range(40):
+        months = int(rng.integers(1, 121))
+        plan = [(1, months, float(rng.integers(0, 4_000))), (int(rng.integers(1, months + 1)), months, 5_000.0)]
+        keys = rng.choice(list(SCHEDULE_PARAMETERS), size=int(rng.integers(1, 4)), replace=False)
+        schedules = {key: random_schedule(rng, months, 0.0, 0.9 if key == "dca_ratio" else 0.15) for key in keys}
+        result = compound_growth_with_visualization(monthly_plan=plan, simulation_months=months,
+                                                    schedules=schedules, **PARAMS)
+        total, adjusted = loop_growth(plan, months, schedules, **PARAMS)
+        np.testing.assert_allclose(result["Total"], total, rtol=1e-9, err_msg=str(schedules))
+        np.testing.assert_allclose(result["Total_Adjusted"], adjusted, rtol=1e-9, err_msg=str(schedules))
+
+
+def test_zero_month_run_with_an_inflation_schedule():
+    result = compound_growth_with_visualization(simulation_months=0, schedules={"inflation_rate": [(1, 12, 0.05)]},
+                                                **PARAMS)
+    initial = PARAMS["initial_roth"] + PARAMS["initial_401k"] + PARAMS["initial_dca"] + PARAMS["initial_stock"]
+    np.testing.assert_array_equal(result["Total"], [initial])
+    np.testing.assert_array_equal(result["Total_Adjusted"], [initial])
+
+
+def test_apply_schedules_keeps_unscheduled_parameters():
+    scheduled = apply_schedules({"dca_ratio": [(1, 2, 0.2)], "stock_return": []}, 4, **PARAMS)
+    np.testing.assert_array_equal(scheduled["dca_ratio"], [0.2, 0.2, 0.7, 0.7])
+    np.testing.assert_allclose(scheduled["stock_ratio"], [0.8, 0.8, 0.3, 0.3])
+    assert scheduled["stock_return"] == PARAMS["stock_return"]
+    with pytest.raises(ValueError):
+        apply_schedules({"monthly_plan": [(1, 2, 0.1)]}, 4, **PARAMS)
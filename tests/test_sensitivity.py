@@ -0,0 +1,63 @@
+import pytest
+from models.sensitivity import METRICS, PARAMETERS, sensitivity_analysis
+from models.simulation import compound_growth_with_visualization
+from utils.irr import calculate_irr
+
+PLAN = [(1, 36, 4_000), (37, 96, 7_500)]
+PARAMS = dict(simulation_months=120, dca_return=0.08, stock_return=0.12, initial_roth=15_000,
+              initial_dca=40_000, initial_stock=0, inflation_rate=0.03)
+
+
+@pytest.fixture(scope="module")
+def analysis():
+    return sensitivity_analysis(monthly_plan=PLAN, step=0.2, **PARAMS)
+
+
+def direct_metrics(monthly_plan=PLAN, **params):
+    result = compound_growth_with_visualization(monthly_plan=monthly_plan, **{**PARAMS, **params})
+    invested = result["Total"][0] + result["Total_Contributions"][-1]
+    return {
+        "terminal": result["Total"][-1],
+        "terminal_real": result["Total_Adjusted"][-1],
+        "irr": calculate_irr(result.cash_flows()),
+        "cagr": (result["Total"][-1] / invested) ** (12 / PARAMS["simulation_months"]) - 1,
+    }
+
+
+def test_baseline_matches_a_direct_run(analysis):
+    expected = direct_metrics()
+    for metric in METRICS:
+        assert analysis["baseline"][metric] == pytest.approx(expected[metric], rel=1e-9), metric
+
+
+def test_perturbed_metrics_match_direct_runs(analysis):
+    for row in analysis["rows"]:
+        for side in ("low", "high"):
+            moved = row[side]
+            if row["parameter"].startswith("period_"):
+                i = int(row["parameter"].split("_")[1]) - 1
+                plan = list(PLAN)
+                plan[i] = (plan[i][0], plan[i][1], moved)
+                expected = direct_metrics(monthly_plan=plan)
+            elif row["parameter"] == "dca_ratio":
+                expected = direct_metrics(dca_ratio=moved, stock_ratio=1.0 - moved)
+            else:
+                expected = direct_metrics(**{row["parameter"]: moved})
+            for metric in METRICS:
+                assert row[f"{metric}_{side}"] == pytest.approx(expected[metric], rel=1e-9, abs=1e-12), (
+                    row["parameter"], side, metric)
+
+
+def test_elasticities_follow_the_arc_formula(analysis):
+    for row in analysis["rows"]:
+        span = (row["high"] - row["low"]) / row["base"]
+        for metric in METRICS:
+            expected = (row[f"{metric}_high"] - row[f"{metric}_low"]) / analysis["baseline"][metric] / span
+            assert row[f"{metric}_elasticity"] == pytest.approx(expected, rel=1e-12)
+
+
+def test_zero_inputs_are_skipped(analysis):
+    parameters = [row["parameter"] for row in analysis["rows"]]
+    assert "initial_stock" not in parameters and "initial_401k" not in parameters
+    assert [name for name in PARAMETERS if name in parameters] == parameters[:len(parameters) - len(PLAN)]
+    assert parameters[-len(PLAN):] == ["period_1", "period_2"]
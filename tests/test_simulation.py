@@ -0,0 +1,107 @@
+import numpy as np
+import pytest
+from models.simulation import compound_growth_with_visualization, terminal_values
+
+COLUMNS = ("Total", "Roth IRA", "401(k)", "ETF DCA", "Stock Picks", "Total_Adjusted", "Total_Contributions",
+           "Roth_Monthly_Contributions", "401k_Monthly_Contributions", "DCA_Monthly_Contributions",
+           "Stock_Monthly_Contributions")
+
+
+def random_scenario(rng, allow_negative=False):
+    months = int(rng.integers(1, 121))
+    periods = []
+    for _ in range(rng.integers(1, 5)):
+        start = int(rng.integers(1, months + 1))
+        low = -3_000 if allow_negative else 0
+        periods.append((start, int(rng.integers(start, months + 1)), float(rng.integers(low, 6_000))))
+    dca_ratio = float(rng.uniform())
+    return dict(
+        monthly_plan=periods,
+        simulation_months=months,
+        roth_ira_cap=float(rng.integers(0, 10_000)),
+        roth_ira_enabled=bool(rng.integers(2)),
+        k401_cap=float(rng.integers(0, 30_000)),
+        k401_enabled=bool(rng.integers(2)),
+        roth_ira_return=float(rng.uniform(0, 0.3)),
+        k401_return=float(rng.uniform(0, 0.3)),
+        dca_return=float(rng.uniform(0, 0.3)),
+        stock_return=float(rng.uniform(0, 0.3)),
+        dca_ratio=dca_ratio,
+        stock_ratio=1 - dca_ratio,
+        inflation_rate=float(rng.uniform(0, 0.1)),
+        initial_roth=float(rng.integers(0, 50_000)),
+        initial_401k=float(rng.integers(0, 50_000)),
+        initial_dca=float(rng.integers(0, 50_000)),
+        initial_stock=float(rng.integers(0, 50_000)),
+    )
+
+
+def assert_same_series(actual, expected):
+    for column in COLUMNS:
+        np.testing.assert_allclose(actual[column], expected[column], rtol=1e-9, atol=1e-6, err_msg=column)
+
+
+@pytest.mark.parametrize("allow_negative", [False, True])
+def test_numpy_backend_matches_python_reference(allow_negative):
+    rng = np.random.default_rng(7)
+    for _ in range(150):
+        params = random_scenario(rng, allow_negative)
+        assert_same_series(
+            compound_growth_with_visualization(backend="numpy", **params),
+            compound_growth_with_visualization(backend="python", **params),
+        )
+
+
+def test_terminal_values_equal_the_last_month():
+    rng = np.random.default_rng(13)
+    for _ in range(200):
+        params = random_scenario(rng, allow_negative=True)
+        params["roth_ira_cap"] = float(rng.integers(-5_000, 10_000))
+        params["k401_cap"] = float(rng.integers(-5_000, 30_000))
+        params["dca_return"] = float(rng.choice([0.0, params["dca_return"]]))
+        final = terminal_values(**params)
+        full = compound_growth_with_visualization(backend="python", **params)
+        for column, value in final.items():
+            np.testing.assert_allclose(value, full[column][-1], rtol=1e-9, atol=1e-6, err_msg=column)
+
+
+def test_terminal_values_broadcast_over_array_arguments():
+    returns = np.array([0.0, 0.05, 0.1])
+    horizons = np.array([[0], [12], [60]])
+    final = terminal_values(stock_return=returns, simulation_months=horizons)
+    assert final["Total"].shape == (3, 3)
+    for i, months in enumerate(horizons[:, 0]):
+        for j, rate in enumerate(returns):
+            expected = compound_growth_with_visualization(stock_return=rate, simulation_months=months)
+            np.testing.assert_allclose(final["Stock Picks"][i, j], expected["Stock Picks"][-1], rtol=1e-12)
+
+
+DCA_ONLY = dict(monthly_plan=[(1, 24, 1_000)], simulation_months=24, roth_ira_enabled=False, k401_enabled=False,
+                dca_ratio=1.0, stock_ratio=0.0, dca_return=0.08, initial_dca=10_000)
+
+
+def test_annual_steps_report_the_last_completed_step():
+    result = compound_growth_with_visualization(resolution="annual", **DCA_ONLY)
+    for month in range(1, 12):
+        assert result["ETF DCA"][month] == result["ETF DCA"][0], month
+        assert result["Total_Contributions"][month] == 0.0, month
+    assert result["ETF DCA"][12] == pytest.approx(10_000 * 1.08 + 12_000, rel=1e-12)
+    assert result["ETF DCA"][23] == result["ETF DCA"][12]
+    assert result["ETF DCA"][24] == pytest.approx(10_000 * 1.08 ** 2 + 12_000 * 1.08 + 12_000, rel=1e-12)
+
+
+@pytest.mark.parametrize("resolution, steps_per_year", [("daily", 365), ("weekly", 52), ("biweekly", 26)])
+def test_fine_steps_match_the_closed_form(resolution, steps_per_year):
+    result = compound_growth_with_visualization(resolution=resolution, **DCA_ONLY)
+    # Each step adds its share of the year's contributions at the end of the step
+    growth = 1.08 ** (1 / steps_per_year)
+    n_steps = 2 * steps_per_year
+    expected = 10_000 * 1.08 ** 2 + 12_000 / steps_per_year * (growth ** n_steps - 1) / (growth - 1)
+    assert result["ETF DCA"][-1] == pytest.approx(expected, rel=1e-10)
+    assert result["Total_Contributions"][-1] == pytest.approx(24_000, rel=1e-12)
+    assert result["Total"][12] <= result["Total"][13]
+
+
+def test_monthly_resolution_is_the_default():
+    assert_same_series(compound_growth_with_visualization(resolution="monthly", **DCA_ONLY),
+                       compound_growth_with_visualization(**DCA_ONLY))
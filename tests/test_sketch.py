@@ -0,0 +1,44 @@
+import numpy as np
+from utils.sketch import SKETCH_ACCURACY, QuantileSketch
+
+Q = np.array([0.0, 0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99, 1.0])
+
+
+def within_accuracy(estimate, values, q):
+    # Any value between the exact order statistics around rank q * (n - 1), up to the relative accuracy
+    ordered = np.sort(values, axis=0)
+    rank = q * (len(values) - 1)
+    low = ordered[np.floor(rank).astype(int)] * (1 - SKETCH_ACCURACY) - 1e-9
+    high = ordered[np.ceil(rank).astype(int)] * (1 + SKETCH_ACCURACY) + 1e-9
+    return np.all((estimate >= low) & (estimate <= high))
+
+
+def test_quantiles_within_relative_accuracy():
+    rng = np.random.default_rng(8)
+    values = rng.lognormal(11, 1.2, size=(20_000, 3))
+    sketch = QuantileSketch(3).update(values)
+    estimates = sketch.quantiles(Q)
+    for i, q in enumerate(Q):
+        assert within_accuracy(estimates[i], values, q)
+    np.testing.assert_allclose(sketch.mean, values.mean(axis=0), rtol=1e-12)
+    np.testing.assert_allclose(sketch.std, values.std(axis=0, ddof=1), rtol=1e-10)
+
+
+def test_merged_chunks_equal_one_sketch():
+    rng = np.random.default_rng(9)
+    values = rng.lognormal(10, 0.8, size=(9_000, 4))
+    whole = QuantileSketch(4).update(values)
+    merged = QuantileSketch(4)
+    for chunk in np.array_split(values, 7):
+        merged.merge(QuantileSketch(4).update(chunk))
+    np.testing.assert_array_equal(merged.counts, whole.counts)
+    np.testing.assert_array_equal(merged.quantiles(Q), whole.quantiles(Q))
+    np.testing.assert_allclose(merged.mean, whole.mean, rtol=1e-12)
+    np.testing.assert_allclose(merged.variance, whole.variance, rtol=1e-10)
+
+
+def test_values_outside_the_bins_report_exact_extremes():
+    values = np.array([[0.2], [0.5], [3.0], [2e13]])
+    sketch = QuantileSketch(1).update(values)
+    assert sketch.quantiles([0.0])[0, 0] == 0.2
+    assert sketch.quantiles([1.0])[0, 0] == 2e13
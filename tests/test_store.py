@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+from models.backtest import load_history
+from utils.store import PathWriter, open_panel, open_paths, write_panel
+
+COLUMNS = ["cpi", "stock_return", "dca_return"]
+
+
+@pytest.fixture
+def data():
+    return np.random.default_rng(0).normal(size=(len(COLUMNS), 50))
+
+
+@pytest.mark.parametrize("name", ["panel.npy", "panel.bin"])
+def test_write_panel_round_trips(tmp_path, data, name):
+    path = str(tmp_path / name)
+    written = write_panel(path, data, COLUMNS, start="2001-03", source="test")
+    for panel in (written, open_panel(path)):
+        assert panel.columns == COLUMNS and panel.frequency == "monthly" and panel.start == "2001-03"
+        assert panel.metadata == {"source": "test"}
+        np.testing.assert_array_equal(panel.array, data)
+        for i, column in enumerate(COLUMNS):
+            np.testing.assert_array_equal(panel[column], data[i])
+
+
+def test_window_views_the_file(tmp_path, data):
+    panel = write_panel(str(tmp_path / "panel.npy"), data, COLUMNS, start="2001-03")
+    window = panel.window(10, 22)
+    assert len(window) == 12 and window.offset == 10
+    np.testing.assert_array_equal(window["stock_return"], data[1, 10:22])
+    assert np.shares_memory(window.array, panel.array)
+    np.testing.assert_array_equal(window.dates(), panel.dates()[10:22])
+    np.testing.assert_array_equal(window.window(2, 5)["cpi"], data[0, 12:15])
+    assert window.window(2, 5).dates()[0] == np.datetime64("2002-03")
+
+
+@pytest.mark.parametrize("frequency, start, expected", [
+    ("monthly", "2001-03", ["2001-03", "2001-04", "2001-05"]),
+    ("daily", "2001-03-30", ["2001-03-30", "2001-03-31", "2001-04-01"]),
+    # A Monday start stays on Mondays
+    ("weekly", "2024-01-01", ["2024-01-01", "2024-01-08", "2024-01-15"]),
+])
+def test_dates_step_from_the_start(tmp_path, frequency, start, expected):
+    panel = write_panel(str(tmp_path / "panel.npy"), np.zeros((1, 3)), ["cpi"], frequency=frequency, start=start)
+    assert panel.dates().astype(str).tolist() == expected
+    assert panel.window(1).dates().astype(str).tolist() == expected[1:]
+    assert write_panel(str(tmp_path / "undated.npy"), np.zeros((1, 3)), ["cpi"]).dates() is None
+
+
+def test_invalid_panels_are_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        write_panel(str(tmp_path / "panel.npy"), np.zeros((2, 3)), ["cpi"])
+    with pytest.raises(ValueError):
+        write_panel(str(tmp_path / "panel.npy"), np.zeros((1, 3)), ["cpi"], frequency="hourly")
+
+
+def test_path_writer_round_trips(tmp_path):
+    path = str(tmp_path / "paths.npy")
+    rows = np.random.default_rng(1).normal(size=(10, 7))
+    with PathWriter(path, 10, 7, seed=42) as writer:
+        writer.write(rows[:4])
+        writer.write(rows[4:9])
+        writer.write(rows[9])
+    array, metadata = open_paths(path)
+    np.testing.assert_array_equal(array, rows)
+    assert metadata == {"rows_written": 10, "seed": 42}
+    with pytest.raises(ValueError):
+        open_panel(path)
+    write_panel(str(tmp_path / "panel.npy"), rows[:1], ["cpi"])
+    with pytest.raises(ValueError):
+        open_paths(str(tmp_path / "panel.npy"))
+
+
+def test_history_must_be_monthly(tmp_path):
+    data = np.vstack((100 + np.arange(5.0), np.full(5, 0.01)))
+    panel = write_panel(str(tmp_path / "weekly.npy"), data, ["cpi", "return"], frequency="weekly", start="2024-01-01")
+    with pytest.raises(ValueError):
+        load_history(panel)
+    with pytest.raises(ValueError):
+        load_history(str(tmp_path / "weekly.npy"))
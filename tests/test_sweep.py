@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+from models.simulation import compound_growth_with_visualization
+from models.sweep import downsample_grid, sweep_grid
+
+PLAN = [(1, 48, 3_000), (49, 120, 6_000)]
+PARAMS = dict(simulation_months=120, initial_dca=25_000, initial_401k=10_000, inflation_rate=0.03)
+
+
+def direct(metric="Total_Adjusted", monthly_plan=PLAN, **params):
+    return compound_growth_with_visualization(monthly_plan=monthly_plan, **{**PARAMS, **params})[metric][-1]
+
+
+@pytest.mark.parametrize("x_param, x_values, y_param, y_values", [
+    ("dca_return", [0.0, 0.05, 0.12], "inflation_rate", [0.0, 0.02, 0.06, 0.09]),
+    ("roth_ira_cap", [0.0, 7_000, 20_000], "initial_dca", [0.0, 100_000]),
+    ("simulation_months", [12, 60, 200], "stock_return", [0.02, 0.15]),
+    ("dca_ratio", [0.0, 0.3, 1.0], "k401_cap", [0.0, 23_000]),
+])
+def test_grid_matches_direct_runs(x_param, x_values, y_param, y_values):
+    grid = sweep_grid(x_param, x_values, y_param, y_values, monthly_plan=PLAN, **PARAMS)
+    assert grid.shape == (len(y_values), len(x_values))
+    for i, y in enumerate(y_values):
+        for j, x in enumerate(x_values):
+            params = {x_param: x, y_param: y}
+            if "dca_ratio" in params:
+                params["stock_ratio"] = 1.0 - params["dca_ratio"]
+            assert grid[i, j] == pytest.approx(direct(**params), rel=1e-9), (x, y)
+
+
+def test_contribution_axes_match_direct_runs():
+    amounts = [0.0, 1_500, 8_000]
+    scales = [0.5, 2.0]
+    grid = sweep_grid("monthly_contribution", amounts, "initial_dca", [0.0, 50_000], metric="Total", **PARAMS)
+    for i, initial in enumerate([0.0, 50_000]):
+        for j, amount in enumerate(amounts):
+            flat = [(1, PARAMS["simulation_months"], amount)]
+            assert grid[i, j] == pytest.approx(direct("Total", flat, initial_dca=initial), rel=1e-9)
+
+    grid = sweep_grid("contribution_scale", scales, "dca_return", [0.04], monthly_plan=PLAN, metric="Total",
+                      **PARAMS)
+    for j, scale in enumerate(scales):
+        scaled = [(start, end, amount * scale) for start, end, amount in PLAN]
+        assert grid[0, j] == pytest.approx(direct("Total", scaled, dca_return=0.04), rel=1e-9)
+
+
+def test_tiling_does_not_change_the_grid():
+    x_values = np.linspace(0.0, 0.3, 17)
+    y_values = np.linspace(0.0, 0.1, 23)
+    axes = ("stock_return", x_values, "inflation_rate", y_values)
+    whole = sweep_grid(*axes, monthly_plan=PLAN, **PARAMS)
+    tiled = sweep_grid(*axes, monthly_plan=PLAN, tile_size=40, **PARAMS)
+    np.testing.assert_array_equal(tiled, whole)
+
+
+def test_invalid_axes_are_rejected():
+    with pytest.raises(ValueError):
+        sweep_grid("dca_return", [0.1], "dca_return", [0.1])
+    with pytest.raises(ValueError):
+        sweep_grid("monthly_contribution", [1.0], "contribution_scale", [1.0])
+    with pytest.raises(ValueError):
+        sweep_grid("dca_return", [0.1], "unknown", [0.1])
+
+
+def test_downsample_grid_block_means():
+    grid = np.arange(35.0).reshape(5, 7)
+    values, x_edges, y_edges = downsample_grid(grid, np.arange(7.0), np.arange(5.0), max_bins=3)
+    y_groups = np.array_split(np.arange(5), 3)
+    x_groups = np.array_split(np.arange(7), 3)
+    expected = [[grid[np.ix_(rows, columns)].mean() for columns in x_groups] for rows in y_groups]
+    np.testing.assert_allclose(values, expected)
+    assert len(x_edges) == 4 and len(y_edges) == 4
+    assert x_edges[0] == -0.5 and x_edges[-1] == 6.5
@@ -0,0 +1,67 @@
+from statistics import NormalDist
+
+import numpy as np
+import pytest
+from models.monte_carlo import PERCENTILES, monte_carlo_simulation
+from models.variance_reduction import (
+    _bridge_plan, _brownian_bridge, _control_weights, _weighted_quantiles, monte_carlo_estimate,
+)
+
+
+@pytest.mark.parametrize("n_steps", [1, 2, 7, 36, 121])
+def test_brownian_bridge_is_an_orthonormal_map_to_increments(n_steps):
+    plan = _bridge_plan(n_steps)
+    assert sorted(point for point, _, _ in plan) == list(range(1, n_steps + 1))
+    # Row k holds the increments built from the k-th unit normal alone
+    transform = _brownian_bridge(np.eye(n_steps), plan)
+    np.testing.assert_allclose(transform.T @ transform, np.eye(n_steps), atol=1e-12)
+    # The first normal sets the terminal point
+    np.testing.assert_allclose(transform[0].sum(), np.sqrt(n_steps))
+
+
+def test_control_weights_make_the_control_moments_exact():
+    rng = np.random.default_rng(6)
+    control = rng.standard_normal(5_000)
+    q = np.array(PERCENTILES) / 100
+    weights = _control_weights(control, q)
+    assert weights.sum() == pytest.approx(1.0)
+    assert weights @ control == pytest.approx(0.0, abs=1e-12)
+    for p in q:
+        assert weights[control <= NormalDist().inv_cdf(p)].sum() == pytest.approx(p, abs=1e-12)
+
+
+def test_weighted_quantiles_match_plain_quantiles_for_equal_weights():
+    values = np.random.default_rng(0).permutation(1_000).astype(float)
+    weights = np.full(1_000, 1 / 1_000)
+    np.testing.assert_array_equal(_weighted_quantiles(values, weights, np.array([0.1, 0.5, 0.9])),
+                                  [99.0, 499.0, 899.0])
+
+
+PARAMS = dict(monthly_plan=[(1, 36, 3_000)], simulation_months=36, initial_stock=20_000)
+
+
+@pytest.fixture(scope="module")
+def reference():
+    return monte_carlo_simulation(n_paths=200_000, chunk_size=20_000, seed=1, **PARAMS)["Total"][:, -1]
+
+
+@pytest.mark.parametrize("sampling, control_variate", [
+    ("pseudo", False), ("antithetic", False), ("antithetic", True), ("sobol", True),
+])
+def test_estimates_agree_with_a_large_plain_run(reference, sampling, control_variate):
+    if sampling == "sobol":
+        pytest.importorskip("scipy")
+    estimate = monte_carlo_estimate(n_paths=4_096, replicates=8, sampling=sampling,
+                                    control_variate=control_variate, seed=2, **PARAMS)
+    error = np.abs(estimate["Terminal_Percentiles"]["Total"] - reference)
+    # Five standard errors, plus the reference's own quantile noise
+    assert np.all(error <= 5 * estimate["Standard_Error"]["Total"] + 0.002 * reference)
+
+
+def test_bootstrap_history_needs_plain_sampling():
+    history = np.full((120, 4), 0.005)
+    estimate = monte_carlo_estimate(history=history, n_paths=64, replicates=4)
+    # Constant historical returns leave nothing random
+    np.testing.assert_allclose(estimate["Standard_Error"]["Total"], 0.0, atol=1e-6)
+    with pytest.raises(ValueError):
+        monte_carlo_estimate(history=history, sampling="antithetic")
@@ -0,0 +1,151 @@
+import numpy as np
+import pytest
+from models.monte_carlo import BUCKETS
+from models.withdrawal import max_withdrawal_rate, simulate_withdrawals
+
+# One month of history per bucket: every bootstrapped path repeats it, so the returns are known
+MONTHLY_RETURNS = np.array([0.004, 0.006, 0.002, -0.001])
+BALANCES = np.array([[40_000, 60_000, 150_000, 50_000],
+                     [0, 0, 300_000, 0],
+                     [120_000, 10_000, 5_000, 2_000]], dtype=float)
+
+
+def reference(balances, rate, rule, months, inflation_rate, order=BUCKETS, spending_floor=0.0,
+              guardrails=(0.20, 0.20, 0.10)):
+    """
+    One path, month by month: (depletion month or -1, terminal total, real withdrawals).
+    """
+    positions = [BUCKETS.index(bucket) for bucket in order]
+    values = [float(balances[i]) for i in positions]
+    returns = [MONTHLY_RETURNS[i] for i in positions]
+    upper, lower, adjustment = guardrails
+    real_draw = rate * sum(values) / 12
+    floor = spending_floor * real_draw
+    spent = 0.0
+    for month in range(1, months + 1):
+        values = [value * (1 + r) for value, r in zip(values, returns)]
+        total = sum(values)
+        deflator = (1 + inflation_rate) ** (month / 12)
+        if rule == "percentage":
+            draw = rate * total / 12
+            current_real = draw / deflator
+        else:
+            if rule == "guardrail" and month > 1 and (month - 1) % 12 == 0:
+                current_rate = real_draw * deflator * 12 / total
+                if current_rate > rate * (1 + upper):
+                    real_draw *= 1 - adjustment
+                elif current_rate < rate * (1 - lower):
+                    real_draw *= 1 + adjustment
+            current_real = real_draw
+            draw = real_draw * deflator
+        remaining = draw
+        for i, value in enumerate(values):
+            taken = min(remaining, value)
+            values[i] -= taken
+            remaining -= taken
+        spent += min(draw, total) / deflator
+        if total < draw or current_real < floor:
+            return month, 0.0, spent
+    return -1, sum(values), spent
+
+
+def run(rule, rates, months=360, inflation_rate=0.03, **params):
+    return simulate_withdrawals(BALANCES, withdrawal_rate=rates, rule=rule, withdrawal_months=months,
+                                history=MONTHLY_RETURNS[None, :], inflation_rate=inflation_rate,
+                                n_paths=len(BALANCES), chunk_size=2, **params)
+
+
+def assert_matches_reference(result, rule, rates, months=360, inflation_rate=0.03, **params):
+    for path, rate in enumerate(rates):
+        depletion, terminal, withdrawn = reference(BALANCES[path], rate, rule, months, inflation_rate, **params)
+        assert result["depletion_month"][path] == depletion, path
+        assert result["success"][path] == (depletion < 0)
+        assert result["terminal"][path] == pytest.approx(terminal, rel=1e-9, abs=1e-6), path
+        assert result["withdrawn_real"][path] == pytest.approx(withdrawn, rel=1e-9), path
+    assert result["success_rate"] == pytest.approx(result["success"].mean())
+    np.testing.assert_allclose(result["terminal_real"], result["terminal"] / (1 + inflation_rate) ** (months / 12),
+                               rtol=1e-9)
+
+
+@pytest.mark.parametrize("rule", ["fixed_real", "percentage", "guardrail"])
+def test_rules_match_a_month_by_month_loop(rule):
+    # Sustainable, borderline and failing rates
+    rates = [0.03, 0.05, 0.09]
+    assert_matches_reference(run(rule, rates), rule, rates)
+
+
+def test_guardrails_move_the_real_withdrawal():
+    rates = [0.08, 0.005, 0.06]
+    result = run("guardrail", rates, inflation_rate=0.0)
+    assert_matches_reference(result, "guardrail", rates, inflation_rate=0.0)
+    fixed = run("fixed_real", rates, inflation_rate=0.0)
+    # Cuts keep the high-rate path alive longer; raises spend more on the low-rate one
+    assert fixed["depletion_month"][0] > 0
+    assert result["depletion_month"][0] < 0 or result["depletion_month"][0] > fixed["depletion_month"][0]
+    assert result["withdrawn_real"][1] > fixed["withdrawn_real"][1]
+
+
+def test_spending_floor_fails_shrinking_withdrawals():
+    rates = [0.08, 0.005, 0.06]
+    result = run("guardrail", rates, spending_floor=0.85, inflation_rate=0.0)
+    assert_matches_reference(result, "guardrail", rates, inflation_rate=0.0, spending_floor=0.85)
+    # The high-rate path fails at its second cut (0.9 ** 2 < 0.85), before it runs out of money
+    unfloored = run("guardrail", rates, inflation_rate=0.0)
+    assert 0 < result["depletion_month"][0] and result["depletion_month"][0] % 12 == 1
+    assert unfloored["depletion_month"][0] < 0 or unfloored["depletion_month"][0] > result["depletion_month"][0]
+    # A percentage withdrawal fails once the shrinking total pulls it below the floor
+    rates = [0.09, 0.05, 0.12]
+    percentage = run("percentage", rates, spending_floor=0.9)
+    assert_matches_reference(percentage, "percentage", rates, spending_floor=0.9)
+    assert (percentage["depletion_month"] > 0).any()
+
+
+def test_withdrawal_order_drains_buckets_in_turn():
+    order = ("Stock Picks", "ETF DCA", "401(k)", "Roth IRA")
+    rates = [0.04, 0.04, 0.04]
+    result = run("fixed_real", rates, months=120, order=order)
+    assert_matches_reference(result, "fixed_real", rates, months=120, order=order)
+    default = run("fixed_real", rates, months=120)
+    # Draining the losing bucket first leaves more in the growing ones
+    assert result["terminal"][0] > default["terminal"][0]
+    assert result["terminal"][1] == pytest.approx(default["terminal"][1], rel=1e-12)
+
+
+def test_failure_month_bookkeeping():
+    balances = np.array([0, 0, 1_200, 0], dtype=float)
+    common = dict(history=np.zeros((1, 4)), inflation_rate=0.0, n_paths=2)
+    # 100 a month: month 12 empties the balance exactly, month 13 cannot be funded
+    result = simulate_withdrawals(balances, withdrawal_rate=[1.0, 0.5], withdrawal_months=30, **common)
+    np.testing.assert_array_equal(result["depletion_month"], [13, 25])
+    np.testing.assert_array_equal(result["success"], [False, False])
+    np.testing.assert_array_equal(result["terminal"], [0.0, 0.0])
+    np.testing.assert_allclose(result["withdrawn_real"], [1_200, 1_200])
+    assert result["success_rate"] == 0.0
+
+    result = simulate_withdrawals(balances, withdrawal_rate=[1.0, 0.5], withdrawal_months=12, **common)
+    np.testing.assert_array_equal(result["depletion_month"], [-1, -1])
+    np.testing.assert_allclose(result["terminal"], [0.0, 600.0], atol=1e-9)
+    np.testing.assert_allclose(result["withdrawn_real"], [1_200, 600])
+    assert result["success_rate"] == 1.0
+
+
+def test_invalid_rule_and_order_are_rejected():
+    with pytest.raises(ValueError):
+        simulate_withdrawals(BALANCES[0], rule="bucket", n_paths=2)
+    with pytest.raises(ValueError):
+        simulate_withdrawals(BALANCES[0], order=("Roth IRA", "Roth IRA", "ETF DCA", "Stock Picks"), n_paths=2)
+
+
+def test_max_withdrawal_rate_matches_a_brute_force_search():
+    params = dict(withdrawal_months=120, n_paths=24, chunk_size=10, seed=3, stock_volatility=0.3)
+    rate, path_rates = max_withdrawal_rate(BALANCES[0], success_probability=0.75, max_rate=0.3, tol=1e-5, **params)
+
+    # A fixed real withdrawal fails a path from some rate on, so scanning a grid brackets every path
+    grid = np.arange(0.0, 0.3, 2e-3)
+    success = np.array([simulate_withdrawals(BALANCES[0], withdrawal_rate=g, **params)["success"] for g in grid])
+    brute_path_rates = grid[success.sum(axis=0) - 1]
+    np.testing.assert_allclose(path_rates, brute_path_rates, atol=2e-3 + 1e-5)
+    brute_rate = grid[np.flatnonzero(success.mean(axis=1) >= 0.75)[-1]]
+    assert rate == pytest.approx(brute_rate, abs=2e-3 + 1e-5)
+    assert simulate_withdrawals(BALANCES[0], withdrawal_rate=rate, **params)["success_rate"] >= 0.75
+    assert simulate_withdrawals(BALANCES[0], withdrawal_rate=rate + 2e-5, **params)["success_rate"] < 0.75
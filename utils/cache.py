@@ -0,0 +1,149 @@
+import hashlib
+import json
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from models.plan import CompiledPlan, compile_plan
+
+
+class SimulationCache:
+    """
+    Thread-safe LRU cache for simulation results with an entry and a byte budget.
+    One instance is meant to be shared by every Streamlit session in the server process, so
+    stored values are frozen (made read-only) and sized by what they can grow to.
+    """
+
+    def __init__(self, max_entries=256, max_bytes=256 * 2**20):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # key -> (value, size in bytes)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        size = estimate_bytes(freeze(value))
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            if size > self.max_bytes:
+                return value  # Larger than the whole budget: hand back without caching
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+        return value
+
+    def get_or_compute(self, key, compute):
+        """
+        Cached value for `key`, calling compute() and storing its result on a miss.
+        """
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = self.put(key, compute())
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+
+def simulation_key(params, monthly_plan):
+    """
+    Canonical hash of a parameter dict plus a monthly_plan. Numbers are normalized (7000 == 7000.0,
+    numpy scalars == Python scalars) and the plan is keyed by its compiled segments, so plans that
+    resolve to the same contributions share an entry.
+    """
+    return canonical_hash({"params": params, "plan": compile_plan(monthly_plan)})
+
+
+def canonical_hash(value):
+    """
+    SHA-256 of a JSON-like value (dicts, sequences, numbers, strings, compiled plans) with
+    numbers normalized and dict keys sorted.
+    """
+    payload = json.dumps(_canonical(value), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def freeze(value):
+    """
+    Make a result read-only in place before it is shared: arrays are flagged non-writeable,
+    objects with a freeze() method (SimulationResult) freeze themselves, containers recursively.
+    Returns the value.
+    """
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    elif hasattr(value, "freeze"):
+        value.freeze()
+    elif isinstance(value, dict):
+        for item in value.values():
+            freeze(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            freeze(item)
+    return value
+
+
+def estimate_bytes(value):
+    """
+    Approximate memory held by a result: arrays by nbytes, SimulationResults by the bytes they
+    hold once every lazily derived column is memoized, containers recursively.
+    """
+    if hasattr(value, "max_nbytes"):
+        return value.max_nbytes
+    if hasattr(value, "nbytes"):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_bytes(k) + estimate_bytes(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_bytes(item) for item in value)
+    return sys.getsizeof(value)
+
+
+def _canonical(value):
+    if isinstance(value, dict):
+        return {str(key): _canonical(item) for key, item in value.items()}
+    if isinstance(value, CompiledPlan):
+        return [_canonical(list(segment)) for segment in value]
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [_canonical(item) for item in value]
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return float(value)
+    return value
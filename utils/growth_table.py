@@ -0,0 +1,68 @@
+import numpy as np
+
+# Annual rates the sidebar sliders can produce: returns 0–30% in 0.5% steps, inflation 0–10%
+# in 0.1% steps (divided by 100 exactly as the sliders are, so lookups match bit for bit)
+SLIDER_RATES = np.union1d(
+    np.round(np.arange(0.0, 30.25, 0.5), 1) / 100,
+    np.round(np.arange(0.0, 10.05, 0.1), 1) / 100,
+)
+# Longest sidebar horizon, 30 years
+MAX_MONTHS = 360
+
+
+class GrowthTable:
+    """
+    Cumulative growth factors (1 + monthly rate) ** month for months 0..max_months of a fixed
+    grid of annual rates, built once per process and shared by every run.
+
+    Rows are keyed by the monthly rate, (1 + annual) ** (1/12) - 1, so the compounding kernels and
+    deflators can look up the rates they already hold; each row is computed with the same
+    expression they would evaluate, so a lookup returns the same values. Scalar and vectorized
+    evaluation of that rate can differ in the last bit, so both results get a row. Rates off the
+    grid or exponents past max_months fall back to computing the powers.
+    """
+
+    __slots__ = ("monthly_rates", "table", "_rows")
+
+    def __init__(self, annual_rates=SLIDER_RATES, max_months=MAX_MONTHS):
+        annual_rates = np.unique(np.asarray(annual_rates, dtype=float))
+        self.monthly_rates = np.union1d(
+            (1 + annual_rates) ** (1 / 12) - 1,
+            [(1 + rate) ** (1 / 12) - 1 for rate in annual_rates.tolist()],
+        )
+        self.table = (1 + self.monthly_rates[:, None]) ** np.arange(max_months + 1)
+        self.table.flags.writeable = False
+        # A dict probe per rate is cheaper than a vectorized search for the handful of rates a run uses
+        self._rows = {rate: row for row, rate in enumerate(self.monthly_rates.tolist())}
+
+    def __repr__(self):
+        rates, columns = self.table.shape
+        return f"GrowthTable(rates={rates}, max_months={columns - 1})"
+
+    def __contains__(self, monthly_rate):
+        return float(monthly_rate) in self._rows
+
+    @property
+    def nbytes(self):
+        return self.monthly_rates.nbytes + self.table.nbytes
+
+    def powers(self, monthly_rate, start, stop):
+        """
+        (1 + monthly_rate) ** np.arange(start, stop) for a scalar rate or a (..., 1) column of
+        rates, as a (stop - start,) or (..., stop - start) array.
+        """
+        if 0 <= start <= stop <= self.table.shape[1]:
+            shape = np.shape(monthly_rate)
+            if not shape:
+                row = self._rows.get(float(monthly_rate))
+                if row is not None:
+                    return self.table[row, start:stop]
+            elif shape[-1] == 1:
+                rows = [self._rows.get(rate) for rate in np.ravel(monthly_rate).tolist()]
+                if None not in rows:
+                    return self.table[rows, start:stop].reshape(shape[:-1] + (stop - start,))
+        return (1 + np.asarray(monthly_rate, dtype=float)) ** np.arange(start, stop)
+
+
+# Shared by every session in the server process (a few hundred KB)
+GROWTH_TABLE = GrowthTable()
@@ -1,18 +1,99 @@
-import numpy_financial as npf
+import numpy as np
+
+# Scan grid for the periodic log-growth x = log(1 + rate), i.e. rates from -99.99% to +999,900%
+_SCAN_GRID = np.linspace(np.log(1e-4), np.log(1e4), 801)
+
 
 def calculate_irr(cash_flows):
     """
     Calculate IRR assuming equal time intervals between cash flows.
-    Uses numpy_financial.irr which returns a monthly IRR.
-    Converts to annualized IRR.
+    The periodic (monthly) IRR comes from irr_batch and is annualized.
+    Returns 0.0 when there is no IRR; use irr_batch directly for convergence flags.
     """
     if len(cash_flows) < 2 or all(cf == 0 for cf in cash_flows):
         return 0.0
-    
-    monthly_irr = npf.irr(cash_flows)
 
-    if monthly_irr is None or monthly_irr <= -1:
+    monthly_irr, converged = irr_batch([cash_flows])
+    if not converged[0] or monthly_irr[0] <= -1:
         return 0.0
-    
-    annual_irr = (1 + monthly_irr) ** 12 - 1
-    return annual_irr
+
+    return annualize_irr(monthly_irr[0])
+
+
+def annualize_irr(monthly_irr):
+    """
+    Convert a monthly IRR (scalar or array) to an annual one.
+    """
+    return (1 + monthly_irr) ** 12 - 1
+
+
+def irr_batch(cash_flows, tol=1e-12, max_iter=100):
+    """
+    Periodic IRR of every row of a 2-D array of equally spaced cash-flow streams.
+
+    Each row's NPV is scanned on a log-growth grid to bracket the root nearest to zero (the
+    same root numpy_financial.irr picks), then refined with Newton steps on
+    NPV(x) = sum(cf[t] * exp(-x * t)) using its analytic derivative, falling back to
+    bisection whenever a step leaves the bracket. All rows are solved together.
+
+    Returns (rates, converged); rows without a sign change get NaN and converged=False.
+    """
+    flows = np.atleast_2d(np.asarray(cash_flows, dtype=float))
+    n_rows, n_flows = flows.shape
+    periods = np.arange(n_flows)
+
+    lo, hi, sign_lo, found = _bracket(flows, periods)
+    x = np.where(found, (lo + hi) / 2, 0.0)
+    converged = np.zeros(n_rows, dtype=bool)
+
+    for _ in range(max_iter):
+        active = found & ~converged
+        if not active.any():
+            break
+        rows = np.flatnonzero(active)
+        xr = x[rows]
+        # NPV and its slope share a positive rescaling, which keeps both finite and leaves
+        # their signs and ratio unchanged
+        exponent = -np.outer(xr, periods)
+        discount = np.exp(exponent - exponent.max(axis=1, keepdims=True))
+        npv = (flows[rows] * discount).sum(axis=1)
+        slope = -(flows[rows] * discount * periods).sum(axis=1)
+
+        same_side = np.sign(npv) == sign_lo[rows]
+        lo[rows] = np.where(same_side, xr, lo[rows])
+        hi[rows] = np.where(same_side, hi[rows], xr)
+
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            newton = xr - npv / slope
+        lower = np.minimum(lo[rows], hi[rows])
+        upper = np.maximum(lo[rows], hi[rows])
+        inside = np.isfinite(newton) & (newton > lower) & (newton < upper)
+        x_new = np.where(npv == 0, xr, np.where(inside, newton, (lo[rows] + hi[rows]) / 2))
+
+        converged[rows] = (npv == 0) | (np.abs(x_new - xr) <= tol * np.maximum(1.0, np.abs(xr)))
+        x[rows] = x_new
+
+    rates = np.where(found & converged, np.expm1(x), np.nan)
+    return rates, found & converged
+
+
+def _bracket(flows, periods):
+    """
+    For every row, the grid interval [lo, hi] in log-growth space with a sign change of the NPV
+    closest to x = 0, and the NPV sign at lo. Each grid column is rescaled by exp(-max(-x * t))
+    so nothing overflows.
+    """
+    grid = _SCAN_GRID
+    exponent = -np.outer(periods, grid)
+    weights = np.exp(exponent - exponent.max(axis=0))
+    signs = np.sign(flows @ weights)
+
+    change = signs[:, :-1] * signs[:, 1:] <= 0
+    change &= (signs[:, :-1] != 0) | (signs[:, 1:] != 0)
+    distance = np.minimum(np.abs(np.expm1(grid[:-1])), np.abs(np.expm1(grid[1:])))
+    distance = np.where(change, distance, np.inf)
+    best = distance.argmin(axis=1)
+
+    rows = np.arange(len(flows))
+    found = np.isfinite(distance[rows, best])
+    return grid[best].copy(), grid[best + 1].copy(), signs[rows, best], found
@@ -0,0 +1,50 @@
+from utils.cache import canonical_hash
+
+
+class Pipeline:
+    """
+    A small dependency graph of named stages. Each stage declares the pipeline inputs and the
+    upstream stages it reads; its fingerprint is a hash of those input values and upstream
+    fingerprints. A stage re-executes only when its fingerprint changes; otherwise its previous
+    output is reused from `store` (e.g. st.session_state), so a rerun only recomputes what the
+    changed inputs actually affect.
+    """
+
+    def __init__(self, store):
+        self._store = store
+        self._stages = []
+        self.executed = []
+
+    def add(self, name, func, inputs=(), depends=()):
+        """
+        Register func(**inputs, **upstream_outputs) as stage `name`. Stages must be added after
+        the stages they depend on.
+        """
+        self._stages.append((name, func, tuple(inputs), tuple(depends)))
+        return self
+
+    def run(self, **inputs):
+        """
+        Evaluate every stage, reusing unchanged outputs; returns {stage name: output}.
+        The names of the stages that actually executed are left in `executed`.
+        """
+        self.executed = []
+        fingerprints, outputs = {}, {}
+        for name, func, stage_inputs, depends in self._stages:
+            arguments = {key: inputs[key] for key in stage_inputs}
+            fingerprint = canonical_hash({
+                "inputs": arguments,
+                "depends": [fingerprints[stage] for stage in depends],
+            })
+
+            cached = self._store.get(name)
+            if cached is not None and cached[0] == fingerprint:
+                output = cached[1]
+            else:
+                output = func(**arguments, **{stage: outputs[stage] for stage in depends})
+                self._store[name] = (fingerprint, output)
+                self.executed.append(name)
+
+            fingerprints[name] = fingerprint
+            outputs[name] = output
+        return outputs
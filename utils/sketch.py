@@ -0,0 +1,116 @@
+import math
+
+import numpy as np
+
+# Relative error of every quantile a QuantileSketch reports
+SKETCH_ACCURACY = 0.005
+
+
+class QuantileSketch:
+    """
+    Mergeable per-column quantile sketch with running mean and variance, for streaming the
+    columns (e.g. months) of path chunks without keeping the paths.
+
+    Values are counted in logarithmic bins (as in DDSketch): bin k holds values in
+    (min_value * g**(k-1), min_value * g**k] with g = (1 + accuracy) / (1 - accuracy), so any
+    quantile is reported within `accuracy` relative error. The bins are fixed, so memory is
+    O(columns × bins) whatever the number of rows, and merging two sketches adds their counts.
+    Values at or below `min_value` share bin 0 and values above `max_value` the last bin; those
+    are reported clipped to the exact column minimum and maximum, which are tracked alongside.
+    Mean and variance are merged with Chan et al.'s pairwise update.
+    """
+
+    __slots__ = ("accuracy", "min_value", "max_value", "counts", "count", "mean", "m2", "low", "high")
+
+    def __init__(self, n_columns, accuracy=SKETCH_ACCURACY, min_value=1.0, max_value=1e13):
+        self.accuracy = accuracy
+        self.min_value = min_value
+        self.max_value = max_value
+        n_bins = math.ceil(math.log(max_value / min_value) / self._log_gamma) + 2
+        self.counts = np.zeros((n_columns, n_bins), dtype=np.int64)
+        self.count = 0
+        self.mean = np.zeros(n_columns)
+        self.m2 = np.zeros(n_columns)
+        self.low = np.full(n_columns, np.inf)
+        self.high = np.full(n_columns, -np.inf)
+
+    def __repr__(self):
+        return f"QuantileSketch(columns={self.counts.shape[0]}, count={self.count}, accuracy={self.accuracy})"
+
+    @property
+    def _log_gamma(self):
+        return math.log((1 + self.accuracy) / (1 - self.accuracy))
+
+    @property
+    def variance(self):
+        return self.m2 / max(self.count - 1, 1)
+
+    @property
+    def std(self):
+        return np.sqrt(self.variance)
+
+    def update(self, rows):
+        """
+        Add a (row, column) chunk of values. Returns the sketch.
+        """
+        rows = np.asarray(rows, dtype=float)
+        n_columns, n_bins = self.counts.shape
+        if not len(rows):
+            return self
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            keys = np.ceil(np.log(rows / self.min_value) / self._log_gamma)
+        keys = np.where(rows > self.min_value, np.clip(keys, 1, n_bins - 1), 0).astype(np.int64)
+        keys += np.arange(n_columns) * n_bins
+        self.counts += np.bincount(keys.ravel(), minlength=self.counts.size).reshape(self.counts.shape)
+
+        chunk_mean = rows.mean(axis=0)
+        chunk_m2 = ((rows - chunk_mean) ** 2).sum(axis=0)
+        self._merge_moments(len(rows), chunk_mean, chunk_m2)
+        self.low = np.minimum(self.low, rows.min(axis=0))
+        self.high = np.maximum(self.high, rows.max(axis=0))
+        return self
+
+    def merge(self, other):
+        """
+        Fold another sketch with the same columns and bins into this one. Returns the sketch.
+        """
+        if self.counts.shape != other.counts.shape or (self.accuracy, self.min_value) != (other.accuracy, other.min_value):
+            raise ValueError(f"Cannot merge {other!r} into {self!r}: different columns or bins")
+        self.counts += other.counts
+        self._merge_moments(other.count, other.mean, other.m2)
+        self.low = np.minimum(self.low, other.low)
+        self.high = np.maximum(self.high, other.high)
+        return self
+
+    def quantiles(self, q):
+        """
+        (len(q), column) estimates of the quantiles q (each in [0, 1]).
+        """
+        q = np.atleast_1d(np.asarray(q, dtype=float))
+        if not self.count:
+            return np.full((len(q), self.counts.shape[0]), np.nan)
+
+        gamma = math.exp(self._log_gamma)
+        cumulative = np.cumsum(self.counts, axis=1)
+        # Bin of the value with rank q * (count - 1), per column
+        ranks = q[:, None, None] * (self.count - 1)
+        keys = (cumulative[None] <= ranks).sum(axis=2)
+        values = self.min_value * 2 * gamma ** keys / (gamma + 1)
+        values = np.where(keys == 0, self.low, np.where(keys == self.counts.shape[1] - 1, self.high, values))
+        return np.clip(values, self.low, self.high)
+
+    def percentiles(self, percentiles):
+        """
+        (len(percentiles), column) estimates for percentiles in [0, 100].
+        """
+        return self.quantiles(np.asarray(percentiles, dtype=float) / 100)
+
+    def _merge_moments(self, count, mean, m2):
+        total = self.count + count
+        if not count:
+            return
+        delta = mean - self.mean
+        self.mean = self.mean + delta * count / total
+        self.m2 = self.m2 + m2 + delta ** 2 * self.count * count / total
+        self.count = total
@@ -0,0 +1,157 @@
+import json
+import os
+
+import numpy as np
+
+# (numpy datetime64 unit, steps of that unit) per time step for the header's frequency. Weeks
+# are counted in days: datetime64 "W" values snap to the Thursday-based week of the epoch.
+FREQUENCIES = {"daily": ("D", 1), "weekly": ("D", 7), "monthly": ("M", 1)}
+
+
+class Panel:
+    """
+    A memory-mapped (column, time) array with named columns, e.g. asset returns and CPI.
+    Columns are contiguous on disk, so panel["stock_return"] and window() are zero-copy views.
+    """
+
+    __slots__ = ("array", "columns", "frequency", "start", "offset", "metadata", "_index")
+
+    def __init__(self, array, columns, frequency="monthly", start=None, offset=0, metadata=None):
+        self.array = array
+        self.columns = list(columns)
+        self.frequency = frequency
+        self.start = start
+        self.offset = offset
+        self.metadata = metadata or {}
+        self._index = {name: i for i, name in enumerate(self.columns)}
+
+    def __getitem__(self, name):
+        return self.array[self._index[name]]
+
+    def __contains__(self, name):
+        return name in self._index
+
+    def __len__(self):
+        return self.array.shape[1]
+
+    def window(self, start=None, stop=None):
+        """
+        Time steps [start, stop) as a Panel viewing the same file.
+        """
+        lo, hi, _ = slice(start, stop).indices(len(self))
+        return Panel(self.array[:, lo:hi], self.columns, self.frequency, self.start, self.offset + lo, self.metadata)
+
+    def dates(self):
+        """
+        datetime64 label of every time step, or None when the header has no start date.
+        """
+        if self.start is None:
+            return None
+        unit, step = FREQUENCIES[self.frequency]
+        return np.datetime64(self.start, unit) + step * (self.offset + np.arange(len(self)))
+
+    def __repr__(self):
+        return f"Panel(columns={self.columns}, steps={len(self)}, frequency={self.frequency!r}, start={self.start!r})"
+
+
+class PathWriter:
+    """
+    Incrementally fill an (n_rows, n_cols) memory-mapped .npy file, one chunk of rows at a time, so
+    path matrices larger than RAM can be produced. `array` can be handed to code that writes rows
+    itself (e.g. monte_carlo_simulation(paths_out=...)); close() flushes it and writes the header
+    that open_paths reads it back with.
+    """
+
+    def __init__(self, path, n_rows, n_cols, dtype=np.float64, **metadata):
+        self.path = path
+        self.array = np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=(n_rows, n_cols))
+        self.rows_written = 0
+        self.metadata = metadata
+
+    def write(self, rows):
+        rows = np.atleast_2d(rows)
+        self.array[self.rows_written:self.rows_written + len(rows)] = rows
+        self.rows_written += len(rows)
+
+    def close(self):
+        self.array.flush()
+        _write_header(self.path, {
+            "kind": "paths",
+            "shape": list(self.array.shape),
+            "dtype": self.array.dtype.str,
+            "rows_written": self.rows_written,
+            **self.metadata,
+        })
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_panel(path, data, columns, frequency="monthly", start=None, **metadata):
+    """
+    Save a (column, time) array as a .npy file (or raw binary for any other extension) with a
+    JSON header next to it, and return it reopened read-only as a Panel.
+    """
+    if frequency not in FREQUENCIES:
+        raise ValueError(f"Unknown frequency: {frequency!r} (expected one of {list(FREQUENCIES)})")
+    data = np.asarray(data)
+    if data.ndim != 2 or len(data) != len(columns):
+        raise ValueError("Panel data must be a 2-D (column, time) array with one row per column name")
+
+    if path.endswith(".npy"):
+        np.save(path, data)
+    else:
+        np.ascontiguousarray(data).tofile(path)
+    _write_header(path, {
+        "columns": list(columns),
+        "frequency": frequency,
+        "start": start,
+        "shape": list(data.shape),
+        "dtype": data.dtype.str,
+        **metadata,
+    })
+    return open_panel(path)
+
+
+def open_panel(path, mode="r"):
+    """
+    Memory-map a panel written by write_panel; nothing is read until a window is used.
+    """
+    header = read_header(path)
+    if header.get("kind") == "paths":
+        raise ValueError(f"{path} holds a path matrix written by PathWriter; open it with open_paths")
+    if path.endswith(".npy"):
+        array = np.load(path, mmap_mode=mode)
+    else:
+        array = np.memmap(path, dtype=np.dtype(header["dtype"]), mode=mode, shape=tuple(header["shape"]))
+    extra = {k: v for k, v in header.items() if k not in ("columns", "frequency", "start", "shape", "dtype")}
+    return Panel(array, header["columns"], header.get("frequency", "monthly"), header.get("start"), 0, extra)
+
+
+def open_paths(path, mode="r"):
+    """
+    Memory-map a path matrix written by PathWriter. Returns (array, metadata), where metadata holds
+    the keyword arguments given to PathWriter and "rows_written".
+    """
+    header = read_header(path)
+    if header.get("kind") != "paths":
+        raise ValueError(f"{path} was not written by PathWriter")
+    array = np.load(path, mmap_mode=mode)
+    return array, {k: v for k, v in header.items() if k not in ("kind", "shape", "dtype")}
+
+
+def header_path(path):
+    return os.path.splitext(path)[0] + ".json"
+
+
+def read_header(path):
+    with open(header_path(path)) as f:
+        return json.load(f)
+
+
+def _write_header(path, header):
+    with open(header_path(path), "w") as f:
+        json.dump(header, f, indent=2)